@@ -0,0 +1,7 @@
+"""
+Performance benchmarks of the report generator.
+
+``synthetic`` writes run trees with the layout of real benchmark runs, sized
+by qubit count, number of samples and number of runs; ``run_benchmarks``
+times the report pipeline on them and saves the timings as JSON.
+"""
@@ -0,0 +1,107 @@
+"""
+Import-time regression check of the report entry points.
+
+Every entry module is imported in a fresh interpreter under
+``python -X importtime``, a few times, and the fastest cumulative import time
+is reported next to its reference budget. The check fails when an entry pulls
+in a module it must not load:
+
+- ``main`` (stats-only builds and cache hits) must not import matplotlib or
+  ``plots``: plots are imported by ``plot_cache.render`` only when a figure
+  is actually drawn.
+- ``plots`` must load the Agg backend only, never pyplot or a GUI toolkit.
+
+    python -m benchmarks.import_time [--repeat 5]
+
+Import times vary too much between machines and runs to gate on, so they are
+only reported: budgets are in milliseconds, measured on a single core, and
+flag an entry worth profiling. Exits with status 1 on a forbidden import.
+Must be run from the repository root.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+
+# Entry module -> (reference budget in ms, forbidden module prefixes).
+ENTRIES = {
+    "main": (350, ("matplotlib", "plots", "networkx", "sklearn", "scipy", "pdb")),
+    "plot_executor": (300, ("matplotlib", "plots", "jinja2")),
+    "plots": (1200, ("matplotlib.pyplot", "tkinter", "PyQt5", "PyQt6", "PySide2", "PySide6")),
+}
+
+
+def import_profile(module):
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns:
+        tuple: The cumulative import time of ``module`` in ms and the names of
+        every module imported on the way.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = None
+    imported = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            total = int(cumulative) / 1000
+    return total, imported
+
+
+def forbidden_imports(imported, prefixes):
+    """Return the modules of ``imported`` matching one of ``prefixes``."""
+    return sorted(
+        name
+        for name in imported
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in prefixes)
+    )
+
+
+def check(repeat=5):
+    """
+    Check every entry of ``ENTRIES`` and print one line per entry.
+
+    Returns:
+        bool: Whether no entry imports a forbidden module.
+    """
+    ok = True
+    for module, (budget, prefixes) in ENTRIES.items():
+        times = []
+        for _ in range(repeat):
+            total, imported = import_profile(module)
+            times.append(total)
+        best = min(times)
+        bad = forbidden_imports(imported, prefixes)
+        ok = ok and not bad
+        status = "FAIL" if bad else "ok"
+        note = ", over budget" if best > budget else ""
+        print(f"{module:<16} {best:8.1f} ms  (budget {budget} ms{note})  {status}")
+        if bad:
+            print(f"{'':<16} imports {', '.join(bad)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the report.")
+    parser.add_argument("--repeat", type=int, default=5, help="Imports per entry, the fastest counts.")
+    args = parser.parse_args()
+    return 0 if check(args.repeat) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
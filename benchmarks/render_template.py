@@ -0,0 +1,125 @@
+"""
+Latency of rendering many reports in one process.
+
+Prepares the context of a left/right report of two synthetic runs once (see
+``synthetic``), then renders ``report_template.j2`` ``--reports`` times in
+each of three ways:
+
+- ``fresh``: a new environment per report, which compiles the template every
+  time (``render_and_save_report`` before the shared environment);
+- ``bytecode``: a new environment per report with a warm on-disk bytecode
+  cache, like the first report of a new process;
+- ``shared``: ``main.template_environment``, as the daemon, batch and web
+  builds now render.
+
+    python -m benchmarks.render_template [--reports 20]
+
+Prints the first, median and minimum latency of every way in ms, and checks
+that they all render the same report. Must be run from the repository root.
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+import main as report  # noqa: E402
+
+from benchmarks import synthetic  # noqa: E402
+
+TEMPLATE = "report_template.j2"
+
+
+def prepare_context(runs, build_dir):
+    """Return the template context of a left/right report of the first and last run."""
+    (left_cal, left_run), (right_cal, right_run) = runs[0], runs[-1]
+    cfg = report.setup_argument_parser().parse_args(
+        [
+            "--no-cache",
+            "--rebuild",
+            "--render-profile", "draft",
+            "--build-dir", build_dir,
+            "--calibration-left", left_cal,
+            "--run-left", left_run,
+            "--calibration-right", right_cal,
+            "--run-right", right_run,
+        ]
+    )
+    return report.prepare_template_context(cfg)
+
+
+def time_renders(get_template, context, reports):
+    """
+    Render ``reports`` reports, each with the template ``get_template()`` returns.
+
+    Returns:
+        tuple: The latency of every report in seconds and the last report.
+    """
+    latencies = []
+    for _ in range(reports):
+        start = time.perf_counter()
+        rendered = get_template().render(context)
+        latencies.append(time.perf_counter() - start)
+    return latencies, rendered
+
+
+def run(reports, qubits, seed):
+    """Time every way of rendering and print one line per way."""
+    runs = synthetic.generate_runs("data", 2, qubits, 100, seed)
+    build_dir = tempfile.mkdtemp(prefix="render-bench-")
+    cache_dir = tempfile.mkdtemp(prefix="render-bench-jinja-")
+    try:
+        context = prepare_context(runs, build_dir)
+        loader = FileSystemLoader(report.TEMPLATE_DIR)
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        # Fill the bytecode cache, as an earlier process would have.
+        Environment(loader=loader, bytecode_cache=bytecode_cache).get_template(TEMPLATE)
+
+        ways = {
+            "fresh": lambda: Environment(loader=loader).get_template(TEMPLATE),
+            "bytecode": lambda: Environment(
+                loader=loader, bytecode_cache=bytecode_cache
+            ).get_template(TEMPLATE),
+            "shared": lambda: report.template_environment(cache_dir).get_template(TEMPLATE),
+        }
+        outputs = set()
+        print(f"{'way':10} {'first':>9} {'median':>9} {'min':>9}  ({reports} reports)")
+        for name, get_template in ways.items():
+            latencies, rendered = time_renders(get_template, context, reports)
+            outputs.add(rendered)
+            first, median, best = (
+                1000 * t for t in (latencies[0], statistics.median(latencies), min(latencies))
+            )
+            print(f"{name:10} {first:7.1f}ms {median:7.1f}ms {best:7.1f}ms")
+    finally:
+        synthetic.remove_runs("data", runs)
+        shutil.rmtree(build_dir, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    if len(outputs) != 1:
+        print("The reports differ between the ways of rendering")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report template rendering.")
+    parser.add_argument("--reports", type=int, default=20, help="Reports rendered per way.")
+    parser.add_argument("--qubits", type=int, default=20, help="Number of qubits of the chip.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the runs.")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    return 0 if run(args.reports, args.qubits, args.seed) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
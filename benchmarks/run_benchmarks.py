@@ -0,0 +1,265 @@
+"""
+End-to-end benchmark of the report pipeline on synthetic runs.
+
+Generates synthetic runs under ``data/`` (see ``synthetic``), then times
+``prepare_template_context`` and ``render_and_save_report`` for a left/right
+report of the first and last run and, with three runs or more, for an N-way
+``--run`` report of all of them. Per-section times come from the tracing
+spans of the pipeline. Every repeat is a cold build: no plot cache, no
+build manifest and an empty ``RunStore``.
+
+Results are written as JSON (``benchmarks/results/<commit>.json`` by
+default) and two result files can be compared:
+
+    python -m benchmarks.run_benchmarks --qubits 40 --samples 5000 --runs 4
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+
+Must be run from the repository root. The rendered ``report.tex`` goes to
+the temporary build directory of each repeat, so the ``report.tex`` of the
+working tree is left alone.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+import main as report  # noqa: E402
+import runstore  # noqa: E402
+import tracing  # noqa: E402
+
+from benchmarks import synthetic  # noqa: E402
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+
+def git_commit():
+    """Return the current commit hash, suffixed with ``-dirty`` for local changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment():
+    """Return the software and hardware the benchmark ran on."""
+    import matplotlib
+    import numpy
+
+    return {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def report_args(runs, mode, build_dir, jobs):
+    """Return the parsed command line of a cold report build of ``runs``."""
+    argv = [
+        "--no-cache",
+        "--rebuild",
+        "--build-dir", build_dir,
+        "--output-dir", build_dir,
+        "--jobs", str(jobs),
+        # Record spans, in the workers too; the trace file itself is not written.
+        "--profile-trace", os.path.join(build_dir, "trace.json"),
+    ]
+    if mode == "multi":
+        for calibration, run in runs:
+            argv += ["--run", f"{calibration}:{run}"]
+    else:
+        (left_cal, left_run), (right_cal, right_run) = runs[0], runs[-1]
+        argv += [
+            "--calibration-left", left_cal,
+            "--run-left", left_run,
+            "--calibration-right", right_cal,
+            "--run-right", right_run,
+        ]
+    return report.setup_argument_parser().parse_args(argv)
+
+
+def span_totals(events):
+    """Sum the span durations (in seconds) per section and per span name."""
+    sections = defaultdict(float)
+    spans = defaultdict(float)
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        seconds = event["dur"] / 1e6
+        if event["cat"] == "context" and event["name"] != "prepare_template_context":
+            name = event.get("args", {}).get("section", event["name"])
+            sections[name] += seconds
+        else:
+            spans[event["name"]] += seconds
+    return dict(sections), dict(spans)
+
+
+def time_build(runs, mode, jobs):
+    """
+    Time one cold report build.
+
+    Returns:
+        dict: Wall times of the two pipeline steps, per-section times and the
+        total time of every other span (``load_json``, plot functions,
+        ``savefig``, ``render_template``). Nested spans are counted in their
+        parent too.
+    """
+    build_dir = tempfile.mkdtemp(prefix="report-bench-")
+    try:
+        cfg = report_args(runs, mode, build_dir, jobs)
+        runstore.clear_cache()
+        tracing.enable_for(cfg)
+
+        start = time.perf_counter()
+        context = report.prepare_template_context(cfg)
+        prepared = time.perf_counter()
+        report.render_and_save_report(context, cfg)
+        rendered = time.perf_counter()
+
+        sections, spans = span_totals(tracing.drain())
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    return {
+        "prepare_template_context": prepared - start,
+        "render_and_save_report": rendered - prepared,
+        "total": rendered - start,
+        "sections": sections,
+        "spans": spans,
+    }
+
+
+def summarize(samples):
+    """Return min/median/max of every timing over the repeats."""
+    values = defaultdict(list)
+    for sample in samples:
+        for key, value in sample.items():
+            if isinstance(value, dict):
+                for name, seconds in value.items():
+                    values[f"{key}/{name}"].append(seconds)
+            else:
+                values[key].append(value)
+    return {
+        key: {"min": min(v), "median": statistics.median(v), "max": max(v)}
+        for key, v in sorted(values.items())
+    }
+
+
+def run_benchmarks(args):
+    """Generate the synthetic runs, time every scenario and return the results."""
+    params = {
+        "qubits": args.qubits,
+        "samples": args.samples,
+        "runs": args.runs,
+        "repeat": args.repeat,
+        "jobs": args.jobs,
+        "seed": args.seed,
+    }
+    logging.info(f"Generating synthetic runs: {params}")
+    start = time.perf_counter()
+    runs = synthetic.generate_runs("data", args.runs, args.qubits, args.samples, args.seed)
+    generation = time.perf_counter() - start
+
+    modes = ["pair"] + (["multi"] if args.runs > 2 else [])
+    results = {
+        "environment": environment(),
+        "params": params,
+        "generation": generation,
+        "scenarios": {},
+    }
+    try:
+        for mode in modes:
+            samples = []
+            for i in range(args.repeat):
+                sample = time_build(runs, mode, args.jobs)
+                print(f"{mode} #{i + 1}: {sample['total']:.2f}s")
+                samples.append(sample)
+            results["scenarios"][mode] = {"samples": samples, "summary": summarize(samples)}
+    finally:
+        if not args.keep:
+            synthetic.remove_runs("data", runs)
+    return results
+
+
+def compare(old_path, new_path, threshold=0.05):
+    """Print the median timings of two result files side by side."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    if old["params"] != new["params"]:
+        print(f"Warning: different parameters {old['params']} vs {new['params']}")
+
+    print(f"{'timing':60} {'old':>9} {'new':>9} {'ratio':>7}")
+    for mode, scenario in new["scenarios"].items():
+        before = old["scenarios"].get(mode, {}).get("summary", {})
+        for key, stats in scenario["summary"].items():
+            if key not in before:
+                continue
+            a, b = before[key]["median"], stats["median"]
+            ratio = b / a if a else float("inf")
+            flag = "" if abs(ratio - 1) < threshold else (" slower" if ratio > 1 else " faster")
+            print(f"{mode + ': ' + key:60} {a:9.3f} {b:9.3f} {ratio:7.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report generator.")
+    parser.add_argument("--qubits", type=int, default=20, help="Number of qubits of the chip.")
+    parser.add_argument("--samples", type=int, default=1000, help="Dataset samples and shots.")
+    parser.add_argument("--runs", type=int, default=2, help="Number of synthetic runs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold builds per scenario.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Report worker processes.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the runs.")
+    parser.add_argument(
+        "--output", type=str, default=None, help="Results file (default: results/<commit>.json)."
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the synthetic runs in data/ afterwards."
+    )
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files."
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    os.chdir(REPO_ROOT)
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run_benchmarks(args)
+
+    output = Path(args.output or RESULTS_DIR / f"{results['environment']['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,414 @@
+"""
+Synthetic benchmark runs.
+
+Writes ``<base_dir>/<calibration>/<run>/<experiment>/results.json`` trees and
+``<base_dir>/calibrations/<calibration>/sinq20/calibration.json`` files with
+the layout of the real runs, filled with random values. The size of a run is
+set by the number of qubits of the chip (calibration, Bell tomography edges)
+and the number of samples of the datasets (QML and reuploading classifier
+samples, shots of the histogram experiments).
+
+    python -m benchmarks.synthetic --qubits 40 --samples 5000 --runs 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Qubits per row of the synthetic chip, as on sinq20.
+GRID_WIDTH = 5
+
+# Gates of the process tomography matrices: (file name, matrix size).
+TOMOGRAPHY_GATES = [
+    ("gate_cz_[]_qubits{a}_{b}.npy", 16),
+    ("gate_gpi2_[0.7854]_qubit{a}.npy", 4),
+    ("gate_gpi2_[0.7854]_qubit{b}.npy", 4),
+    ("gate_gpi2_[1.0472]_qubit{a}.npy", 4),
+    ("gate_gpi2_[1.0472]_qubit{b}.npy", 4),
+]
+
+QML_DATASETS = ["statlog", "yeast"]
+
+LIBRARIES = ["qibo", "numpy", "qibolab", "qibocal", "matplotlib", "scipy", "networkx"]
+
+
+def calibration_id(index, seed=0):
+    """Return the 40 character hash of synthetic calibration ``index``."""
+    return hashlib.sha1(f"synthetic-{seed}-{index}".encode()).hexdigest()
+
+
+def run_id(index):
+    """Return the timestamp id of synthetic run ``index``."""
+    return (datetime(2025, 1, 1) + timedelta(days=7 * index)).strftime("%Y%m%d%H%M%S")
+
+
+def chip_edges(n_qubits):
+    """Return the couplers of a ``GRID_WIDTH`` wide grid of ``n_qubits`` qubits."""
+    edges = []
+    for q in range(n_qubits):
+        if q % GRID_WIDTH != GRID_WIDTH - 1 and q + 1 < n_qubits:
+            edges.append((q, q + 1))
+        if q + GRID_WIDTH < n_qubits:
+            edges.append((q, q + GRID_WIDTH))
+    return edges
+
+
+def bitstrings(n_bits):
+    """Return every bitstring of ``n_bits`` bits in counting order."""
+    return [format(i, f"0{n_bits}b") for i in range(2**n_bits)]
+
+
+def write_json(path, data):
+    """Write ``data`` as JSON, creating the parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def histogram(rng, n_bits, shots, peak=None):
+    """Return random counts of ``shots`` shots over ``n_bits`` bitstrings."""
+    weights = rng.random(2**n_bits)
+    if peak is not None:
+        weights[peak] += weights.sum() * 4
+    counts = rng.multinomial(shots, weights / weights.sum())
+    return dict(zip(bitstrings(n_bits), counts.tolist()))
+
+
+def calibration_data(rng, n_qubits):
+    """Return a ``calibration.json`` document for ``n_qubits`` qubits."""
+    single_qubits = {}
+    for q in range(n_qubits):
+        single_qubits[str(q)] = {
+            "resonator": {
+                "bare_frequency": float(rng.uniform(7.0e9, 7.5e9)),
+                "dressed_frequency": float(rng.uniform(7.0e9, 7.5e9)),
+                "depletion_time": None,
+            },
+            "qubit": {"frequency_01": float(rng.uniform(4.0e9, 5.5e9))},
+            "readout": {"fidelity": float(rng.uniform(0.8, 0.99))},
+            "t1": [float(rng.uniform(5e3, 6e4)), None],
+            "t2": [float(rng.uniform(5e2, 3e4)), None],
+            "t2_spin_echo": [float(rng.uniform(5e3, 4e4)), None],
+            "rb_fidelity": [float(rng.uniform(0.99, 0.9999)), float(rng.uniform(0, 1e-3))],
+        }
+    return {
+        "single_qubits": single_qubits,
+        "two_qubits": {},
+        "readout_mitigation_matrix": None,
+        "flux_crosstalk_matrix": None,
+    }
+
+
+def version_data(calibration, run):
+    """Return a ``version_extractor`` results document."""
+    date = datetime.strptime(run, "%Y%m%d%H%M%S")
+    return {
+        "run_id": None,
+        "commit_message": "chore(sinq20): Synthetic calibration\n",
+        "commit_hash": calibration,
+        "commit_date": (date - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S"),
+        "versions": {library: "0.0.0" for library in LIBRARIES},
+        "device": "sinq20",
+        "experiment_date": date.strftime("%Y-%m-%d %H:%M:%S"),
+        "platform": "sinq20",
+        "experiment_note": "Synthetic benchmark run",
+    }
+
+
+def bell_tomography_data(rng, n_qubits):
+    """Return Bell tomography fidelities of every coupler and the best qubit sets."""
+    edges = chip_edges(n_qubits)
+    data = {f"({a}, {b})": float(rng.uniform(0.2, 0.95)) for a, b in edges}
+    ranked = sorted(edges, key=lambda e: -data[f"({e[0]}, {e[1]})"])
+    best = {}
+    for k in range(2, 6):
+        chosen = [list(edge) for edge in ranked[: k - 1]]
+        best[str(k)] = [[chosen, float(np.mean([data[f"({a}, {b})"] for a, b in chosen]))]]
+    data["best_qubits"] = best
+    return data
+
+
+def experiment_meta(rng, description, qubits):
+    """Return the description, runtime and qubits shared by every results file."""
+    return {
+        "runtime": float(rng.uniform(1, 1000)),
+        "description": description,
+        "qubits_used": qubits,
+    }
+
+
+def grover_data(rng, qubits, shots):
+    """Return a Grover results document on ``qubits``."""
+    key = str([qubits]) if len(qubits) == 2 else str(qubits)
+    counts = histogram(rng, len(qubits), shots, peak=-1)
+    frequencies = {bits: count / shots for bits, count in counts.items()}
+    return {
+        "success_rate": {key: frequencies[bitstrings(len(qubits))[-1]]},
+        "plotparameters": {"frequencies": {key: frequencies}},
+        **experiment_meta(rng, f"Grover's algorithm for {len(qubits)} qubits.", qubits),
+    }
+
+
+def ghz_data(rng, qubits, shots):
+    """Return a GHZ results document on ``qubits``."""
+    weights = np.full(2 ** len(qubits), 0.02)
+    weights[0] = weights[-1] = 1.0
+    counts = rng.multinomial(shots, weights / weights.sum())
+    frequencies = dict(zip(bitstrings(len(qubits)), counts.tolist()))
+    return {
+        "success_rate": float((counts[0] + counts[-1]) / shots),
+        "plotparameters": {"frequencies": frequencies},
+        **experiment_meta(rng, f"GHZ state preparation on {len(qubits)} qubits.", qubits),
+    }
+
+
+def mermin_data(rng, qubits, points=50):
+    """Return a Mermin results document on ``qubits``."""
+    theta = np.linspace(0, 2 * np.pi, points)
+    bound = 2 ** ((len(qubits) - 1) / 2) * 2 ** (len(qubits) // 2)
+    values = bound * np.cos(3 * theta) * rng.uniform(0.6, 0.9)
+    key = str(qubits)
+    return {
+        "x": {key: theta.tolist()},
+        "y": {key: values.tolist()},
+        **experiment_meta(rng, "Mermin inequality test.", qubits),
+    }
+
+
+def qft_data(rng, edges, shots):
+    """Return a QFT results document on ``edges``."""
+    n_bits = len({q for edge in edges for q in edge})
+    return {
+        "edges": [list(edge) for edge in edges],
+        "frequencies": histogram(rng, n_bits, shots),
+        **experiment_meta(rng, "Manually transpiled QFT.", sorted({q for e in edges for q in e})),
+    }
+
+
+def amplitude_encoding_data(rng, qubits, shots):
+    """Return an amplitude encoding results document on ``qubits``."""
+    input_vector = rng.random(2 ** len(qubits))
+    probabilities = input_vector**2 / np.sum(input_vector**2)
+    counts = rng.multinomial(shots, probabilities)
+    return {
+        "input_vector": input_vector.tolist(),
+        "plotparameters": {"frequencies": dict(zip(bitstrings(len(qubits)), counts.tolist()))},
+        **experiment_meta(rng, "Amplitude encoding of a random vector.", qubits),
+    }
+
+
+def tomography_results(rng, a, b):
+    """Return a process tomography results document on qubits ``a`` and ``b``."""
+
+    def norms():
+        return {
+            "one_norm": float(rng.random()),
+            "inf_norm": float(rng.random()),
+            "two_norm": float(rng.random()),
+            "time (s)": float(rng.uniform(10, 600)),
+            "average depth": float(rng.uniform(1, 10)),
+            "type of gates (dict)": {},
+        }
+
+    return {
+        "description": "Process tomography of the native gates.",
+        "oneQubitResults": {
+            str(q): {f"gpi2({q}, [{angle}])": norms() for angle in (np.pi / 4, np.pi / 3)}
+            for q in (a, b)
+        },
+        "twoQubitResults": {f"{a}_{b}": {f"cz({a}, {b}, [])": norms()}},
+        "runtime": float(rng.uniform(100, 1000)),
+    }
+
+
+def write_tomography_matrices(rng, directory, a, b):
+    """Write random Pauli transfer matrices of the tomography gates."""
+    os.makedirs(directory, exist_ok=True)
+    for pattern, size in TOMOGRAPHY_GATES:
+        matrix = rng.uniform(-1, 1, (size, size)) + 1j * rng.uniform(-0.1, 0.1, (size, size))
+        np.save(os.path.join(directory, pattern.format(a=a, b=b)), matrix)
+
+
+def reuploading_data(rng, qubit, samples):
+    """Return a reuploading classifier results document with ``samples`` points."""
+    x_train = rng.uniform(-1, 1, (samples, 2))
+    x_test = rng.uniform(-1, 1, (samples, 2))
+    train_predictions = (np.hypot(*x_train.T) < 0.8).astype(float)
+    test_predictions = (np.hypot(*x_test.T) < 0.8).astype(float)
+    train_errors = np.flatnonzero(rng.random(samples) < 0.05)
+    test_errors = np.flatnonzero(rng.random(samples) < 0.05)
+    return {
+        "number_of_gates": 20,
+        "depth": 20,
+        "nshots": 500,
+        "final_loss": None,
+        "train_accuracy": 1 - len(train_errors) / samples,
+        "test_accuracy": 1 - len(test_errors) / samples,
+        "train_pred_errors": train_errors.tolist(),
+        "test_pred_errors": test_errors.tolist(),
+        "x_train": x_train.tolist(),
+        "train_predictions": train_predictions.tolist(),
+        "x_test": x_test.tolist(),
+        "test_predictions": test_predictions.tolist(),
+        "loss_history": [],
+        "final_weights": rng.uniform(-3, 3, (10, 2)).tolist(),
+        "final_biases": rng.uniform(-2, 2, 10).tolist(),
+        **experiment_meta(rng, "Reuploading classifier with 1 qubits, 10 layers.", [qubit]),
+    }
+
+
+def qml_data(rng, dataset, qubits, samples):
+    """Return a ``qml_3q_<dataset>`` results document with ``samples`` samples."""
+    labels = rng.integers(0, 2, samples)
+    predicted = np.where(rng.random(samples) < 0.9, labels, 1 - labels)
+    expvals = rng.random(samples)
+    noiseless = {}
+    verification = {}
+    nqch = {}
+    rp000 = {}
+    for i in range(samples):
+        angles = rng.uniform(-np.pi, np.pi, 16)
+        noiseless[str(i)] = {
+            "orig_angles": angles.tolist(),
+            "input": rng.random(8).tolist(),
+            "weights": rng.random(8).tolist(),
+            "label": int(labels[i]),
+            "predicted_label": int(predicted[i]),
+            "angles": {
+                str(layer): {str(j + 1): float(a) for j, a in enumerate(angles[:6])}
+                for layer in range(3)
+            },
+        }
+        verification[str(i)] = {
+            "predicted_label": int(predicted[i]),
+            "sigmoid_expval": float(expvals[i]),
+            "pure_state_tomography": rng.uniform(-0.5, 0.5, (8, 2)).tolist(),
+        }
+        rp000[str(i)] = {"sigmoid_expval": float(expvals[i]), "predicted_label": int(predicted[i])}
+        nqch[str(i)] = {
+            "sigmoid_expval": float(expvals[i]),
+            "predicted_label": int(predicted[i]),
+            "is_correct": bool(predicted[i] == labels[i]),
+        }
+    correct = int(np.sum(predicted == labels))
+    nqch["_statistics"] = {
+        "qibo_accuracy": correct / samples,
+        "verification_vs_NQHC_accuracy": correct / samples,
+        "original_sim_accuracy_over_processed_subset": correct / samples,
+        "processed_count": samples,
+        "qibo_correct": correct,
+        "pennylane_qibo_match": correct,
+        "original_sim_correct": correct,
+    }
+    return {
+        "args": {"num_qubits": 3, "num_layers": 2, "dataset": dataset, "seed": 42},
+        "accuracy": correct / samples,
+        "noiseless_experiment_ios": noiseless,
+        "verification_ios": verification,
+        "RP000": rp000,
+        "NQCH": nqch,
+        **experiment_meta(
+            rng,
+            "Classification of benchmarking ML dataset using a pretrained variational circuit.",
+            qubits,
+        ),
+    }
+
+
+def generate_calibration(base_dir, calibration, n_qubits, rng):
+    """Write the ``calibration.json`` of a synthetic calibration."""
+    path = Path(base_dir) / "calibrations" / calibration / "sinq20" / "calibration.json"
+    write_json(path, calibration_data(rng, n_qubits))
+    return path
+
+
+def generate_run(base_dir, calibration, run, n_qubits, n_samples, rng):
+    """
+    Write every experiment of a synthetic run.
+
+    Args:
+        base_dir: Data directory, ``data`` for the report generator.
+        calibration: Calibration hash of the run.
+        run: Run id.
+        n_qubits: Number of qubits of the chip.
+        n_samples: Number of samples of the datasets and shots of the
+            histogram experiments.
+        rng: numpy random generator.
+
+    Returns:
+        Path: Directory of the run.
+    """
+    run_dir = Path(base_dir) / calibration / run
+    edges = chip_edges(n_qubits)
+    a, b = edges[rng.integers(len(edges))]
+    three = [a, b, next(q for edge in edges for q in edge if q not in (a, b))]
+
+    experiments = {
+        "version_extractor": version_data(calibration, run),
+        "bell_tomography": bell_tomography_data(rng, n_qubits),
+        "mermin": mermin_data(rng, three),
+        "grover2q": grover_data(rng, [a, b], n_samples),
+        "grover3q": grover_data(rng, three, n_samples),
+        "ghz": ghz_data(rng, three, n_samples),
+        "qft": qft_data(rng, [(a, b), (b, three[2])], n_samples),
+        "amplitude_encoding": amplitude_encoding_data(rng, three, n_samples),
+        "process_tomography": tomography_results(rng, a, b),
+        "reuploading_classifier": reuploading_data(rng, a, n_samples),
+    }
+    for dataset in QML_DATASETS:
+        experiments[f"qml_3q_{dataset}"] = qml_data(rng, dataset, three, n_samples)
+
+    for experiment, data in experiments.items():
+        write_json(run_dir / experiment / "results.json", data)
+    write_tomography_matrices(rng, run_dir / "process_tomography" / "matrices", a, b)
+    return run_dir
+
+
+def generate_runs(base_dir="data", n_runs=2, n_qubits=20, n_samples=1000, seed=0):
+    """
+    Write ``n_runs`` synthetic runs, each with its own calibration.
+
+    Returns:
+        list: ``(calibration, run)`` of every run, oldest first.
+    """
+    rng = np.random.default_rng(seed)
+    runs = []
+    for index in range(n_runs):
+        calibration = calibration_id(index, seed)
+        run = run_id(index)
+        generate_calibration(base_dir, calibration, n_qubits, rng)
+        generate_run(base_dir, calibration, run, n_qubits, n_samples, rng)
+        runs.append((calibration, run))
+    return runs
+
+
+def remove_runs(base_dir, runs):
+    """Delete the synthetic runs and calibrations written by ``generate_runs``."""
+    for calibration, _ in runs:
+        shutil.rmtree(Path(base_dir) / calibration, ignore_errors=True)
+        shutil.rmtree(Path(base_dir) / "calibrations" / calibration, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark runs.")
+    parser.add_argument("--base-dir", default="data", help="Data directory to write to.")
+    parser.add_argument("--qubits", type=int, default=20, help="Number of qubits of the chip.")
+    parser.add_argument("--samples", type=int, default=1000, help="Dataset samples and shots.")
+    parser.add_argument("--runs", type=int, default=2, help="Number of runs.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    for calibration, run in generate_runs(
+        args.base_dir, args.runs, args.qubits, args.samples, args.seed
+    ):
+        print(f"{calibration}:{run}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
-from flask import Flask, render_template_string, request, send_file
+from flask import Flask, abort, redirect, render_template_string, request, send_file, url_for
 import os
-import subprocess
+import sys
 import configparser
 import re
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from client import submit
+import plot_cache
+from render_profiles import PROFILES
 
 app = Flask(__name__)
 
 BASE_DIR = "data"
-PDF_OUTPUT = "report.pdf"  # your script should overwrite/produce this
+# Plot cache of the report daemon (main.py --cache-dir), holding the thumbnails.
+PLOT_CACHE_DIR = os.path.join(".cache", "plots")
+# Build directory of the reports made with main.py when no daemon is running.
+BUILD_DIR = "build"
 
 
 def load_experiment_list(config_file="experiment_list.ini", logger=None):
@@ -95,6 +105,95 @@ def get_comparable_runs():
 
 
 
+def get_previews(runs, cache_dir=PLOT_CACHE_DIR):
+    """
+    Group the plot thumbnails of the cache by run.
+
+    A plot belongs to the runs it reads data of (inputs under
+    ``data/<calibration>/<run>/``): a left/right comparison is listed under
+    both. The same plot rendered by several builds is listed once, latest
+    first.
+
+    Args:
+        runs (list): [calibration_id, run_id] pairs, see ``get_comparable_runs``.
+        cache_dir (str): Plot cache directory.
+
+    Returns:
+        dict: "<calibration>/<run>" -> list of (cache key, caption), in the
+        order of ``runs``, only for runs with thumbnails.
+    """
+    wanted = {tuple(pair) for pair in runs}
+    found = {}
+    seen = set()
+    for key, path, inputs, _ in plot_cache.thumbnails(cache_dir):
+        # Same inputs and file name: the same plot of another build or profile.
+        plot = (tuple(inputs), Path(path).stem)
+        if plot in seen:
+            continue
+        seen.add(plot)
+        owners = []
+        for parts in (Path(p).parts for p in inputs):
+            owners += [pair for pair in zip(parts, parts[1:]) if pair in wanted]
+        for calibration, run in dict.fromkeys(owners):
+            # The ids are already in the title of the group.
+            caption = "_".join(
+                part for part in Path(path).stem.split("_") if part not in (calibration, run)
+            )
+            found.setdefault((calibration, run), []).append((key, caption))
+    return {f"{c}/{r}": found[(c, r)] for c, r in runs if (c, r) in found}
+
+
+def report_argv(form, preview=False):
+    """
+    Return the report command line of the two runs selected in ``form``.
+
+    The report uses the profile asked for in ``form["render_profile"]``, by
+    default the main.py one (print). Previews are drafts with thumbnails.
+    """
+    # Split calibration-id and run-id
+    cal1, run1 = form["dir1"].split("/", 1)
+    cal2, run2 = form["dir2"].split("/", 1)
+    argv = [
+        "--calibration-left", cal1,
+        "--calibration-right", cal2,
+        "--run-left", run1,
+        "--run-right", run2,
+    ]
+    profile = form.get("render_profile")
+    if profile not in PROFILES:
+        profile = "draft" if preview else None
+    if profile is not None:
+        argv += ["--render-profile", profile]
+    if preview:
+        argv.append("--thumbnails")
+    return argv
+
+
+def run_report(argv):
+    """
+    Build a report on the report daemon, or with main.py if none is running.
+
+    Returns:
+        dict: The answer of the daemon (see ``client.submit``); without a
+        daemon only ``status``, ``pdf`` and ``error`` are set.
+    """
+    try:
+        return submit(argv)
+    except ConnectionError as e:
+        print(f"{e}, running main.py")
+
+    result = subprocess.run(
+        [sys.executable, os.path.join("src", "main.py"), *argv, "--build-dir", BUILD_DIR],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {"status": "error", "error": lines[-1] if lines else f"main.py exited with {result.returncode}"}
+    pdf = os.path.abspath(os.path.join(BUILD_DIR, "report.pdf")) if "--pdflatex" in argv else None
+    return {"status": "ok", "pdf": pdf}
+
+
 HTML_FORM = """
 <!doctype html>
 <html>
@@ -115,8 +214,38 @@ HTML_FORM = """
                 {% endfor %}
             </select><br><br>
 
+            <label>Plot quality:</label>
+            <select name="render_profile">
+                <option value="">print</option>
+                <option value="web">web</option>
+                <option value="draft">draft</option>
+            </select><br><br>
+
             <input type="submit" value="Generate PDF">
+            <input type="submit" formaction="/preview" value="Preview plots">
         </form>
+        <p><a href="/previews">Browse plot previews</a></p>
+    </body>
+</html>
+"""
+
+HTML_PREVIEWS = """
+<!doctype html>
+<html>
+    <body>
+        <h2>Plot previews</h2>
+        <p><a href="/">Back</a></p>
+        {% for run, plots in previews.items() %}
+            <h3>{{ run }}</h3>
+            {% for key, caption in plots %}
+                <figure style="display: inline-block; margin: 4px;">
+                    <img src="/thumbnail/{{ key }}" alt="{{ caption }}">
+                    <figcaption><small>{{ caption }}</small></figcaption>
+                </figure>
+            {% endfor %}
+        {% else %}
+            <p>No previews yet: preview the plots of two runs.</p>
+        {% endfor %}
     </body>
 </html>
 """
@@ -128,23 +257,36 @@ def index():
 
 @app.route("/generate", methods=["POST"])
 def generate():
-    d1 = request.form["dir1"]
-    d2 = request.form["dir2"]
+    argv = report_argv(request.form)
 
-    # Split calibration-id and run-id
-    cal1, run1 = d1.split("/", 1)
-    cal2, run2 = d2.split("/", 1)
-    # You can now use cal1, run1, cal2, run2 as needed
-
-    # Call your PDF generation script
-    print("generating pdf with ", cal1, cal2, run1, run2)
-    subprocess.run(["python3", "src/main.py", "--calibration-left", cal1,
-		"--calibration-right", cal2,
-		"--run-left", run1,
-		"--run-right", run2,
-        ], check=True)
-
-    return send_file(PDF_OUTPUT, as_attachment=True, download_name="comparison.pdf")
+    # Build the PDF on the report daemon (python src/daemon.py) if it runs
+    print("generating pdf with ", *argv)
+    result = run_report(argv + ["--pdflatex"])
+    if result["status"] != "ok":
+        return f"Report job {result.get('job')} failed: {result['error']}", 500
+
+    return send_file(result["pdf"], as_attachment=True, download_name="comparison.pdf")
+
+@app.route("/preview", methods=["POST"])
+def preview():
+    # Plots and thumbnails only, without pdflatex
+    result = run_report(report_argv(request.form, preview=True))
+    if result["status"] != "ok":
+        return f"Report job {result.get('job')} failed: {result['error']}", 500
+    return redirect(url_for("previews"))
+
+@app.route("/previews")
+def previews():
+    return render_template_string(HTML_PREVIEWS, previews=get_previews(get_comparable_runs()))
+
+@app.route("/thumbnail/<key>")
+def thumbnail(key):
+    if not re.fullmatch(r"[0-9a-f]{64}", key):
+        abort(404)
+    path = os.path.join(PLOT_CACHE_DIR, key[:2], key + ".thumb.png")
+    if not os.path.isfile(path):
+        abort(404)
+    return send_file(os.path.abspath(path), mimetype="image/png")
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -1,76 +1,92 @@
-import requests
-import jwt
+"""
+Client of the report daemon.
+
+Sends a report job to a running ``daemon.py`` over its Unix socket and
+returns the daemon's answer. The job is the ``main.py`` command line, so
+
+    python src/client.py --calibration-left <cal> --run-left <run> ...
+
+builds the same report as ``python src/main.py ...`` without paying for the
+imports and cold caches of a fresh process. This module only uses the
+standard library so that starting it stays cheap.
+"""
+
+import argparse
+import json
 import os
-from dynaconf import Dynaconf
+import socket
+import sys
 
-# Server URL
-SERVER_URL = "http://localhost:8080/generate_report"
+DEFAULT_SOCKET = os.environ.get("REPORT_DAEMON_SOCKET", ".cache/reportd.sock")
 
-# JWT secret key (must match the server's SECRET_KEY)
-SECRET_KEY = "your_secret_key"
 
+def request(message, socket_path=DEFAULT_SOCKET, timeout=None):
+    """
+    Send one JSON message to the daemon and return its JSON answer.
 
-# Generate a JWT token
-def generate_token(username, password):
-    payload = {"user": username, "password": password, "role": "admin"}
-    token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
-    return token
+    Raises:
+        ConnectionError: If no daemon listens on ``socket_path``.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ConnectionError(f"No report daemon listening on {socket_path}") from e
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            answer = f.readline()
+    if not answer:
+        raise ConnectionError("The report daemon closed the connection without answering")
+    return json.loads(answer)
 
 
-# Make a GET request to the server
-def make_request(username, password):
-    token = generate_token(username, password)
-    headers = {"Authorization": f"Bearer {token}"}
-    try:
-        response = requests.get(SERVER_URL, headers=headers)
-        if response.status_code == 200:
-            print("Response:", response.json())
-        else:
-            print("Error:", response.status_code, response.json())
-    except Exception as e:
-        print("An error occurred:", str(e))
-
-
-# Add functionality to download the report.pdf
-def download_report(username, password):
-    token = generate_token(username, password)
-    headers = {"Authorization": f"Bearer {token}"}
-    downloads_dir = os.path.join(os.getcwd(), "downloads")
-    os.makedirs(downloads_dir, exist_ok=True)
-    file_path = os.path.join(downloads_dir, "report.pdf")
-    try:
-        response = requests.get(
-            f"{SERVER_URL}/../download_report", headers=headers, stream=True
-        )
-        if response.status_code == 200:
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print(f"Report downloaded successfully as '{file_path}'.")
-        else:
-            print("Error:", response.status_code, response.json())
-    except Exception as e:
-        print("An error occurred:", str(e))
+def submit(argv, socket_path=DEFAULT_SOCKET, timeout=None):
+    """
+    Run a report job on the daemon.
 
+    Args:
+        argv: ``main.py`` command line arguments of the report.
+        socket_path: Unix socket of the daemon.
+        timeout: Seconds to wait for the report, None waits forever.
+
+    Returns:
+        dict: ``status`` ("ok" or "error"), the ``job`` id, its ``job_dir``,
+        the shared ``build_dir`` of its runs, the ``report`` and ``pdf``
+        paths, the ``log`` file and the build time in ``seconds``; ``error``
+        describes a failed job.
+    """
+    return request({"argv": list(argv)}, socket_path, timeout)
 
-if __name__ == "__main__":
 
-    # Load credentials from .secrets.toml
-    settings = Dynaconf(
-        settings_files=[".secrets.toml"], environments=True, env="default"
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a report through the report daemon. "
+        "Every option not listed here is passed to the report as is."
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket of the daemon.")
+    parser.add_argument(
+        "--ping", action="store_true", help="Check that the daemon is running."
+    )
+    parser.add_argument(
+        "--shutdown", action="store_true", help="Stop the daemon."
     )
-    print("Loaded settings:", settings.as_dict())
+    args, argv = parser.parse_known_args()
 
-    username = settings.username
-    password = settings.password
+    try:
+        if args.ping:
+            answer = request({"command": "ping"}, args.socket)
+        elif args.shutdown:
+            answer = request({"command": "shutdown"}, args.socket)
+        else:
+            answer = submit(argv, args.socket)
+    except ConnectionError as e:
+        print(e, file=sys.stderr)
+        return 2
 
-    print("1. Generate Report")
-    print("2. Download Report")
-    choice = input("Enter your choice: ")
+    print(json.dumps(answer, indent=2))
+    return 0 if answer.get("status") == "ok" else 1
 
-    if choice == "1":
-        make_request(username, password)
-    elif choice == "2":
-        download_report(username, password)
-    else:
-        print("Invalid choice.")
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,227 @@
+"""
+Long-lived report daemon.
+
+Every ``python src/main.py`` run imports numpy and matplotlib, loads the
+matplotlib fonts and parses the results files again before it can draw
+anything. The daemon pays for this once: it keeps the
+modules imported, the matplotlib state loaded and the parsed files in the
+``RunStore`` cache, and builds reports sent by ``client.py`` over a Unix
+socket.
+
+    python src/daemon.py [--socket .cache/reportd.sock] [--jobs-dir build/jobs]
+                         [--builds-dir build/daemon]
+
+A job is the ``main.py`` command line of a report. Jobs on the same runs
+share a build directory ``<builds-dir>/<runs digest>`` holding the plots, the
+report fragments and the section manifest, so a job only redraws what changed
+since the previous one. Each job gets its own directory ``<jobs-dir>/<job id>``
+with its ``report.tex``, the optional PDF and the job log. Jobs run one at a
+time, in the order they arrive. Like ``main.py`` the daemon runs from the
+repository root.
+
+The protocol is one JSON object per line in each direction:
+``{"argv": [...]}`` runs a job, ``{"command": "ping"}`` and
+``{"command": "shutdown"}`` check and stop the daemon.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import socketserver
+import threading
+import time
+
+import main as report
+import plots
+from client import DEFAULT_SOCKET
+
+PLACEHOLDER = os.path.join("src", "templates", "placeholder.png")
+
+
+def warm_up():
+    """Load the matplotlib fonts and renderers used by the plots."""
+    fig, ax = plots.new_subplots()
+    ax.plot([0, 1], [0, 1], label="warm up")
+    ax.set_title("warm up")
+    ax.set_xlabel(r"$x$")
+    ax.legend()
+    fig.savefig(io.BytesIO(), format="pdf")
+    fig.savefig(io.BytesIO(), format="png")
+
+
+def parse_job(argv):
+    """
+    Parse the command line of a job.
+
+    Raises:
+        ValueError: If the arguments are invalid, with the argparse message.
+    """
+    parser = report.setup_argument_parser()
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            return parser.parse_args(argv)
+    except SystemExit:
+        raise ValueError(stderr.getvalue().strip().splitlines()[-1])
+
+
+class ReportDaemon(socketserver.UnixStreamServer):
+    """Unix socket server building one report at a time."""
+
+    def __init__(self, socket_path, jobs_dir, builds_dir):
+        self.jobs_dir = jobs_dir
+        self.builds_dir = builds_dir
+        self.job_count = 0
+        super().__init__(socket_path, JobHandler)
+
+    def next_job_dir(self):
+        """Create and return the directory of a new job."""
+        self.job_count += 1
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.job_count:04d}"
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        return job_id, job_dir
+
+    def build_dir(self, args):
+        """Create and return the build directory shared by the jobs on the runs of ``args``."""
+        runs = args.runs or [
+            (args.calibration_left, args.run_left),
+            (args.calibration_right, args.run_right),
+        ]
+        digest = hashlib.sha1(repr(list(runs)).encode()).hexdigest()[:12]
+        build_dir = os.path.join(self.builds_dir, digest)
+        os.makedirs(build_dir, exist_ok=True)
+        if not os.path.exists(os.path.join(build_dir, os.path.basename(PLACEHOLDER))):
+            shutil.copy(PLACEHOLDER, build_dir)
+        return build_dir
+
+    def run_job(self, argv):
+        """Build the report of one job and return the answer to the client."""
+        try:
+            args = parse_job(argv)
+        except ValueError as e:
+            return {"status": "error", "error": f"Invalid arguments: {e}"}
+
+        job_id, job_dir = self.next_job_dir()
+        args.build_dir = self.build_dir(args)
+        args.output_dir = job_dir
+        args.pdf_dir = job_dir
+        log_file = os.path.join(job_dir, "report.log")
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        logging.getLogger().addHandler(handler)
+
+        answer = {"job": job_id, "job_dir": job_dir, "build_dir": args.build_dir, "log": log_file}
+        start = time.perf_counter()
+        try:
+            logging.info(f"Job {job_id}: {' '.join(argv)}")
+            output_file, pdf_file = report.generate_report(args)
+            answer.update(report=output_file, pdf=pdf_file)
+            if args.pdflatex and pdf_file is None:
+                answer.update(status="error", error="pdflatex failed")
+            else:
+                answer["status"] = "ok"
+        except Exception as e:
+            logging.exception(f"Job {job_id} failed")
+            answer.update(status="error", error=str(e))
+        finally:
+            answer["seconds"] = round(time.perf_counter() - start, 3)
+            logging.info(f"Job {job_id} finished in {answer['seconds']}s: {answer['status']}")
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+        return answer
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Handle one client connection: read a message, answer it."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line)
+        except ValueError:
+            answer = {"status": "error", "error": "Invalid request"}
+        else:
+            answer = self.dispatch(message)
+        self.wfile.write(json.dumps(answer).encode() + b"\n")
+
+    def dispatch(self, message):
+        command = message.get("command")
+        if command == "ping":
+            return {"status": "ok", "pid": os.getpid(), "jobs": self.server.job_count}
+        if command == "shutdown":
+            # shutdown() waits for serve_forever(), which runs this handler.
+            threading.Thread(target=self.server.shutdown).start()
+            return {"status": "ok"}
+        if "argv" in message:
+            return self.server.run_job(message["argv"])
+        return {"status": "error", "error": f"Unknown request {message!r}"}
+
+
+def remove_stale_socket(socket_path):
+    """
+    Remove a socket file left by a daemon that is gone.
+
+    Raises:
+        RuntimeError: If a daemon still listens on ``socket_path``.
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+    raise RuntimeError(f"A report daemon is already listening on {socket_path}")
+
+
+def serve(
+    socket_path=DEFAULT_SOCKET,
+    jobs_dir=os.path.join("build", "jobs"),
+    builds_dir=os.path.join("build", "daemon"),
+):
+    """Build reports sent to ``socket_path`` until shut down."""
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    remove_stale_socket(socket_path)
+
+    warm_up()
+
+    server = ReportDaemon(socket_path, jobs_dir, builds_dir)
+    logging.info(f"Report daemon {os.getpid()} listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        logging.info("Report daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the report daemon.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket to listen on.")
+    parser.add_argument(
+        "--jobs-dir",
+        default=os.path.join("build", "jobs"),
+        help="Directory holding the report, PDF and log of every job.",
+    )
+    parser.add_argument(
+        "--builds-dir",
+        default=os.path.join("build", "daemon"),
+        help="Directory holding one build directory per set of runs, shared by their jobs.",
+    )
+    args = parser.parse_args()
+    serve(args.socket, args.jobs_dir, args.builds_dir)
+
+
+if __name__ == "__main__":
+    main()
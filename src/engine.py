@@ -0,0 +1,304 @@
+"""
+Section engine for the benchmark report.
+
+Every report section is a ``context_*`` function from ``prepare_context.py``
+described by a ``Section`` entry in ``sections.py``. The engine turns the
+registry into a DAG (a section depends on the sections producing the context
+keys it ``requires``), drops sections that are disabled or whose inputs are
+missing before doing any work, and runs the remaining ones as soon as their
+dependencies are done, either in the current process or in a process pool.
+
+Each section fills its own ``{"left": {}, "right": {}}`` fragment and the
+fragments are merged back in declaration order, so the merged context is the
+same whichever worker finishes first.
+
+When a ``BuildManifest`` is given, sections whose fingerprint did not change
+since the last build are reloaded from it instead of being recomputed.
+"""
+
+import copy
+import glob
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+
+import plot_executor
+import tracing
+
+SIDES = ("left", "right")
+
+
+def new_context():
+    """Return an empty report context with one dict per side."""
+    return {side: {} for side in SIDES}
+
+
+def merge_context(context, fragment):
+    """
+    Merge a section fragment into the report context.
+
+    Per-side dicts are updated key by key, top-level keys are overwritten.
+    """
+    for key, value in fragment.items():
+        if key in SIDES:
+            context.setdefault(key, {}).update(value)
+        else:
+            context[key] = value
+    return context
+
+
+def fallback_fragment(section):
+    """Return a fresh fragment holding only the section's fallback values."""
+    return merge_context(new_context(), copy.deepcopy(section.fallback))
+
+
+def run_targets(cfg):
+    """Return the (side, calibration, run) triples the report compares."""
+    return [
+        ("left", cfg.calibration_left, cfg.run_left),
+        ("right", cfg.calibration_right, cfg.run_right),
+    ]
+
+
+def resolve_inputs(patterns, cfg):
+    """
+    Expand input path templates for every side.
+
+    Returns:
+        dict: side -> list of (expanded path, [matching paths]) pairs.
+    """
+    base_path = Path(cfg.base_dir)
+    resolved = {}
+    for side, calibration, run in run_targets(cfg):
+        resolved[side] = []
+        for pattern in patterns:
+            path = str(base_path / pattern.format(calibration=calibration, run=run))
+            if glob.has_magic(path):
+                matches = sorted(glob.glob(path))
+            else:
+                matches = [path] if os.path.exists(path) else []
+            resolved[side].append((path, matches))
+    return resolved
+
+
+def missing_inputs(section, cfg):
+    """Return the side -> [missing paths] map for the section's required inputs."""
+    missing = {}
+    for side, entries in resolve_inputs(section.inputs, cfg).items():
+        paths = [path for path, matches in entries if not matches]
+        if paths:
+            missing[side] = paths
+    return missing
+
+
+def skip_reason(section, cfg):
+    """Return why a section must not run, or None if it should run."""
+    if section.toggle is not None and not getattr(cfg, section.toggle, True):
+        return "is not set"
+
+    missing = missing_inputs(section, cfg)
+    if not missing:
+        return None
+    if section.require == "any" and len(missing) < len(SIDES):
+        return None
+    paths = [path for side in SIDES for path in missing.get(side, [])]
+    return f"is missing inputs {', '.join(paths)}"
+
+
+def build_graph(sections):
+    """
+    Build the dependency graph of the registry.
+
+    Per-side keys are referenced in ``requires`` as ``"{side}.<key>"``.
+
+    Returns:
+        dict: section name -> set of section names it depends on.
+
+    Raises:
+        ValueError: on duplicated names, context keys declared by two
+            sections, unknown required keys or cycles.
+    """
+    names = set()
+    producers = {}
+    for section in sections:
+        if section.name in names:
+            raise ValueError(f"Duplicated section name: {section.name}")
+        names.add(section.name)
+        keys = list(section.outputs)
+        if section.overlay_plot is not None:
+            keys.append(section.overlay_plot)
+        keys += [f"{{side}}.{key}" for key in section.side_outputs + section.plots]
+        for key in keys:
+            if key in producers:
+                raise ValueError(
+                    f"{section.name} and {producers[key]} both declare context key {key}"
+                )
+            producers[key] = section.name
+
+    graph = {}
+    for section in sections:
+        deps = set()
+        for key in section.requires:
+            if key not in producers:
+                raise ValueError(f"{section.name} requires unknown context key {key}")
+            deps.add(producers[key])
+        deps.discard(section.name)
+        graph[section.name] = deps
+
+    # Kahn's algorithm, only to reject cycles early.
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Cyclic section dependencies: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
+def run_section(section, cfg, upstream=None):
+    """
+    Run a single section and return its context fragment.
+
+    Args:
+        section: The ``Section`` to run.
+        cfg: Parsed command line arguments.
+        upstream: Merged fragments of the sections it depends on, if any.
+
+    A section that raises gets its fallback values merged on top of whatever
+    it managed to fill in, exactly as the sequential report always did.
+
+    Returns:
+        tuple: The fragment and whether the section succeeded, i.e. neither
+        fell back nor got a placeholder for a failed plot.
+    """
+    fragment = new_context()
+    if upstream:
+        merge_context(fragment, copy.deepcopy(upstream))
+
+    failures = []
+    with tracing.span(section.func.__name__, "context", section=section.name):
+        try:
+            fragment = section.func(fragment, cfg, *section.args)
+        except Exception as e:
+            logging.error(f"Error preparing {section.name}: {e}")
+            merge_context(fragment, copy.deepcopy(section.fallback))
+            failures.append(section.name)
+        # Wait for the plots the section handed to the plot executor.
+        plot_executor.resolve(fragment, failures=failures)
+    return fragment, not failures
+
+
+def _run_section_in_worker(section, cfg, upstream):
+    """Run a section in a worker process, return its fragment, success and trace events."""
+    tracing.enable_for(cfg)
+    fragment, ok = run_section(section, cfg, upstream)
+    return fragment, ok, tracing.drain()
+
+
+def run_sections(sections, cfg, jobs=1, manifest=None):
+    """
+    Schedule all sections and merge their fragments into one context.
+
+    Args:
+        sections: Ordered list of ``Section`` entries.
+        cfg: Parsed command line arguments, passed to every section.
+        jobs: Number of worker processes. ``1`` runs everything in-process,
+            ``0`` uses one worker per CPU core.
+        manifest: Optional ``BuildManifest`` used to reuse unchanged sections
+            and updated with the fragments of the recomputed ones. Sections
+            that failed are not recorded, so the next build runs them again.
+
+    Returns:
+        dict: The merged template context.
+    """
+    graph = build_graph(sections)
+    fingerprints = {}
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    done = {}
+    pending = list(sections)
+    running = {}
+
+    def finish(section, fragment, ok):
+        done[section.name] = fragment
+        if manifest is None:
+            return
+        if ok:
+            manifest.record(section, fingerprints[section.name], fragment)
+        else:
+            # A failure may be transient (e.g. a crashed plot worker): do not
+            # let the fallback stick until the inputs change.
+            logging.info(f"{section.name} failed, it will run again on the next build")
+            manifest.forget(section)
+
+    def start_ready(pool):
+        # Start (or settle) every pending section whose dependencies are done.
+        # Skipped sections settle immediately and may unlock others, so loop
+        # until nothing changes.
+        progress = True
+        while progress:
+            progress = False
+            for section in list(pending):
+                if not graph[section.name] <= done.keys():
+                    continue
+                pending.remove(section)
+                progress = True
+
+                reason = skip_reason(section, cfg)
+                if reason is not None:
+                    logging.info(f"{section.name} {reason}, skipping...")
+                    done[section.name] = fallback_fragment(section)
+                    fingerprints[section.name] = reason
+                    continue
+
+                if manifest is not None:
+                    upstream_fps = [fingerprints[dep] for dep in graph[section.name]]
+                    fingerprint = manifest.fingerprint(section, cfg, upstream_fps)
+                    fingerprints[section.name] = fingerprint
+                    fragment = manifest.lookup(section, fingerprint)
+                    if fragment is not None:
+                        logging.info(f"{section.name} is unchanged, reusing last build")
+                        done[section.name] = fragment
+                        continue
+
+                upstream = new_context()
+                for dep in graph[section.name]:
+                    merge_context(upstream, done[dep])
+
+                if pool is None:
+                    finish(section, *run_section(section, cfg, upstream))
+                else:
+                    future = pool.submit(_run_section_in_worker, section, cfg, upstream)
+                    running[future] = section
+
+    if jobs is None or jobs <= 1:
+        start_ready(None)
+    else:
+        # Imported here: multiprocessing is not needed by in-process builds.
+        from concurrent.futures import ProcessPoolExecutor
+
+        logging.info(f"Running {len(sections)} sections on {jobs} worker processes")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            start_ready(pool)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    fragment, ok, events = future.result()
+                    tracing.extend(events)
+                    finish(running.pop(future), fragment, ok)
+                start_ready(pool)
+
+    if manifest is not None:
+        manifest.save()
+
+    # Merge in declaration order, not completion order.
+    context = new_context()
+    for section in sections:
+        merge_context(context, done[section.name])
+    return context
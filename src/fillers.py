@@ -1,33 +1,25 @@
-import argparse
 from pathlib import Path
-from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
 import logging
-import os
 import json
 import numpy as np
-import pdb
 import re
 
+from runstore import load_json
 
-import matplotlib.pyplot as plt
 
+def get_qml_accuracy(filename, store=None):
 
-def get_qml_accuracy(filename):
-
-    with open(filename, "r") as f:
-        results = json.load(f)
+    results = load_json(filename, store)
     try:
         _ = results['NQCH']['_statistics']['qibo_accuracy']
-    except exception as e:
+    except (KeyError, TypeError):
         _ = "N/A."
     return _
 
 
-def extract_description(filename):
+def extract_description(filename, store=None):
 
-    with open(filename, "r") as f:
-        results = json.load(f)
+    results = load_json(filename, store)
 
     return results.get("description", " --- No description provided. ---")
 
@@ -61,52 +53,27 @@ def format_runtime(runtime_value):
         return "N/A"
 
 
-def extract_runtime(filename):
+def extract_runtime(filename, store=None):
 
-    with open(filename, "r") as f:
-        results = json.load(f)
+    results = load_json(filename, store)
 
     runtime_value = results.get("runtime", None)
     return format_runtime(runtime_value)
 
 
-def extract_qubits_used(filename):
+def extract_qubits_used(filename, store=None):
 
-    with open(filename, "r") as f:
-        results = json.load(f)
+    results = load_json(filename, store)
 
     return results.get("qubits_used", " --- No ``qubits\_used'' provided. ---")
 
 
 def process_commit_info(filename):
-    with open(filename, "r") as f:
-        results = json.load(f)
+    results = load_json(filename)
 
     return results
 
 
-def context_plot_1(exp_name):
-    """
-    Generates a plot with y-axis from 0 to 1 and x-axis from 0 to 500.
-    Returns the filepath of the saved image.
-    """
-    fig, ax = plt.subplots()
-    ax.set_xlim(0, 500)
-    ax.set_ylim(0, 1)
-    ax.set_xlabel("X")
-    ax.set_ylabel("Y")
-    ax.set_title("Plot 1: what do you want?")
-    # Optionally, plot a line or leave empty
-    # ax.plot([], [])
-    output_dir = Path("build")
-    output_dir.mkdir(exist_ok=True)
-    filename = f"plot_1_{exp_name}.pdf"
-    filepath = output_dir / filename
-    plt.savefig(filepath)
-    plt.close(fig)
-    return str(filepath)
-
-
 def get_maximum_mermin(experiment_dir, filename):
     """
     Extracts the maximum absolute value from the Mermin results JSON file.
@@ -115,8 +82,7 @@ def get_maximum_mermin(experiment_dir, filename):
       - {"y": [..]}
     """
     results_json_path = Path(experiment_dir) / filename
-    with open(results_json_path, "r") as f:
-        results = json.load(f)
+    results = load_json(results_json_path)
 
     y_data = results.get("y")
     if y_data is None:
@@ -166,8 +132,7 @@ def context_version(calibration_id, version_extractor_results_path):
         # import pdb
 
         # pdb.set_trace()
-        with open(version_extractor_results_path, "r") as f:
-            version_data = json.load(f)
+        version_data = load_json(version_extractor_results_path)
 
         return {
             "versions": version_data.get("versions", {}),
@@ -189,14 +154,13 @@ def context_version(calibration_id, version_extractor_results_path):
         }
 
 
-def context_fidelity(experiment_dir):
+def context_fidelity(experiment_dir, store=None):
     """
     Extracts the list of fidelities and error bars from the experiment results.
     Returns a list of dicts: {"fidelity": ..., "error_bars": ...}
     """
     results_json_path = Path("data") / "calibrations" / experiment_dir / "calibration.json"
-    with open(results_json_path, "r") as f:
-        results = json.load(f)
+    results = load_json(results_json_path, store)
 
     # Extract rb_fidelity from the new structure
     single_qubits = results.get("single_qubits", {})
@@ -262,13 +226,12 @@ def context_fidelity(experiment_dir):
     return _
 
 
-def get_stat_fidelity(raw_data, experiment_dir):
+def get_stat_fidelity(raw_data, experiment_dir, store=None):
     """
     Returns a dictionary with average, min, max, and median fidelity for the given experiment directory.
     """
 
-    with open(raw_data, "r") as f:
-        results = json.load(f)
+    results = load_json(raw_data, store)
 
     fidelities = results.get('"fidelity"', {})
     # Convert dict_values to list and flatten if needed
@@ -295,13 +258,12 @@ def get_stat_fidelity(raw_data, experiment_dir):
     return dict_fidelities
 
 
-def get_stat_t12(experiment_dir, stat_type):
+def get_stat_t12(experiment_dir, stat_type, store=None):
     """
     Returns a dictionary with average, min, max, and median T1 for the given experiment directory.
     """
     results_json_path = Path("data") / experiment_dir / "calibration.json"
-    with open(results_json_path, "r") as f:
-        results = json.load(f)
+    results = load_json(results_json_path, store)
 
     # Extract T1 values for all qubits from the "single_qubits" section
     single_qubits = results.get("single_qubits", {})
@@ -335,8 +297,7 @@ def get_stat_pulse_fidelity(experiment_dir):
     Returns a dictionary with average, min, max, and median pulse fidelity for the given experiment directory.
     """
     results_json_path = Path("data") / experiment_dir / "data/rb-0/results.json"
-    with open(results_json_path, "r") as f:
-        results = json.load(f)
+    results = load_json(results_json_path)
 
     pulse_fidelities = results.get('"pulse_fidelity"', {})
     # Convert dict_values to list and flatten if needed
@@ -363,13 +324,12 @@ def get_stat_pulse_fidelity(experiment_dir):
     return dict_pulse_fidelities
 
 
-def get_readout_fidelity(raw_data, experiment_dir):
+def get_readout_fidelity(raw_data, experiment_dir, store=None):
     """
     Returns a dictionary with average, min, max, and median readout fidelity for the given experiment directory.
     """
     # results_json_path = Path("data") / experiment_dir / "calibration.json"
-    with open(raw_data, "r") as f:
-        results = json.load(f)
+    results = load_json(raw_data, store)
 
     # Extract readout fidelity from the new structure
     single_qubits = results.get("single_qubits", {})
@@ -423,20 +383,20 @@ def extract_qubits_from_edges(edges):
     return sorted(list(qubits_set))
 
 
-def extract_best_qubits(bell_tomography_results_path):
+def extract_best_qubits(bell_tomography_results_path, store=None):
     """
     Extract the best qubits data from bell tomography results.
     Supports both old format (flat qubit list) and new format (edges list).
 
     Args:
         bell_tomography_results_path (str): Path to the bell_tomography results.json file
+        store (RunStore, optional): Store the file is loaded through, if any
 
     Returns:
         dict: Dictionary containing best qubits for k=2,3,4,5 with their fidelities
     """
     try:
-        with open(bell_tomography_results_path, "r") as f:
-            results = json.load(f)
+        results = load_json(bell_tomography_results_path, store)
 
         best_qubits_data = results.get("best_qubits", {})
 
@@ -0,0 +1,182 @@
+"""
+Bitstring histograms of the GHZ, Grover, QFT and Amplitude Encoding plots
+and of their overlays comparing runs.
+
+Frequencies are kept sparse: one integer outcome index and one count per
+measured bitstring, never an array of all ``2**n_bits`` outcomes. Small
+registers are still drawn in full, every outcome with its bar; above
+``DENSE_OUTCOMES`` possible outcomes only the ``top_k`` most frequent get a
+bar and the rest is summed in an "other" bar. Either way the bars come from
+precomputed arrays and are drawn with a single ``bar`` call, so a plot costs
+the same at 5 and at 20 qubits.
+
+    hist = from_frequencies(data["plotparameters"]["frequencies"])
+    draw(ax, hist, color="skyblue")
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+# Registers with at most this many possible outcomes show all of them.
+DENSE_OUTCOMES = 64
+# Number of bars of the larger registers, without the "other" bar.
+TOP_K = 32
+OTHER_LABEL = "other"
+OTHER_COLOR = "lightgrey"
+# Outcome index of the "other" bar.
+OTHER = -1
+
+
+@dataclass(frozen=True)
+class Histogram:
+    """Sparse measured frequencies of an ``n_bits`` register."""
+
+    n_bits: int
+    # Sorted outcome indices, bitstrings read as big-endian integers.
+    outcomes: np.ndarray
+    # Count (or probability) of every outcome.
+    counts: np.ndarray
+
+    @property
+    def total(self):
+        return float(self.counts.sum())
+
+    def label(self, outcome):
+        """Return the bitstring of an outcome index."""
+        return OTHER_LABEL if outcome == OTHER else format(int(outcome), f"0{self.n_bits}b")
+
+
+def from_frequencies(frequencies, n_bits=None):
+    """
+    Build a histogram from a ``{bitstring: count}`` dict.
+
+    Args:
+        frequencies (dict): Measured counts or probabilities per bitstring.
+        n_bits (int, optional): Register size, by default the length of the
+            longest bitstring.
+
+    Returns:
+        Histogram: The frequencies, sorted by outcome.
+
+    Raises:
+        ValueError: If a key is not a bitstring or the register is larger
+            than 63 qubits.
+    """
+    keys = [str(key) for key in frequencies]
+    if not all(key and set(key) <= {"0", "1"} for key in keys):
+        raise ValueError(f"Frequencies are not indexed by bitstrings: {keys[:4]}")
+    if n_bits is None:
+        n_bits = max((len(key) for key in keys), default=0)
+    if n_bits > 63:
+        raise ValueError(f"Cannot index the outcomes of {n_bits} qubits")
+    outcomes = np.fromiter((int(key, 2) for key in keys), dtype=np.int64, count=len(keys))
+    counts = np.fromiter(frequencies.values(), dtype=float, count=len(keys))
+    order = np.argsort(outcomes, kind="stable")
+    return Histogram(n_bits, outcomes[order], counts[order])
+
+
+@lru_cache(maxsize=16)
+def _dense_labels(n_bits):
+    return tuple(format(i, f"0{n_bits}b") for i in range(2**n_bits))
+
+
+def bars(hist, top_k=TOP_K, dense_outcomes=DENSE_OUTCOMES):
+    """
+    Return the bars of a histogram, left to right.
+
+    Registers with at most ``dense_outcomes`` possible outcomes get one bar
+    per outcome in index order, so bar ``i`` is outcome ``i``. Larger ones
+    get their ``top_k`` most frequent outcomes by decreasing count, then an
+    "other" bar with the remaining total when it is not zero.
+
+    Returns:
+        tuple: ``(outcomes, heights, labels)``; ``outcomes`` holds the outcome
+        index of every bar, ``OTHER`` for the "other" bar.
+    """
+    if 2**hist.n_bits <= dense_outcomes:
+        size = 2**hist.n_bits
+        heights = np.bincount(hist.outcomes, weights=hist.counts, minlength=size)
+        return np.arange(size), heights, list(_dense_labels(hist.n_bits))
+
+    k = min(top_k, len(hist.counts))
+    # Decreasing count, ties by outcome: argpartition keeps this O(n).
+    top = np.argpartition(-hist.counts, k - 1)[:k] if k else np.array([], dtype=int)
+    top = top[np.lexsort((hist.outcomes[top], -hist.counts[top]))]
+    outcomes, heights = hist.outcomes[top], hist.counts[top]
+    other = hist.total - heights.sum()
+    if other > 0:
+        outcomes = np.append(outcomes, OTHER)
+        heights = np.append(heights, other)
+    return outcomes, heights, [hist.label(outcome) for outcome in outcomes]
+
+
+def draw(ax, hist, color, edgecolor="black", rotation=45, top_k=TOP_K):
+    """
+    Draw a histogram on ``ax`` with one ``bar`` call.
+
+    Args:
+        ax: Matplotlib axes.
+        hist (Histogram): Frequencies to draw.
+        color: Colour of the outcome bars; the "other" bar is grey.
+        edgecolor: Colour of the bar edges.
+        rotation: Rotation of the bitstring tick labels, in degrees.
+        top_k (int): Number of outcome bars of the larger registers.
+
+    Returns:
+        tuple: The ``BarContainer`` and the outcome index of every bar, as
+        returned by ``bars``.
+    """
+    outcomes, heights, labels = bars(hist, top_k=top_k)
+    x = np.arange(len(heights))
+    colors = [OTHER_COLOR if outcome == OTHER else color for outcome in outcomes]
+    container = ax.bar(x, heights, color=colors, edgecolor=edgecolor)
+    ax.set_xticks(x, labels, rotation=rotation, ha="right" if rotation else "center")
+    if len(labels) > 16:
+        ax.tick_params(axis="x", labelsize=6)
+    ax.set_xlim(-0.6, len(heights) - 0.4)
+    return container, outcomes
+
+
+def aligned_bars(hists, top_k=TOP_K, dense_outcomes=DENSE_OUTCOMES):
+    """
+    Return the bars of several histograms on shared outcomes, as probabilities.
+
+    Every histogram is normalized to its total, so runs with a different
+    number of shots compare. Outcomes are chosen as in ``bars``, the larger
+    registers keeping the ``top_k`` outcomes with the highest probability in
+    any run, and an "other" bar when some probability is left out.
+
+    Returns:
+        tuple: ``(outcomes, heights, labels)`` with ``heights`` of shape
+        ``(len(hists), n_bars)``.
+    """
+    n_bits = max(hist.n_bits for hist in hists)
+    if 2**n_bits <= dense_outcomes:
+        size = 2**n_bits
+        heights = np.array(
+            [
+                np.bincount(hist.outcomes, weights=hist.counts, minlength=size)
+                / (hist.total or 1.0)
+                for hist in hists
+            ]
+        )
+        return np.arange(size), heights, list(_dense_labels(n_bits))
+
+    outcomes = np.unique(np.concatenate([hist.outcomes for hist in hists]))
+    # Probability of every outcome of the union, one row per run.
+    probabilities = np.zeros((len(hists), len(outcomes)))
+    for row, hist in zip(probabilities, hists):
+        row[np.searchsorted(outcomes, hist.outcomes)] = hist.counts / (hist.total or 1.0)
+    peak = probabilities.max(axis=0)
+    k = min(top_k, len(outcomes))
+    top = np.argpartition(-peak, k - 1)[:k] if k else np.array([], dtype=int)
+    top = top[np.lexsort((outcomes[top], -peak[top]))]
+    outcomes, heights = outcomes[top], probabilities[:, top]
+    other = np.clip(1.0 - heights.sum(axis=1), 0.0, None)
+    if other.max(initial=0.0) > 1e-12:
+        outcomes = np.append(outcomes, OTHER)
+        heights = np.column_stack([heights, other])
+    labels = [OTHER_LABEL if o == OTHER else format(int(o), f"0{n_bits}b") for o in outcomes]
+    return outcomes, heights, labels
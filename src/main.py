@@ -1,44 +1,17 @@
 import argparse
-from multiprocessing import context
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 import logging
 import os
-import json
-import numpy as np
-import fillers as fl
-import sys
-import plots as pl
-import config
-import pdb
-
-from prepare_context import (
-    context_fidelity_plots_and_table,
-    context_mermin_plots,
-    context_mermin_table,
-    context_grover2q_plots,
-    context_grover3q_plots,
-    context_ghz_plots,
-    context_process_tomography_plots,
-    context_tomography_plots,
-    context_reuploading_classifier_plots,
-    context_qft_plots,
-    context_yeast_4q_plots,
-    context_yeast_3q_plots,
-    context_statlog_4q_plots,
-    context_statlog_3q_plots,
-    context_amplitude_encoding_plots,
-    add_stat_changes,
-    # context_fidelity_statistics,
-    # context_pulse_fidelity_statistics,
-    # context_t1_statistics,
-    # context_t2_statistics,
-    # context_readout_fidelity_statistics,
-    # context_calibration_data,
-    # context_commit_info,
-    context_version_extractor,
-)
+import subprocess
+import plot_executor
+import tracing
+from engine import run_sections
+from sections import SECTIONS, add_section_flags
+from manifest import BuildManifest
+from multirun import parse_run, prepare_multi_context
+from render_profiles import DEFAULT_PROFILE, PROFILES
 
 # Configure logging
 logging.basicConfig(
@@ -46,6 +19,12 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
 
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+# Master of report_template.j2 with --fragments, see render_fragments.
+FRAGMENTS_TEMPLATE = "report_fragments.j2"
+# Compiled templates, next to the plot cache and kept by ``make clean``.
+TEMPLATE_CACHE_DIR = os.path.join(".cache", "templates")
+
 
 def setup_argument_parser():
     """Set up the command line argument parser."""
@@ -82,56 +61,105 @@ def setup_argument_parser():
         help="Run id for the left experiment.",
     )
 
-    # Plot toggles (default: True). Use --no-<flag> to disable.
+    parser.add_argument(
+        "--run",
+        dest="runs",
+        type=parse_run,
+        action="append",
+        metavar="CALIBRATION:RUN",
+        help="Run to compare, repeat for an N-way comparison report "
+        "(replaces the left/right options).",
+    )
+
+    # Plot toggles (default: True). Use --no-<flag> to disable. One flag is
+    # generated for every toggle declared in the section registry.
     parser.add_argument(
         "--no-t1-plot", dest="t1_plot", default=False, action="store_false"
     )
-    parser.add_argument("--no-mermin-plot", dest="mermin_plot", action="store_false")
+    add_section_flags(parser)
+
     parser.add_argument(
-        "--no-reuploading-plot", dest="reuploading_plot", action="store_false"
+        "--build-dir",
+        type=str,
+        default="build",
+        help="Directory for plots and the incremental build manifest.",
     )
     parser.add_argument(
-        "--no-grover2q-plot", dest="grover2q_plot", action="store_false"
+        "--output-dir",
+        type=str,
+        default=".",
+        help="Directory for the generated report.tex.",
     )
     parser.add_argument(
-        "--no-grover3q-plot", dest="grover3q_plot", action="store_false"
+        "--rebuild",
+        action="store_true",
+        help="Recompute every section instead of reusing unchanged ones from the build manifest.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".cache/plots",
+        help="Persistent plot cache directory (empty string disables the cache).",
     )
-
-    parser.add_argument("--no-ghz-plot", dest="ghz_plot", action="store_false")
     parser.add_argument(
-        "--no-process-tomography-plot",
-        dest="process_tomography_plot",
-        action="store_false",
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="Disable the persistent plot cache.",
     )
     parser.add_argument(
-        "--no-qft-plot",
-        dest="qft_plot",
-        action="store_false",
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes used to prepare report sections (0: one per CPU core).",
     )
     parser.add_argument(
-        "--no-tomography-plot", dest="tomography_plot", action="store_false"
+        "--render-profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Plot output profile: draft (72 DPI PNGs), web (PDFs with rasterized "
+        "dense artists) or print (full quality, the default).",
     )
     parser.add_argument(
-        "--no-reuploading-classifier-plot",
-        dest="reuploading_classifier_plot",
-        action="store_false",
+        "--thumbnails",
+        action="store_true",
+        help="Also write a low resolution PNG preview next to every plot, "
+        "<name>.thumb.png, and keep it in the plot cache for the web UI.",
     )
     parser.add_argument(
-        "--no-yeast-plot-4q", dest="yeast_plot_4q", action="store_false"
+        "--overlay",
+        action="store_true",
+        help="Draw the left and right results of the Mermin and histogram sections "
+        "in one figure with a difference panel, and the chip fidelities as one "
+        "heatmap of their changes, instead of one figure per side.",
     )
     parser.add_argument(
-        "--no-yeast-plot-3q", dest="yeast_plot_3q", action="store_false"
+        "--plot-threads",
+        type=int,
+        default=1,
+        help="Number of threads drawing the plots of a section (default 1: draw them "
+        "one by one). matplotlib's text layout is not thread-safe, so more threads "
+        "can fail plots with math text labels.",
     )
     parser.add_argument(
-        "--no-statlog-plot-4q", dest="statlog_plot_4q", action="store_false"
+        "--fragments",
+        action="store_true",
+        help="Write every section of a left/right report to its own .tex file in "
+        "<build-dir>/tex, only when it changed, and make report.tex \\input them.",
     )
     parser.add_argument(
-        "--no-statlog-plot-3q", dest="statlog_plot_3q", action="store_false"
+        "--pdflatex",
+        action="store_true",
+        help="Compile report.tex to a PDF in the build directory.",
     )
     parser.add_argument(
-        "--no-amplitude-encoding-plot",
-        dest="amplitude_encoding_plot",
-        action="store_false",
+        "--profile-trace",
+        type=str,
+        default=None,
+        metavar="OUT.json",
+        help="Write a Chrome trace-event profile of the build (open it in Perfetto).",
     )
     return parser
 
@@ -139,301 +167,239 @@ def setup_argument_parser():
 def prepare_template_context(cfg):
     """
     Prepare a complete template context for the benchmarking report.
-    """
-    logging.info("Preparing context for full benchmarking report.")
-
-    context = {"left": {}, "right": {}}
 
-    # create left and right box of version data
-    try:
-        context = context_version_extractor(context, cfg)
-    except Exception as e:
-        print(e)
-        logging.error(f"Error preparing metadata: {e}")
-        # Fallback metadata for both sides
-        default_meta = {
-            "experiment_name": "Unknown",
-            "platform": "Unknown",
-            "start_time": "Unknown",
-            "end_time": "Unknown",
-        }
-        context.setdefault("left", {}).update(default_meta)
-        context.setdefault("right", {}).update(default_meta)
-
-    ##### T1 statistics
-    try:
-        stat_t1 = fl.get_stat_t12("calibrations/"+cfg.calibration_left + "/sinq20", "t1")
-        stat_t1_right = fl.get_stat_t12("calibrations/"+cfg.calibration_right + "/sinq20", "t1")
-        stat_t1_with_improvement = add_stat_changes(stat_t1, stat_t1_right)
+    The sections declared in ``sections.SECTIONS`` are scheduled by the
+    engine: disabled sections and sections with missing inputs get their
+    fallback values without running, the others run one after another or in
+    ``cfg.jobs`` worker processes. The merged context is the same either way.
+    Sections unchanged since the last build in ``cfg.build_dir`` are reloaded
+    from its manifest unless ``--rebuild`` is given.
 
-        context["left"]["stat_t1"] = stat_t1_with_improvement
-        context["right"]["stat_t1"] = stat_t1_right
+    With ``--run`` the N-way comparison context of ``multirun`` is prepared
+    instead.
+    """
+    logging.info("Preparing context for full benchmarking report.")
 
+    if getattr(cfg, "runs", None):
+        logging.info(f"Comparing {len(cfg.runs)} runs")
+        return prepare_multi_context(cfg)
 
-        logging.info("Prepared stat_t1 and stat_t1_with_improvement")
+    manifest = BuildManifest.for_build(cfg)
+    if getattr(cfg, "rebuild", False):
+        manifest.sections = {}
 
-    except Exception as e:
-        logging.error(f"Error preparing statistics 1 table: {e}")
+    context = run_sections(
+        SECTIONS, cfg, jobs=getattr(cfg, "jobs", 1), manifest=manifest
+    )
+    if manifest.reused:
+        logging.info(f"Reused {len(manifest.reused)} unchanged sections from {manifest.path}")
+    return context
 
 
-    ##### T2 statistics
-    try:    
-        """Prepare T2 statistics for both experiments."""
-        stat_t2 = fl.get_stat_t12("calibrations/" + cfg.calibration_left + "/sinq20", "t2")
-        stat_t2_right = fl.get_stat_t12("calibrations/" + cfg.calibration_right + "/sinq20", "t2")
-        stat_t2_with_improvement = add_stat_changes(stat_t2, stat_t2_right)
+@lru_cache(maxsize=None)
+def template_environment(cache_dir=TEMPLATE_CACHE_DIR):
+    """
+    Return the Jinja environment of the report templates.
 
-        context["left"]["stat_t2"] = stat_t2_with_improvement
-        context["right"]["stat_t2"] = stat_t2_right
+    The environment is created once per process and keeps the templates it
+    compiled, so the daemon and the benchmarks compile each template once:
+    with ``auto_reload`` a template is only compiled again when the mtime of
+    its file changes. The compiled code is also stored in ``cache_dir``, from
+    which a new process loads it instead of compiling the template.
 
-        logging.info("Prepared stat_t2 and stat_t2_with_improvement")
-    except Exception as e:
-        logging.error(f"Error preparing statistics 2 table: {e}")
+    Args:
+        cache_dir: Bytecode cache directory, None or empty to disable it.
 
-    # import pdb
-    # pdb.set_trace()
+    Returns:
+        jinja2.Environment: Shared by every call with the same ``cache_dir``.
+    """
+    bytecode_cache = None
+    if cache_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        except OSError as e:
+            logging.warning(f"Template bytecode cache disabled: {e}")
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        auto_reload=True,
+        bytecode_cache=bytecode_cache,
+    )
 
-    ##### FIDELITY 
-    try:
-        """Prepare fidelity statistics for both experiments."""
-        stat_fidelity = fl.get_stat_fidelity(
-            os.path.join("data", "calibrations", cfg.calibration_left, "sinq20", "calibration.json"),
-            cfg.calibration_left,
-        )
-        stat_fidelity_right = fl.get_stat_fidelity(
-            os.path.join("data", "calibrations", cfg.calibration_right, "sinq20", "calibration.json"),
-            cfg.calibration_right,
-        )
-        stat_fidelity_with_improvement = add_stat_changes(
-            stat_fidelity, stat_fidelity_right
-        )
 
-        context["left"]["stat_fidelity"] = stat_fidelity_with_improvement
-        context["right"]["stat_fidelity"] = stat_fidelity_right
+def write_if_changed(path, content):
+    """
+    Write ``content`` to ``path`` unless the file already holds it.
 
-        logging.info("Prepared stat_fidelity and stat_fidelity_with_improvement")
-    except Exception as e:
-        logging.error(f"Error preparing statistics 1' table: {e}")
+    An unchanged file keeps its mtime, so LaTeX drivers and ``make`` see that
+    it did not change.
 
-    ##### READOUT FIDELITY
+    Returns:
+        bool: Whether the file was written.
+    """
     try:
-        """Prepare readout fidelity statistics for both experiments."""
-        stat_readout_fidelity = fl.get_readout_fidelity(
-            os.path.join("data", "calibrations", cfg.calibration_left, "sinq20", "calibration.json"),
-            cfg.calibration_left,
-        )
-        stat_readout_fidelity_right = fl.get_readout_fidelity(
-            os.path.join("data", "calibrations", cfg.calibration_right, "sinq20", "calibration.json"),
-            cfg.calibration_right,
-        )
-
-        context["left"]["stat_readout_fidelity"] = stat_readout_fidelity
-        context["right"]["stat_readout_fidelity"] = stat_readout_fidelity_right
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "w") as f:
+        f.write(content)
+    return True
 
-        logging.info("Prepared readout fidelity statistics")
-    except Exception as e:
-        logging.error(f"Error preparing statistics 2' table: {e}")
-        # context = context_mermin_table(context, cfg)
-        # context = context_pulse_fidelity_statistics(context, cfg)
 
+def render_fragments(template, context, fragments_dir):
+    """
+    Render every block of ``template`` to its own .tex fragment.
 
+    Each section of ``report_template.j2`` is a block; the blocks only read
+    the template context, so they render independently of each other.
 
-    # FIDELITY PLOT MAIN PAGE
-    try:
-        context = context_fidelity_plots_and_table(context, cfg)
-    except Exception as e:
-        logging.error(f"Error preparing fidelity plots: {e}")
-        context["plot_exp"] = "placeholder.png"
-        context["plot_right"] = "placeholder.png"
-        context["best_qubits_left"] = {
-            k: {"qubits": "N/A", "fidelity": "N/A"} for k in ["2", "3", "4", "5"]
-        }
-        context["best_qubits_right"] = {
-            k: {"qubits": "N/A", "fidelity": "N/A"} for k in ["2", "3", "4", "5"]
-        }
-
-    # MERMIN
-    if cfg.mermin_plot:
-        try:
-            context = context_mermin_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing Mermin plots: {e}")
-            context["mermin_plot_is_set"] = None
-    else:
-        context["mermin_plot_is_set"] = None
+    Args:
+        template: Loaded Jinja template.
+        context: Template context dictionary.
+        fragments_dir: Directory of the fragments, ``<block>.tex``.
 
-    # GROVER 2Q PLOTS
-    if cfg.grover2q_plot:
-        try:
-            context = context_grover2q_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing Grover 2Q plots: {e}")
-            context["grover2q_plot_is_set"] = None
-    else:
-        logging.info("Grover 2Q plot is not set, skipping...")
-        context["grover2q_plot_is_set"] = None
+    Returns:
+        dict: Block name -> path of its fragment, relative like the plot
+        paths of the context.
+    """
+    os.makedirs(fragments_dir, exist_ok=True)
+    fragments = {}
+    written = 0
+    for name, render_block in template.blocks.items():
+        with tracing.span(name, "render", template=template.name):
+            content = "".join(render_block(template.new_context(context)))
+        fragments[name] = os.path.join(fragments_dir, f"{name}.tex")
+        written += write_if_changed(fragments[name], content)
+    logging.info(f"Wrote {written} of {len(fragments)} report fragments to {fragments_dir}")
+    return fragments
 
-    # GROVER 3Q PLOTS
-    if cfg.grover3q_plot:
-        try:
-            context = context_grover3q_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing Grover 3Q plots: {e}")
-            context["grover3q_plot_is_set"] = None
-    else:
-        logging.info("Grover 3Q plot is not set, skipping...")
-        context["grover3q_plot_is_set"] = None
 
-    # GHZ PLOTS
-    if cfg.ghz_plot:
-        try:
-            context = context_ghz_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing GHZ plots: {e}")
-            context["ghz_plot_is_set"] = None
-    else:
-        logging.info("GHZ plot is not set, skipping...")
-        context["ghz_plot_is_set"] = None
-
-    # # tomography
-    # if cfg.tomography_plot:
-    #     try:
-    #         context = context_tomography_plots(context, cfg)
-    #     except Exception as e:
-    #         logging.error(f"Error preparing Tomography plots: {e}")
-    #         context["tomography_plot_is_set"] = None
-    # else:
-    #     logging.info("Tomography plot is not set, skipping...")
-    #     context["tomography_plot_is_set"] = None
-
-    # PROCESS TOMOGRAPHY PLOTS
-    if cfg.process_tomography_plot:
-        try:
-            context = context_process_tomography_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing Process Tomography plots: {e}")
-            context["process_tomography_plot_is_set"] = None
-    else:
-        logging.info("Process Tomography plot is not set, skipping...")
-        context["process_tomography_plot_is_set"] = None
+def render_and_save_report(context, args):
+    """
+    Render the LaTeX template and save the generated report.
 
-    # import pdb
-    # pdb.set_trace()
+    Args:
+        context: Template context dictionary.
+        args: Parsed command line arguments.
 
-    # REUPLOADING CLASSIFIER PLOTS
-    if cfg.reuploading_classifier_plot:
-        try:
-            context = context_reuploading_classifier_plots(context, cfg)
-        except Exception as e:
-            print(e)
-            logging.error(f"Error preparing Reuploading Classifier plots: {e}")
-            context["reuploading_classifier_plot_is_set"] = None
+    Returns:
+        Path to the generated LaTeX file.
+    """
+    logging.info("Rendering LaTeX template...")
+    # Compiled once per process, see template_environment
+    env = template_environment()
+    if getattr(args, "runs", None):
+        template = env.get_template("report_multi_template.j2")
     else:
-        logging.info("Reuploading Classifier plot is not set, skipping...")
-        context["reuploading_classifier_plot_is_set"] = None
+        template = env.get_template("report_template.j2")
+
+    # One fragment per section and a master report.tex that inputs them
+    fragments = getattr(args, "fragments", False) and not getattr(args, "runs", None)
+    if fragments:
+        build_dir = getattr(args, "build_dir", "build")
+        context = dict(
+            context,
+            fragments=render_fragments(template, context, os.path.join(build_dir, "tex")),
+        )
+        template = env.get_template(FRAGMENTS_TEMPLATE)
 
-    # QFT PLOTS
-    if cfg.qft_plot:
-        try:
-            context = context_qft_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing QFT plots: {e}")
-            context["qft_plot_is_set"] = None
-    else:
-        logging.info("QFT plot is not set, skipping...")
-        context["qft_plot_is_set"] = None
-
-    # # YEAST CLASSIFICATION 4Q PLOTS
-    # if cfg.yeast_plot_4q:
-    #     try:
-    #         context = context_yeast_4q_plots(context, cfg)
-    #     except Exception as e:
-    #         logging.error(f"Error preparing Yeast 4Q plots: {e}")
-    #         context["yeast_classification_4q_plot_is_set"] = None
-    # else:
-    #     logging.info("Yeast 4Q plot is not set, skipping...")
-    #     context["yeast_classification_4q_plot_is_set"] = None
-
-    # # STATLOG CLASSIFICATION 4Q PLOTS
-    # if cfg.statlog_plot_4q:
-    #     try:
-    #         context = context_statlog_4q_plots(context, cfg)
-    #     except Exception as e:
-    #         logging.error(f"Error preparing StatLog 4Q plots: {e}")
-    #         context["statlog_classification_4q_plot_is_set"] = None
-    # else:
-    #     logging.info("StatLog 4Q plot is not set, skipping...")
-    #     context["statlog_classification_4q_plot_is_set"] = None
-
-    # STATLOG CLASSIFICATION 3Q PLOTS
-    if cfg.statlog_plot_3q:
-        try:
-            context = context_yeast_3q_plots(context, cfg, "statlog")
-        except Exception as e:
-            logging.error(f"Error preparing StatLog 3Q plots: {e}")
-            context["statlog_classification_3q_plot_is_set"] = None
-    else:
-        logging.info("StatLog 3Q plot is not set, skipping...")
-        context["statlog_classification_3q_plot_is_set"] = None
+    # Render template with context
+    with tracing.span("render_template", "render", template=template.name):
+        rendered_content = template.render(context)
 
-    # YEAST CLASSIFICATION 3Q PLOTS
-    if cfg.yeast_plot_3q:
-        try:
-            context = context_yeast_3q_plots(context, cfg, "yeast")
-        except Exception as e:
-            logging.error(f"Error preparing Yeast 3Q plots: {e}")
-            context["yeast_classification_3q_plot_is_set"] = None
-    else:
-        logging.info("Yeast 3Q plot is not set, skipping...")
-        context["yeast_classification_3q_plot_is_set"] = None
+    # Ensure output directory exists
+    output_dir = Path(getattr(args, "output_dir", "."))
+    output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Write rendered LaTeX file in the output directory using os.path.join
+    output_file = os.path.join(output_dir, "report.tex")
+    if fragments:
+        write_if_changed(output_file, rendered_content)
+        return output_file
+    with open(output_file, "w") as f:
+        f.write(rendered_content)
+        return output_file
 
+    raise RuntimeError("Failed to render the report template.")
 
-    # AMPLITUDE ENCODING PLOTS
-    if cfg.amplitude_encoding_plot:
-        try:
-            context = context_amplitude_encoding_plots(context, cfg)
-        except Exception as e:
-            logging.error(f"Error preparing Amplitude Encoding plots: {e}")
-            context["amplitude_encoding_plot_is_set"] = None
-    else:
-        logging.info("Amplitude Encoding plot is not set, skipping...")
-        context["amplitude_encoding_plot_is_set"] = None
 
-    return context
+def compile_pdf(tex_file, args):
+    """
+    Compile the LaTeX report with pdflatex.
 
+    Args:
+        tex_file: Path to the generated LaTeX file.
+        args: Parsed command line arguments; the PDF and the pdflatex log are
+            written to ``args.pdf_dir`` if set (the daemon puts them in the
+            job directory), else to ``args.build_dir``.
 
-def render_and_save_report(context, args):
+    Returns:
+        Path to the PDF, or None if pdflatex failed.
     """
-    Render the LaTeX template and save the generated report.
+    pdf_dir = getattr(args, "pdf_dir", None) or getattr(args, "build_dir", "build")
+    os.makedirs(pdf_dir, exist_ok=True)
+    log_file = os.path.join(pdf_dir, "pdflatex.log")
+    logging.info("Compiling LaTeX report in pdf...")
+    with tracing.span("pdflatex", "latex", tex=tex_file):
+        with open(log_file, "w") as log:
+            try:
+                result = subprocess.run(
+                    [
+                        "pdflatex",
+                        "-interaction=nonstopmode",
+                        f"-output-directory={pdf_dir}",
+                        tex_file,
+                    ],
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                )
+            except FileNotFoundError:
+                logging.error("pdflatex is not installed")
+                return None
+    if result.returncode != 0:
+        logging.error(f"pdflatex failed, see {log_file}")
+        return None
+    pdf_file = os.path.join(pdf_dir, Path(tex_file).with_suffix(".pdf").name)
+    logging.info(f"PDF generated at: {pdf_file}")
+    return pdf_file
+
+
+def generate_report(args):
+    """
+    Build the report described by parsed command line arguments.
 
     Args:
-        context: Template context dictionary.
         args: Parsed command line arguments.
 
     Returns:
-        Path to the generated LaTeX file.
+        tuple: Path to the generated LaTeX file and path to the PDF, or None
+        if ``--pdflatex`` was not given or pdflatex failed.
     """
-    logging.info("Rendering LaTeX template...")
-    # Setup Jinja2 environment and load template
-    template_dir = Path("src/templates")
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("report_template.j2")
+    tracing.enable_for(args)
+    plot_executor.start_build()
 
-    # Render template with context
-    rendered_content = template.render(context)
+    # Prepare template context with all required data
+    with tracing.span("prepare_template_context", "context"):
+        context = prepare_template_context(args)
 
-    # Ensure build directory exists
-    build_dir = Path(".")
-    build_dir.mkdir(exist_ok=True)
+    # Render and save the LaTeX report
+    with tracing.span("render_and_save_report", "render"):
+        output_file = render_and_save_report(context, args)
+    logging.info(f"Report generated at: {output_file}")
 
-    # Write rendered LaTeX file in the build directory using os.path.join
-    output_file = os.path.join(build_dir, "report.tex")
-    with open(output_file, "w") as f:
-        f.write(rendered_content)
-        return output_file
+    # Optionally compile the PDF
+    pdf_file = None
+    if args.pdflatex:
+        pdf_file = compile_pdf(output_file, args)
 
-    raise RuntimeError("Failed to render the report template.")
+    if args.profile_trace:
+        count = tracing.write(args.profile_trace)
+        tracing.drain()
+        logging.info(f"Wrote {count} trace events to {args.profile_trace}")
+
+    return output_file, pdf_file
 
 
 def main():
@@ -442,17 +408,12 @@ def main():
     """
     logging.info("Starting report generation process...")
 
-    # Step 1: Parse command line arguments
     parser = setup_argument_parser()
     args = parser.parse_args()
 
-    # Step 2: Prepare template context with all required data
-    context = prepare_template_context(args)
-
-    # Step 3: Render and save the LaTeX report
-    output_file = render_and_save_report(context, args)
-    logging.info(f"Report generated at: {output_file}")
-
+    _, pdf_file = generate_report(args)
+    if args.pdflatex and pdf_file is None:
+        return 1
     return 0
 
 
@@ -0,0 +1,157 @@
+"""
+Build manifest for incremental report builds.
+
+``build/manifest.json`` records, for every section of the last build, a
+fingerprint of everything the section depends on (its input files, the
+code that produces it and the relevant command line options), the context
+fragment it produced and the plot files it wrote. On the next invocation a
+section whose fingerprint is unchanged and whose plot files are still in
+place is reloaded from the manifest instead of being recomputed.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import plot_cache
+from engine import SIDES, resolve_inputs
+from sections import LEGACY_TOGGLES, SECTIONS
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Modules whose code shapes the context fragments (the plotting code is
+# covered by plot_cache.code_version()).
+CONTEXT_SOURCES = ["prepare_context.py", "fillers.py", "sections.py", "config.py"]
+
+# Command line options that do not change what a section produces. Section
+# toggles are left out as well: a disabled section never reaches the manifest,
+# and toggling one section must not invalidate the others.
+IGNORED_OPTIONS = {
+    "jobs",
+    "plot_threads",
+    "cache_dir",
+    "build_dir",
+    "output_dir",
+    "pdf_dir",
+    "rebuild",
+    "t1_plot",
+    "pdflatex",
+    "profile_trace",
+}
+IGNORED_OPTIONS.update(s.toggle for s in SECTIONS if s.toggle is not None)
+IGNORED_OPTIONS.update(LEGACY_TOGGLES)
+
+
+def code_version():
+    """Return a digest of the code that prepares the report context."""
+    src_dir = Path(__file__).parent
+    h = hashlib.sha256(str(MANIFEST_VERSION).encode())
+    for name in CONTEXT_SOURCES:
+        h.update(plot_cache.file_digest(src_dir / name).encode())
+    h.update(plot_cache.code_version().encode())
+    return h.hexdigest()
+
+
+def section_fingerprint(section, cfg, upstream=()):
+    """
+    Return the fingerprint of a section for the given configuration.
+
+    ``upstream`` holds the fingerprints of the sections it depends on. Missing
+    inputs are part of the fingerprint too, so a file appearing or
+    disappearing invalidates the section.
+    """
+    options = {k: v for k, v in vars(cfg).items() if k not in IGNORED_OPTIONS}
+    inputs = {}
+    patterns = section.inputs + section.optional_inputs
+    for side, entries in resolve_inputs(patterns, cfg).items():
+        inputs[side] = [
+            [path, {match: plot_cache.file_digest(match) for match in matches}]
+            for path, matches in entries
+        ]
+    payload = {
+        "section": section.name,
+        "args": section.args,
+        "code": code_version(),
+        "options": options,
+        "inputs": inputs,
+        "upstream": sorted(upstream),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def plot_files(section, fragment):
+    """Return the plot files a section fragment points to."""
+    values = [fragment.get(side, {}).get(key) for side in SIDES for key in section.plots]
+    if section.overlay_plot is not None:
+        values.append(fragment.get(section.overlay_plot))
+    files = []
+    for value in values:
+        # A plot may be a list of tiles, e.g. one per process tomography gate.
+        for path in value if isinstance(value, list) else [value]:
+            if path and path != "placeholder.png":
+                files.append(path)
+    return files
+
+
+class BuildManifest:
+    """Per-section fingerprints, fragments and plot files of the last build."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sections = {}
+        self.reused = []
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.sections = data.get("sections", {})
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable build manifest {self.path}: {e}")
+
+    @classmethod
+    def for_build(cls, cfg):
+        """Return the manifest of ``cfg.build_dir``."""
+        return cls(Path(getattr(cfg, "build_dir", "build")) / MANIFEST_NAME)
+
+    def fingerprint(self, section, cfg, upstream=()):
+        """Return the current fingerprint of a section, see ``section_fingerprint``."""
+        return section_fingerprint(section, cfg, upstream)
+
+    def lookup(self, section, fingerprint):
+        """Return the recorded fragment if it is still valid, else None."""
+        entry = self.sections.get(section.name)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+        if not all(os.path.exists(path) for path in entry.get("plots", [])):
+            return None
+        self.reused.append(section.name)
+        return copy.deepcopy(entry["fragment"])
+
+    def record(self, section, fingerprint, fragment):
+        """Record the fragment a section produced."""
+        self.sections[section.name] = {
+            "fingerprint": fingerprint,
+            # Stored as plain JSON: numpy scalars and the like become strings.
+            "fragment": json.loads(json.dumps(fragment, default=str)),
+            "plots": plot_files(section, fragment),
+        }
+
+    def forget(self, section):
+        """Drop the recorded fragment of a section, if any."""
+        self.sections.pop(section.name, None)
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "sections": self.sections}
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
@@ -0,0 +1,67 @@
+"""
+Classification metrics of the QML experiments.
+
+Only numpy is needed: the report used to import scikit-learn for two 2x2
+confusion matrices, which cost seconds on every cold start.
+"""
+
+import numpy as np
+
+
+def qml_labels(data):
+    """
+    Return the label arrays of a QML results file.
+
+    ``data["NQCH"]`` holds one dict per test sample with the label predicted
+    on the chip and whether it is correct, next to ``_``-prefixed entries such
+    as ``_statistics`` that are not samples; ``data["verification_ios"]`` the
+    label predicted by the noiseless circuit, under the same sample keys.
+
+    Args:
+        data (dict): Parsed ``results.json`` of a QML experiment.
+
+    Returns:
+        tuple: ``(true, predicted, noiseless)`` integer arrays, one entry per
+        sample.
+    """
+    samples = {
+        key: sample
+        for key, sample in data.get("NQCH", {}).items()
+        if not key.startswith("_") and isinstance(sample, dict)
+    }
+    noiseless_configuration = data.get("verification_ios", {})
+    columns = np.array(
+        [
+            (
+                int(sample.get("predicted_label", 0)),
+                bool(sample.get("is_correct", True)),
+                int(noiseless_configuration.get(key, {}).get("predicted_label", 0)),
+            )
+            for key, sample in samples.items()
+        ],
+        dtype=int,
+    ).reshape(-1, 3)
+    predicted, is_correct, noiseless = columns.T
+    # The true label is not stored: infer it from the prediction and its outcome
+    true = np.where(is_correct, predicted, 1 - predicted)
+    return true, predicted, noiseless
+
+
+def confusion_matrix(true, predicted, n_classes=2):
+    """
+    Return the confusion matrix of integer labels in ``range(n_classes)``.
+
+    Rows are true labels and columns predicted labels, as in
+    ``sklearn.metrics.confusion_matrix``. Pairs with a label outside the
+    range are ignored.
+
+    Returns:
+        np.ndarray: ``(n_classes, n_classes)`` counts.
+    """
+    true = np.asarray(true, dtype=int)
+    predicted = np.asarray(predicted, dtype=int)
+    valid = (true >= 0) & (true < n_classes) & (predicted >= 0) & (predicted < n_classes)
+    counts = np.bincount(
+        true[valid] * n_classes + predicted[valid], minlength=n_classes * n_classes
+    )
+    return counts.reshape(n_classes, n_classes)
@@ -0,0 +1,314 @@
+"""
+N-way comparison reports.
+
+``--run <calibration>:<run>`` (repeatable) compares any number of runs in one
+report instead of the left/right pair, e.g. this week's run against the runs
+of the last four weeks. The context holds one entry per run in ``runs`` and
+one entry per experiment in ``experiments``, rendered by
+``report_multi_template.j2`` as tables with one row per run and one overlaid
+plot per experiment.
+
+Data is loaded once per run through its ``RunStore`` and every plot is drawn
+once for all runs, instead of once per run and section. The plots of a
+section are drawn concurrently by ``plot_executor``.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+
+import fillers as fl
+import plot_executor
+import tracing
+from prepare_context import build_path
+from runstore import RunStore
+
+# Experiments plotted as bitstring histograms: (directory, section title).
+HISTOGRAM_EXPERIMENTS = [
+    ("grover2q", "Grover - 2 qubits"),
+    ("grover3q", "Grover - 3 qubits"),
+    ("ghz", "GHZ state preparation"),
+    ("qft", "QFT"),
+    ("amplitude_encoding", "Amplitude Encoding"),
+]
+
+# Experiments reported as a runtime table only: (directory, section title).
+TABLE_EXPERIMENTS = [
+    ("process_tomography", "Process Tomography state preparation"),
+    ("reuploading_classifier", "Reuploading Classifier"),
+]
+
+# QML datasets: (dataset, section title).
+QML_DATASETS = [
+    ("yeast", "QML: Yeast dataset (3 qubits)"),
+    ("statlog", "QML: Statlog-Satellite dataset (3 qubits)"),
+]
+
+
+def parse_run(spec):
+    """Parse a ``<calibration>:<run>`` command line value."""
+    calibration, sep, run = spec.partition(":")
+    if not sep or not calibration or not run:
+        raise argparse.ArgumentTypeError(
+            f"Invalid run {spec!r}, expected <calibration>:<run>"
+        )
+    return calibration, run
+
+
+def run_targets(cfg):
+    """Return one dict per ``--run`` with its label, ids and ``RunStore``."""
+    targets = []
+    for calibration, run in cfg.runs:
+        targets.append(
+            {
+                "label": f"{calibration[:7]}/{run}",
+                "calibration": calibration,
+                "run": run,
+                "store": RunStore.for_run(cfg.base_dir, calibration, run),
+            }
+        )
+    return targets
+
+
+def format_qubits(qubits_used):
+    """Format a qubits list as a comma-separated string."""
+    if isinstance(qubits_used, list):
+        return ", ".join(map(str, qubits_used))
+    return qubits_used
+
+
+def context_runs_metadata(context, cfg, targets):
+    """Prepare the calibration and version information of every run."""
+    for target, entry in zip(targets, context["runs"]):
+        path = target["store"].path("version_extractor")
+        info = target["store"].load(path) if path.exists() else {}
+        entry["device"] = info.get("device", "N/A")
+        entry["calibration_date"] = info.get("commit_date", "Unknown")
+        entry["run_date"] = info.get("experiment_date", "Unknown")
+        entry["versions"] = info.get("versions", {})
+
+    # One row per library, one column per run.
+    libraries = []
+    for entry in context["runs"]:
+        for library in entry["versions"]:
+            if library not in libraries:
+                libraries.append(library)
+    context["libraries"] = libraries
+
+    logging.info("Prepared calibration data of every run")
+    return context
+
+
+def context_runs_statistics(context, cfg, targets):
+    """Prepare T1, T2, fidelity and readout fidelity statistics of every run."""
+    for target, entry in zip(targets, context["runs"]):
+        calibration = target["calibration"]
+        store = target["store"]
+        calibration_json = os.path.join(
+            "data", "calibrations", calibration, "sinq20", "calibration.json"
+        )
+        if not os.path.exists(calibration_json):
+            logging.warning(f"Missing {calibration_json}, no statistics for {target['label']}")
+            continue
+        # The four statistics share one parse of calibration.json.
+        entry["stat_t1"] = fl.get_stat_t12(f"calibrations/{calibration}/sinq20", "t1", store=store)
+        entry["stat_t2"] = fl.get_stat_t12(f"calibrations/{calibration}/sinq20", "t2", store=store)
+        entry["stat_fidelity"] = fl.get_stat_fidelity(calibration_json, calibration, store=store)
+        entry["stat_readout_fidelity"] = fl.get_readout_fidelity(
+            calibration_json, calibration, store=store
+        )
+
+    logging.info("Prepared statistics of every run")
+    return context
+
+
+def context_runs_best_qubits(context, cfg, targets):
+    """Prepare the best qubits of every run."""
+    for target, entry in zip(targets, context["runs"]):
+        store = target["store"]
+        entry["best_qubits"] = fl.extract_best_qubits(
+            store.path("bell_tomography"), store=store
+        )
+
+    logging.info("Prepared best qubits of every run")
+    return context
+
+
+def experiment_rows(targets, experiment):
+    """Return the targets that have results for ``experiment`` and their paths."""
+    found = []
+    for target in targets:
+        path = target["store"].path(experiment)
+        if path.exists():
+            found.append((target, path))
+    return found
+
+
+def runtime_rows(found):
+    """Return the runtime/qubits table rows of the runs in ``found``."""
+    return [
+        {
+            "label": target["label"],
+            "runtime": fl.extract_runtime(path, store=target["store"]),
+            "qubits": format_qubits(fl.extract_qubits_used(path, store=target["store"])),
+        }
+        for target, path in found
+    ]
+
+
+def runs_digest(found):
+    """Return a short digest of the calibrations and runs of ``found``."""
+    runs = [(target["calibration"], target["run"]) for target, _ in found]
+    return hashlib.sha1(repr(runs).encode()).hexdigest()[:12]
+
+
+def overlay_plot(cfg, func_name, found, **kwargs):
+    """
+    Schedule one plot for every run in ``found``, see ``plot_executor``.
+
+    The plot goes to ``multi/<digest of the runs>`` in the build directory,
+    so reports on different runs never share a file name.
+    """
+    paths = [path for _, path in found]
+    return plot_executor.submit(
+        cfg,
+        func_name,
+        inputs=paths,
+        raw_data=paths,
+        labels=[target["label"] for target, _ in found],
+        output_path=build_path(cfg, "multi", runs_digest(found)),
+        # Every store shares the process-wide cache of parsed files.
+        store=found[0][0]["store"],
+        **kwargs,
+    )
+
+
+def context_runs_mermin(context, cfg, targets):
+    """Prepare the Mermin table and overlaid plot."""
+    found = experiment_rows(targets, "mermin")
+    if not found:
+        logging.info("No run has Mermin results, skipping...")
+        return context
+
+    target, path = found[0]
+    context["experiments"].append(
+        {
+            "title": "Mermin",
+            "description": fl.extract_description(path, store=target["store"]),
+            "rows": runtime_rows(found),
+            "plot": overlay_plot(cfg, "plot_mermin_overlay", found, expname="mermin"),
+        }
+    )
+    logging.info("Added Mermin overlay to context")
+    return context
+
+
+def context_runs_histograms(context, cfg, targets):
+    """Prepare the tables and overlaid histograms of the bitstring experiments."""
+    for experiment, title in HISTOGRAM_EXPERIMENTS:
+        found = experiment_rows(targets, experiment)
+        if not found:
+            logging.info(f"No run has {experiment} results, skipping...")
+            continue
+
+        target, path = found[0]
+        context["experiments"].append(
+            {
+                "title": title,
+                "description": fl.extract_description(path, store=target["store"]),
+                "rows": runtime_rows(found),
+                "plot": overlay_plot(
+                    cfg,
+                    "plot_frequencies_overlay",
+                    found,
+                    title=title,
+                    expname=experiment,
+                ),
+            }
+        )
+        logging.info(f"Added {experiment} overlay to context")
+    return context
+
+
+def context_runs_tables(context, cfg, targets):
+    """Prepare the runtime tables of the experiments without overlaid plot."""
+    for experiment, title in TABLE_EXPERIMENTS:
+        found = experiment_rows(targets, experiment)
+        if not found:
+            continue
+
+        target, path = found[0]
+        context["experiments"].append(
+            {
+                "title": title,
+                "description": fl.extract_description(path, store=target["store"]),
+                "rows": runtime_rows(found),
+                "plot": None,
+            }
+        )
+    logging.info("Added runtime tables to context")
+    return context
+
+
+def context_runs_qml(context, cfg, targets):
+    """Prepare the accuracy tables of the QML classification experiments."""
+    for dataset, title in QML_DATASETS:
+        found = experiment_rows(targets, f"qml_3q_{dataset}")
+        if not found:
+            continue
+
+        rows = runtime_rows(found)
+        for row, (target, path) in zip(rows, found):
+            accuracy = fl.get_qml_accuracy(path, store=target["store"])
+            row["accuracy"] = f"{accuracy:.2f}" if isinstance(accuracy, float) else accuracy
+
+        target, path = found[0]
+        context["experiments"].append(
+            {
+                "title": title,
+                "description": fl.extract_description(path, store=target["store"]),
+                "rows": rows,
+                "plot": None,
+            }
+        )
+    logging.info("Added QML accuracy tables to context")
+    return context
+
+
+MULTI_SECTIONS = [
+    context_runs_metadata,
+    context_runs_statistics,
+    context_runs_best_qubits,
+    context_runs_mermin,
+    context_runs_histograms,
+    context_runs_tables,
+    context_runs_qml,
+]
+
+
+def prepare_multi_context(cfg):
+    """
+    Prepare the template context of an N-way comparison report.
+
+    Returns:
+        dict: ``runs`` (one dict per ``--run``, in command line order) and
+        ``experiments`` (one dict per experiment with results in any run).
+    """
+    targets = run_targets(cfg)
+    context = {
+        "runs": [
+            {"label": t["label"], "calibration": t["calibration"], "run": t["run"]}
+            for t in targets
+        ],
+        "experiments": [],
+    }
+    for section in MULTI_SECTIONS:
+        try:
+            with tracing.span(section.__name__, "context"):
+                context = section(context, cfg, targets)
+                plot_executor.resolve(context)
+        except Exception as e:
+            logging.error(f"Error preparing {section.__name__}: {e}")
+            plot_executor.resolve(context)
+    return context
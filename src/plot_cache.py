@@ -0,0 +1,249 @@
+"""
+Content-addressed cache for the report plots.
+
+The inputs of a finished run under ``data/<cal>/<run>`` never change, so a
+figure is fully determined by the content of the files it reads, the code of
+the plot function and the arguments it is called with. ``render`` hashes
+those into a key (``content_key``) and keeps a copy of every rendered figure
+under ``<cache_dir>/<key[:2]>/``. The key leaves out the directory the figure
+is written to: the cache records the file name relative to the ``output_path``
+of the plot call, and on a hit copies the cached file below the
+``output_path`` of the new call, so builds in other build directories hit
+too. The arguments that name the file (``expname`` and the like) stay in the
+key, so the recorded name is the one the new call would have written. ``plots``
+(and therefore matplotlib) is not imported at all on a hit.
+
+The thumbnail of a figure (``--thumbnails``) is kept next to its blob, as
+``<key>.thumb.png``, and restored with it; ``thumbnails`` lists them for the
+previews of the web UI.
+
+The cache lives outside ``build/`` so that ``make clean`` does not wipe it.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import render_profiles
+import tracing
+
+# Bump to invalidate every cached figure, e.g. after a matplotlib upgrade.
+CACHE_VERSION = 1
+
+# Source files whose content is part of every plot key: editing a plot
+# function invalidates the figures it produced.
+PLOT_SOURCES = ["plots.py", "render_profiles.py", "histogram.py", "metrics.py", "topology.py"]
+
+# Plot function argument choosing the directory of the output file. The
+# arguments naming the file in it (expname, ...) often embed the calibration
+# and run ids, so unlike this one they are part of the key.
+LOCATION_ARG = "output_path"
+
+_digests = {}
+
+
+def file_digest(path):
+    """
+    Return the sha256 of a file, or of every file below a directory.
+
+    Digests are memoized on (path, size, mtime) for the lifetime of the process.
+    """
+    path = Path(path)
+    if path.is_dir():
+        h = hashlib.sha256()
+        for child in sorted(p for p in path.rglob("*") if p.is_file()):
+            h.update(str(child.relative_to(path)).encode())
+            h.update(file_digest(child).encode())
+        return h.hexdigest()
+
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _digests[memo_key] = h.hexdigest()
+    return _digests[memo_key]
+
+
+def code_version():
+    """Return a digest of the plotting code, see ``PLOT_SOURCES``."""
+    src_dir = Path(__file__).parent
+    h = hashlib.sha256(str(CACHE_VERSION).encode())
+    for name in PLOT_SOURCES:
+        h.update(file_digest(src_dir / name).encode())
+    return h.hexdigest()
+
+
+def plot_key(func_name, inputs, kwargs, profile=None):
+    """Return the cache key of a plot call under a render profile."""
+    payload = {
+        "func": func_name,
+        "code": code_version(),
+        "profile": dataclasses.asdict(profile) if profile else None,
+        "inputs": [file_digest(path) for path in inputs],
+        "kwargs": kwargs,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def content_key(func_name, inputs, kwargs, profile=None):
+    """
+    Return a key of what a plot call draws, regardless of the directory it writes to.
+
+    Unlike ``plot_key``, the output directory (``LOCATION_ARG``) is left out
+    and an argument holding the path of one of ``inputs`` is replaced by its
+    position, so the same figure requested from identical files in another
+    build directory gets the same key. The file name arguments (``expname``
+    and the like) are kept: two calls sharing a key write the same file name
+    below their output directory.
+    """
+    positions = {str(path): i for i, path in enumerate(inputs)}
+
+    def strip(value):
+        if isinstance(value, (list, tuple)):
+            return [strip(item) for item in value]
+        if isinstance(value, (str, os.PathLike)) and str(value) in positions:
+            return {"input": positions[str(value)]}
+        return value
+
+    content = {k: strip(v) for k, v in kwargs.items() if k != LOCATION_ARG}
+    return plot_key(func_name, inputs, content, profile)
+
+
+def _materialize(blob, target):
+    """Copy a cached blob to ``target`` unless an identical file is already there."""
+    if os.path.exists(target) and file_digest(target) == file_digest(blob):
+        return
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    shutil.copyfile(blob, target)
+
+
+def _copy_into(entry_dir, source, name):
+    """Copy ``source`` to ``entry_dir / name``, atomically."""
+    fd, tmp = tempfile.mkstemp(dir=entry_dir)
+    os.close(fd)
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, entry_dir / name)
+
+
+def relative_to_output(path, output_path):
+    """Return ``path`` without its ``output_path`` prefix, None if it is written elsewhere."""
+    path, output_path = str(path), str(output_path)
+    if not output_path or not path.startswith(output_path) or path == output_path:
+        return None
+    return path[len(output_path) :]
+
+
+def _store(entry_dir, key, path, relative_path, inputs):
+    """Copy a freshly rendered figure, and its thumbnail if any, into the cache."""
+    entry_dir.mkdir(parents=True, exist_ok=True)
+    blob = key + Path(path).suffix
+    _copy_into(entry_dir, path, blob)
+
+    meta = {"path": relative_path, "blob": blob, "inputs": [str(p) for p in inputs]}
+    thumbnail = render_profiles.thumbnail_path(path)
+    if os.path.isfile(thumbnail):
+        meta["thumbnail"] = key + ".thumb.png"
+        _copy_into(entry_dir, thumbnail, meta["thumbnail"])
+    fd, tmp = tempfile.mkstemp(dir=entry_dir)
+    with os.fdopen(fd, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, entry_dir / (key + ".json"))
+
+
+def render(cfg, func_name, inputs, store=None, **kwargs):
+    """
+    Call ``plots.<func_name>(**kwargs)`` through the cache.
+
+    Args:
+        cfg: Parsed command line arguments; ``cfg.cache_dir`` is the cache
+            location, caching is disabled when it is missing or empty, and
+            ``cfg.render_profile`` the render profile of the plots.
+        func_name: Name of the plot function in ``plots.py``.
+        inputs: Files or directories the plot reads.
+        store: Optional ``RunStore`` the plot function loads its results
+            through. It is not part of the cache key.
+        **kwargs: Arguments of the plot function. Figures are only cached
+            when the plot function writes them below ``output_path``.
+
+    Returns:
+        str: Path of the figure, as returned by the plot function, or its
+        cached copy below ``output_path``.
+    """
+    cache_dir = getattr(cfg, "cache_dir", None)
+    profile = render_profiles.get_profile(cfg)
+    call_kwargs = dict(kwargs) if store is None else dict(kwargs, store=store)
+    if not cache_dir:
+        with tracing.span(func_name, "plot"), render_profiles.use(profile):
+            import plots
+
+            return getattr(plots, func_name)(**call_kwargs)
+
+    key = content_key(func_name, inputs, kwargs, profile)
+    entry_dir = Path(cache_dir) / key[:2]
+    meta_file = entry_dir / (key + ".json")
+    output_path = str(kwargs.get(LOCATION_ARG, ""))
+
+    if meta_file.exists() and output_path:
+        with open(meta_file) as f:
+            meta = json.load(f)
+        blob = entry_dir / meta["blob"]
+        if blob.exists():
+            # Below the output path of this call, whichever build cached it;
+            # the file name is the one this call writes, see content_key.
+            path = output_path + meta["path"]
+            with tracing.span(f"{func_name} (cached)", "plot", path=path):
+                _materialize(blob, path)
+                if "thumbnail" in meta:
+                    _materialize(
+                        entry_dir / meta["thumbnail"], render_profiles.thumbnail_path(path)
+                    )
+            logging.info(f"Plot cache hit for {func_name}: {path}")
+            return path
+
+    with tracing.span(func_name, "plot"), render_profiles.use(profile):
+        import plots
+
+        path = getattr(plots, func_name)(**call_kwargs)
+    relative_path = relative_to_output(path, output_path) if path else None
+    if relative_path is not None and os.path.isfile(path):
+        try:
+            _store(entry_dir, key, path, relative_path, inputs)
+        except OSError as e:
+            logging.warning(f"Could not store {path} in the plot cache: {e}")
+    return path
+
+def thumbnails(cache_dir):
+    """
+    List the thumbnails kept in the cache.
+
+    Args:
+        cache_dir: Cache location, see ``render``.
+
+    Returns:
+        list: ``(key, figure path, input files, thumbnail file)`` of every
+        cached figure with a thumbnail, most recently rendered first. The
+        figure path is relative to the output path of the plot call.
+    """
+    entries = []
+    for meta_file in Path(cache_dir).glob("*/*.json"):
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        thumbnail = meta_file.parent / meta.get("thumbnail", "")
+        if "thumbnail" in meta and thumbnail.is_file():
+            entries.append(
+                (meta_file.stat().st_mtime, meta_file.stem, meta["path"], meta["inputs"], thumbnail)
+            )
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    return [entry[1:] for entry in entries]
@@ -0,0 +1,176 @@
+"""
+Thread pool rendering the plots of a section concurrently.
+
+Sections hand their plots to ``submit`` instead of calling
+``plot_cache.render`` directly and store the returned future in their
+context fragment, e.g. ``context["left"]["plot_ghz"]``. The engine calls
+``resolve`` once the section function returns, which waits for every future
+in the fragment and replaces it with the path of the figure, so the left and
+right figures of a section are drawn at the same time.
+
+This relies on ``plots`` drawing on figures that pyplot does not manage.
+matplotlib does not make its text layout thread-safe (the mathtext parser is
+shared), so ``--plot-threads`` defaults to 1, which renders the plots in the
+calling thread, as before.
+
+Identical requests within a build are rendered once: a plot of the same
+function, arguments and input file contents as an earlier one, e.g. the left
+and right plots of a report comparing a calibration with itself, gets the
+future of the first request, so both context entries point at the same file.
+The output directory may differ, but not the file name arguments (see
+``plot_cache.content_key``): a request writing to another directory gets a
+copy of the shared figure there, so its path never points into the directory
+of another run.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import plot_cache
+import render_profiles
+
+PLACEHOLDER = "placeholder.png"
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+# Content key -> (future, output path) of the first request of the current build.
+_requests = {}
+_requests_lock = threading.Lock()
+
+
+def _executor(threads):
+    """Return the thread pool of this process, (re)created for ``threads`` threads."""
+    global _pool, _pool_key
+    # A pool inherited through fork() has no threads behind it.
+    key = (os.getpid(), threads)
+    with _pool_lock:
+        if _pool_key != key:
+            if _pool is not None and _pool_key[0] == os.getpid():
+                _pool.shutdown(wait=True)
+            _pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="plot")
+            _pool_key = key
+        return _pool
+
+
+def start_build():
+    """Forget the plots of the previous build, see ``submit``."""
+    with _requests_lock:
+        _requests.clear()
+
+
+def _reusable(future):
+    """Return whether the figure of an earlier request can be shared."""
+    if not future.done():
+        return True
+    if future.exception() is not None:
+        return False
+    path = future.result()
+    return bool(path) and os.path.isfile(path)
+
+
+def submit(cfg, func_name, inputs, store=None, **kwargs):
+    """
+    Schedule ``plot_cache.render(cfg, func_name, inputs, store, **kwargs)``.
+
+    Args:
+        cfg: Parsed command line arguments; ``cfg.plot_threads`` is the number
+            of plotting threads, 1 or less renders right away.
+        func_name, inputs, store, **kwargs: See ``plot_cache.render``.
+
+    Returns:
+        Future: Resolves to the path of the figure, or raises the error of the
+        plot function. Identical requests of a build share one future.
+    """
+    try:
+        key = plot_cache.content_key(
+            func_name, inputs, kwargs, render_profiles.get_profile(cfg)
+        )
+    except OSError:
+        # A missing input: let the plot function report it.
+        key = None
+    output_path = str(kwargs.get(plot_cache.LOCATION_ARG, ""))
+    with _requests_lock:
+        shared, shared_output_path = _requests.get(key, (None, None))
+        if shared is not None and _reusable(shared):
+            logging.info(f"Reusing the identical {func_name} plot of this build")
+            if shared_output_path == output_path:
+                return shared
+            future = Future()
+            shared.add_done_callback(
+                lambda done: _copy_into(done, future, shared_output_path, output_path)
+            )
+            return future
+        future = Future()
+        if key is not None:
+            _requests[key] = (future, output_path)
+
+    threads = getattr(cfg, "plot_threads", 1) or 1
+    if threads <= 1:
+        _render_into(future, cfg, func_name, inputs, store, kwargs)
+    else:
+        _executor(threads).submit(_render_into, future, cfg, func_name, inputs, store, kwargs)
+    return future
+
+
+def _render_into(future, cfg, func_name, inputs, store, kwargs):
+    """Render a plot and settle ``future`` with its path or its error."""
+    try:
+        future.set_result(plot_cache.render(cfg, func_name, inputs, store, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+
+
+def _copy_into(shared, future, shared_output_path, output_path):
+    """Settle ``future`` with a copy of the figure of ``shared`` below ``output_path``."""
+    try:
+        path = shared.result()
+        relative_path = plot_cache.relative_to_output(path, shared_output_path)
+        if relative_path is not None:
+            target = output_path + relative_path
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            shutil.copyfile(path, target)
+            thumbnail = render_profiles.thumbnail_path(path)
+            if os.path.isfile(thumbnail):
+                shutil.copyfile(thumbnail, render_profiles.thumbnail_path(target))
+            path = target
+        future.set_result(path)
+    except Exception as e:
+        future.set_exception(e)
+
+
+def resolve(value, name="", failures=None):
+    """
+    Wait for the futures in a context fragment and replace them by their result.
+
+    Dicts and lists are updated in place. A plot that failed is replaced by
+    the placeholder image and its error is logged.
+
+    Args:
+        value: Context fragment, or a value of one.
+        name: Context key of ``value``, used in the error messages.
+        failures: Optional list the context keys of the failed plots are
+            appended to.
+
+    Returns:
+        The value with every future resolved.
+    """
+    if isinstance(value, Future):
+        try:
+            return value.result()
+        except Exception as e:
+            logging.error(f"Error generating {name or 'plot'}: {e}")
+            if failures is not None:
+                failures.append(name)
+            return PLACEHOLDER
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = resolve(item, f"{name}.{key}" if name else str(key), failures)
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            value[i] = resolve(item, name, failures)
+    return value
@@ -1,20 +1,112 @@
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-import networkx as nx
+import matplotlib
+
+# No GUI backend: the report only writes files. Pinned before anything can
+# resolve the default backend, which would probe for Tk, Qt, etc.
+matplotlib.use("Agg")
+
 import numpy as np
-from matplotlib.colors import BoundaryNorm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import BoundaryNorm, Normalize
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 from matplotlib.ticker import MaxNLocator
 from pathlib import Path
 import json
 import os
+import shutil
 import ast
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
-import matplotlib.pyplot as plt
+import re
 
-
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
 import itertools
 
+import histogram
+import metrics
+import render_profiles
+import topology
+import tracing
+from runstore import load_json
+
+
+# Plots are drawn on plain ``Figure`` objects, never through pyplot: a figure
+# that pyplot does not know about is only reachable from the code that made
+# it, so plot functions share no figure state (see ``plot_executor``). ``Figure.savefig`` picks the non-GUI canvas matching the
+# file format (Agg for PNG, the PDF backend for PDF).
+
+
+def new_figure(**kwargs):
+    """Return a figure that is not managed by pyplot."""
+    return Figure(**kwargs)
+
+
+def new_subplots(nrows=1, ncols=1, **kwargs):
+    """Return a figure that is not managed by pyplot and its axes, like ``plt.subplots``."""
+    subplot_args = {
+        key: kwargs.pop(key)
+        for key in ("sharex", "sharey", "squeeze", "width_ratios", "height_ratios",
+                    "subplot_kw", "gridspec_kw")
+        if key in kwargs
+    }
+    fig = Figure(**kwargs)
+    return fig, fig.subplots(nrows, ncols, **subplot_args)
+
+
+def savefig(fig, path, **kwargs):
+    """
+    Save a figure with the active render profile (see ``render_profiles``).
+
+    The profile may change the format, and therefore the suffix of ``path``.
+    When it asks for thumbnails, one is made from the same figure, see
+    ``save_thumbnail``. The calls are recorded as their own spans when tracing
+    is enabled.
+
+    Returns:
+        str: Path of the file written.
+    """
+    profile = render_profiles.current()
+    if profile.rasterize and profile.is_vector(path, kwargs):
+        render_profiles.rasterize_dense(fig, profile.rasterize)
+    path = profile.output_path(path)
+    kwargs = profile.savefig_kwargs(kwargs)
+    with tracing.span("savefig", "plot", path=path):
+        fig.savefig(path, **kwargs)
+    if profile.thumbnail_dpi:
+        thumbnail = render_profiles.thumbnail_path(path)
+        with tracing.span("thumbnail", "plot", path=thumbnail):
+            save_thumbnail(fig, path, thumbnail, profile.thumbnail_dpi, kwargs)
+    return path
+
+
+def save_thumbnail(fig, path, thumbnail, dpi, kwargs):
+    """
+    Write the PNG thumbnail of a figure just saved to ``path``.
+
+    A PNG plot is already rasterized: it is downscaled from the file, the
+    figure is not drawn again. Other formats are rasterized once more at
+    ``dpi``, with the framing (``bbox_inches``) of the plot.
+
+    Args:
+        fig: The saved figure.
+        path: Path of the plot.
+        thumbnail: Path of the thumbnail.
+        dpi: Resolution of the thumbnail.
+        kwargs: ``Figure.savefig`` arguments the plot was saved with.
+    """
+    fmt = kwargs.get("format") or Path(path).suffix.lstrip(".")
+    if fmt.lower() != "png":
+        layout = {k: kwargs[k] for k in ("bbox_inches", "pad_inches") if k in kwargs}
+        fig.savefig(thumbnail, format="png", dpi=dpi, **layout)
+        return
+
+    from PIL import Image
+
+    saved_dpi = kwargs.get("dpi", "figure")
+    scale = dpi / (fig.dpi if saved_dpi == "figure" else saved_dpi)
+    with Image.open(path) as image:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image.thumbnail(size)
+        image.save(thumbnail)
+
 
 # def prepare_grid_coupler(
 #     max_number,
@@ -70,6 +162,44 @@ import itertools
 #     return plot_grid
 
 
+def chip_fidelities(results_single, results_two, layout):
+    """
+    Align the fidelities of a chip on its layout.
+
+    Args:
+        results_single (dict): Calibration results, with the randomized
+            benchmarking fidelity of every qubit under ``single_qubits``.
+        results_two (dict): Bell tomography results, ``"(a, b)"`` -> fidelity.
+        layout (topology.ChipLayout): Geometry of the chip.
+
+    Returns:
+        tuple: The 1Q fidelities in the order of ``layout.qubits`` and the 2Q
+        fidelities in the order of ``layout.edges``, in percent, NaN where
+        there is no result.
+    """
+    single = {}
+    for qubit_id, qubit_data in results_single.get("single_qubits", {}).items():
+        rb_fidelity = qubit_data.get("rb_fidelity")
+        if rb_fidelity and rb_fidelity[0] is not None:
+            single[qubit_id] = rb_fidelity[0]
+
+    two = {}
+    for pair_string, fidelity_value in results_two.items():
+        # Keys are pair strings "(0, 1)", next to "best_qubits"
+        if pair_string == "best_qubits" or not isinstance(fidelity_value, (int, float)):
+            continue
+        try:
+            a, b = (int(part) for part in pair_string.strip("()").split(", "))
+        except ValueError:
+            continue
+        two[(a, b)] = fidelity_value
+
+    return (
+        topology.qubit_values(single, layout) * 100,
+        topology.edge_values(two, layout) * 100,
+    )
+
+
 def plot_fidelity_graph(
     raw_data_single,
     raw_data_two,
@@ -77,6 +207,7 @@ def plot_fidelity_graph(
     connectivity,
     pos,
     output_path="build/",
+    store=None,
 ):
     """
     Generates a fidelity graph for the given experiment.
@@ -92,102 +223,35 @@ def plot_fidelity_graph(
     # Load results for the main path
     # results_json_path = "data" / Path(experiment_name) / "data/rb-0/results.json"
 
-    with open(raw_data_single, "r") as f:
-        results_single = json.load(f)
-    with open(raw_data_two, "r") as f:
-        results_two = json.load(f)
-
-    # Extract rb_fidelity from the new structure
-    single_qubits = results_single.get("single_qubits", {})
-    fidelities = {}
-    for qubit_id, qubit_data in single_qubits.items():
-        rb_fidelity = qubit_data.get("rb_fidelity", [0, 0])
-        fidelities[qubit_id] = rb_fidelity[0] if rb_fidelity else 0
-
-    # Set missing keys to 0 for all qubits 0-19
-    fidelities.update({str(qn): 0 for qn in range(20) if str(qn) not in fidelities})
-
-    # Create 2-qubit fidelities dictionary with tuple keys and LaTeX formatted strings
-    fidelities_2qb = {}
-    # Keep only keys different from "best_qubits"
-    two_qubits = {k: v for k, v in results_two.items() if k != "best_qubits"}
-
-    for pair_string, fidelity_value in two_qubits.items():
-        # Parse the pair string "(0, 1)" into tuple (0, 1)
-        try:
-            # Remove parentheses and split by comma
-            clean_string = pair_string.strip("()")
-            pair_parts = clean_string.split(", ")
-            if len(pair_parts) == 2:
-                a, b = int(pair_parts[0]), int(pair_parts[1])
-                pair = (a, b)
-
-                # The value is already a fidelity (not a list)
-                if isinstance(fidelity_value, (int, float)):
-                    mu = fidelity_value * 100  # Convert to percentage
-
-                    # For single values, we don't have error, so use a placeholder or omit
-                    # Truncate to 2 significant digits
-                    mu_truncated = float(f"{mu:.2g}")
-
-                    # Create LaTeX formatted string without error
-                    fidelities_2qb[pair] = rf"${mu_truncated:.1f}$"
-                    # Also add the reverse pair for undirected edges
-                    fidelities_2qb[(b, a)] = rf"${mu_truncated:.1f}$"
-        except (ValueError, IndexError):
-            continue
-
-    labels = {
-        a: f"Q{a}\n{np.round(fidelities[str(a)] * 100, decimals=2)}" for a in range(20)
-    }
-
-    g = nx.Graph()
-    cmap = plt.get_cmap("viridis")
-    array = np.array(list(fidelities.values())) * 100
-    node_color = [
-        (
-            plt.cm.viridis((value * 100 - min(array)) / (max(array) - min(array)))
-            if value > 0.8
-            else "grey"
-        )
-        for value in list(fidelities.values())
+    layout = topology.chip_layout(connectivity, pos)
+    fidelities, fidelities_2qb = chip_fidelities(
+        load_json(raw_data_single, store), load_json(raw_data_two, store), layout
+    )
+    # Qubits without a result are reported with a fidelity of 0
+    array = np.nan_to_num(fidelities)
+    labels = [f"Q{q}\n{np.round(value, decimals=2)}" for q, value in zip(layout.qubits, array)]
+    # Two significant digits, without error
+    edge_labels = [
+        "-" if np.isnan(mu) else f"{float(f'{mu:.2g}'):.1f}" for mu in fidelities_2qb
     ]
-    levels = MaxNLocator(nbins=100).tick_values(min(array), max(array))
+
+    cmap = matplotlib.colormaps["viridis"]
+    node_color = topology.node_colors(array, cmap, array.min(), array.max(), threshold=80)
+    levels = MaxNLocator(nbins=100).tick_values(array.min(), array.max())
     norm = BoundaryNorm(levels, ncolors=cmap.N, clip=True)
 
-    g.add_nodes_from(list(range(20)))
-    g.add_edges_from(connectivity)
-    nx.draw_networkx_edges(g, pos, edge_color="black", width=5)
-    nx.draw_networkx_nodes(g, pos, node_size=800, linewidths=5, node_color=node_color)
-    nx.draw_networkx_labels(
-        g,
-        pos,
-        labels=labels,
-        font_color="r",
-        alpha=0.6,
-        font_size=8,
-        font_weight="bold",
+    fig, ax = new_subplots()
+    topology.draw_topology(
+        ax,
+        layout,
+        node_color,
+        node_labels=labels,
+        edge_labels=edge_labels,
     )
-    # print(connectivity)
-
-    try:
-        nx.draw_networkx_edge_labels(
-            g,
-            pos,
-            edge_labels={
-                (a, b): fidelities_2qb.get((a, b), "-") for a, b in connectivity
-            },
-            font_color="black",
-            font_size=8,
-            font_weight="bold",
-        )
-    except Exception as e:
-        print(f"Warning: could not draw edge labels: {e}")
 
-    ax = plt.gca()
     # Place colorbar below the plot
-    cbar = plt.colorbar(
-        plt.cm.ScalarMappable(norm=norm, cmap=cmap),
+    cbar = fig.colorbar(
+        ScalarMappable(norm=norm, cmap=cmap),
         ax=ax,
         orientation="horizontal",
         pad=0.1,
@@ -196,15 +260,99 @@ def plot_fidelity_graph(
         shrink=0.8,  # Adjust shrink to make it visually longer
     )
     cbar.set_label("1Q Fidelity")
-    plt.box(False)
-    plt.tight_layout()
+    cbar.minorticks_off()
+    ax.set_frame_on(False)
+    fig.tight_layout()
     filename = "fidelities.pdf"
     os.makedirs(output_path, exist_ok=True)
     full_path = output_path + experiment_name + "_" + filename
-    plt.savefig(full_path)
-    plt.close()
+    return savefig(fig, full_path)
+
+
+def plot_fidelity_delta(
+    raw_data_single,
+    raw_data_two,
+    labels,
+    expname,
+    connectivity,
+    pos,
+    output_path="build/",
+    store=None,
+):
+    """
+    Draw the fidelity changes between two runs on the chip topology.
+
+    The fidelities of both runs are aligned on the chip layout, so the
+    changes of every qubit and coupler are one array subtraction. Qubits and
+    couplers are coloured by their change on a diverging colormap centred on
+    zero: red for a regression of the first run against the second, blue for
+    an improvement, grey where either run has no result.
+
+    Args:
+        raw_data_single (list): The two calibration.json files.
+        raw_data_two (list): The two bell_tomography results.json files.
+        labels (list): Labels of the two runs.
+        expname (str): Experiment name used in the output filename.
+        connectivity: Couplers of the chip, see ``config.connectivity``.
+        pos: Qubit coordinates of the chip, see ``config.pos``.
+        output_path (str): Directory to save the output plot.
+        store: Optional ``RunStore`` the results are loaded through.
+
+    Returns:
+        str: Path to the saved figure.
+    """
+    layout = topology.chip_layout(connectivity, pos)
+    (single_a, two_a), (single_b, two_b) = (
+        chip_fidelities(load_json(single, store), load_json(two, store), layout)
+        for single, two in zip(raw_data_single, raw_data_two)
+    )
+    # A fidelity of 0 is a failed calibration, not a measurement.
+    delta_single = np.where((single_a > 0) & (single_b > 0), single_a - single_b, np.nan)
+    delta_two = two_a - two_b
+
+    # 1Q changes are much smaller than 2Q ones: one symmetric scale each,
+    # with some headroom so that the labels stay readable on the largest ones.
+    spans = [
+        1.25 * np.nanmax(np.abs(delta)) if np.isfinite(delta).any() else 0.0
+        for delta in (delta_single, delta_two)
+    ]
+    span_single, span_two = (span or 1.0 for span in spans)
+    cmap = matplotlib.colormaps["RdBu"]
 
-    return full_path
+    node_labels = [
+        f"Q{q}\n-" if np.isnan(d) else f"Q{q}\n{d:+.2f}"
+        for q, d in zip(layout.qubits, delta_single)
+    ]
+    edge_labels = ["-" if np.isnan(d) else f"{d:+.1f}" for d in delta_two]
+
+    # Taller than the default: two colorbars go below the chip.
+    fig, ax = new_subplots(figsize=(6.4, 6))
+    topology.draw_topology(
+        ax,
+        layout,
+        topology.node_colors(delta_single, cmap, -span_single, span_single),
+        node_labels=node_labels,
+        edge_labels=edge_labels,
+        edge_colors=topology.node_colors(delta_two, cmap, -span_two, span_two),
+        label_color="black",
+    )
+    for name, span in (("1Q", span_single), ("2Q", span_two)):
+        cbar = fig.colorbar(
+            ScalarMappable(norm=Normalize(-span, span), cmap=cmap),
+            ax=ax,
+            orientation="horizontal",
+            pad=0.12,
+            fraction=0.05,
+            aspect=40,
+            shrink=0.8,
+        )
+        cbar.set_label(f"{name} fidelity change (%)")
+    ax.set_title(f"{labels[0]} vs {labels[1]}")
+    ax.set_frame_on(False)
+    fig.tight_layout()
+    os.makedirs(output_path, exist_ok=True)
+    out_file = os.path.join(output_path, f"{expname}_delta.pdf")
+    return savefig(fig, out_file)
 
 
 # def plot_fidelity_graph(
@@ -356,9 +504,9 @@ def plot_swap_coupler(qubit_number=0, data_dir="data/DEMODATA", output_path="bui
     y = np.array(data["y"])
     res = np.array(data["data"]).transpose() * 1e6
 
-    fig, ax = plt.subplots()
+    fig, ax = new_subplots()
     levels = MaxNLocator(nbins=100).tick_values(res.min(), res.max())
-    cmap = plt.get_cmap("inferno")
+    cmap = matplotlib.colormaps["inferno"]
     norm = BoundaryNorm(levels, ncolors=cmap.N, clip=True)
     im = ax.imshow(
         res,
@@ -378,9 +526,7 @@ def plot_swap_coupler(qubit_number=0, data_dir="data/DEMODATA", output_path="bui
     output_path = os.path.join(
         data_dir, f"chevron_swap_q{qubit_number + 1}_coupler.pdf"
     )
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return output_path
+    return savefig(fig, output_path, dpi=300)
 
 
 def plot_chevron_swap_coupler(
@@ -404,9 +550,9 @@ def plot_chevron_swap_coupler(
     y = np.array(data["y"])
     res = np.array(data["data"]).transpose() * 1e6
 
-    fig, ax = plt.subplots()
+    fig, ax = new_subplots()
     levels = MaxNLocator(nbins=100).tick_values(res.min(), res.max())
-    cmap = plt.get_cmap("inferno")
+    cmap = matplotlib.colormaps["inferno"]
     norm = BoundaryNorm(levels, ncolors=cmap.N, clip=True)
     im = ax.imshow(
         res,
@@ -424,9 +570,7 @@ def plot_chevron_swap_coupler(
     ax.set_title(f"Q13")
     fig.tight_layout()
     output_path = os.path.join(output_path, f"chevron_swap_q{qubit_number + 1}.pdf")
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return output_path
+    return savefig(fig, output_path, dpi=300)
 
 
 def prepare_grid_t1_plts(max_number, data_dir, output_path="build/"):
@@ -457,25 +601,22 @@ def plot_t1_decay(qubit_number, data_dir, output_path="build/", suffix=""):
 
     x = np.linspace(0, 10, 100)
     y = np.exp(-x / 3)  # Arbitrary decay constant for mockup
-    plt.figure()
-    plt.plot(x, y, label=f"Qubit {qubit_number}")
-    plt.xlabel("milliseconds")
-    plt.ylabel("T1")
-    plt.title(f"T1 Decay Qubit {qubit_number}{suffix}")
-    plt.ylim(0, 1.05)
-    plt.xlim(0, 10)
-    plt.legend()
-    plt.tight_layout()
+    fig, ax = new_subplots()
+    ax.plot(x, y, label=f"Qubit {qubit_number}")
+    ax.set_xlabel("milliseconds")
+    ax.set_ylabel("T1")
+    ax.set_title(f"T1 Decay Qubit {qubit_number}{suffix}")
+    ax.set_ylim(0, 1.05)
+    ax.set_xlim(0, 10)
+    ax.legend()
+    fig.tight_layout()
     filename = f"t1_{qubit_number}{suffix}.pdf"
     full_path = os.path.join(output_path, filename)
-    plt.savefig(full_path)
-    plt.close()
-    return full_path
+    return savefig(fig, full_path)
 
 
-def mermin_plot(raw_data, expname, output_path="build/"):
-    with open(raw_data) as r:
-        raw = json.load(r)
+def mermin_plot(raw_data, expname, output_path="build/", store=None):
+    raw = load_json(raw_data, store)
 
     # Support both list and dict formats
     x_raw = raw.get("x", {})
@@ -508,12 +649,12 @@ def mermin_plot(raw_data, expname, output_path="build/"):
         raise ValueError(f"No valid Mermin data to plot from {raw_data}")
 
     os.makedirs(output_path, exist_ok=True)
-    plt.figure()
+    fig, ax = new_subplots()
 
     # Plot all series and track global max
     global_max = None
     for label, xs, ys in series:
-        plt.plot(xs / np.pi * 180.0, ys, label=label if len(series) > 1 else None)
+        ax.plot(xs / np.pi * 180.0, ys, label=label if len(series) > 1 else None)
         candidate = ys[np.nanargmax(np.abs(ys))]
         if global_max is None or np.abs(candidate) > np.abs(global_max):
             global_max = candidate
@@ -522,40 +663,34 @@ def mermin_plot(raw_data, expname, output_path="build/"):
 
     quantum_bound = 2 ** ((number_of_qubits - 1) / 2) * (2 ** (number_of_qubits // 2))
 
-    plt.axhline(
+    ax.axhline(
         classical_bound, color="k", linestyle="dashed", label="Local Realism Bound"
     )
-    plt.axhline(-classical_bound, color="k", linestyle="dashed")
-    plt.axhline(quantum_bound, color="red", linestyle="dashed", label="Quantum Bound")
-    plt.axhline(-quantum_bound, color="red", linestyle="dashed")
+    ax.axhline(-classical_bound, color="k", linestyle="dashed")
+    ax.axhline(quantum_bound, color="red", linestyle="dashed", label="Quantum Bound")
+    ax.axhline(-quantum_bound, color="red", linestyle="dashed")
 
-    plt.xlabel(r"$\theta$ [degrees]")
-    plt.ylabel("Result")
-    plt.grid()
+    ax.set_xlabel(r"$\theta$ [degrees]")
+    ax.set_ylabel("Result")
+    ax.grid()
     if len(series) > 1:
-        plt.legend()
-    plt.title(f"Mermin Inequality [{number_of_qubits} qubits]\nMax: {global_max}")
-    plt.tight_layout()
+        ax.legend()
+    ax.set_title(f"Mermin Inequality [{number_of_qubits} qubits]\nMax: {global_max}")
+    fig.tight_layout()
 
     filename = f"{expname}_mermin.png"
     full_path = os.path.join(output_path, filename)
-    plt.savefig(full_path)
-    plt.close()
-    return full_path
+    return savefig(fig, full_path)
 
 
-def plot_reuploading(x, target, predictions=None, err=None, title="plot", outdir="."):
-    """Plot target function and, optionally, the predictions of our model."""
-    # flatten everything to 1D
-    x = np.asarray(x).reshape(-1)
-    target = np.asarray(target).reshape(-1)
-    if predictions is not None:
-        predictions = np.asarray(predictions).reshape(-1)
-    if err is not None:
-        err = np.asarray(err).reshape(-1)
+def draw_reuploading(ax, x, target, predictions=None, err=None):
+    """
+    Draw the target function and, optionally, the predictions of our model.
 
-    plt.figure(figsize=(4, 4 * 6 / 8), dpi=120)
-    plt.plot(
+    Returns:
+        tuple: The target and prediction ``Line2D`` (None without predictions).
+    """
+    target_line, = ax.plot(
         x,
         target,
         marker="o",
@@ -566,8 +701,9 @@ def plot_reuploading(x, target, predictions=None, err=None, title="plot", outdir
         markeredgecolor="black",
         color="red",
     )
+    prediction_line = None
     if predictions is not None:
-        plt.plot(
+        prediction_line, = ax.plot(
             x,
             predictions,
             marker="o",
@@ -579,52 +715,53 @@ def plot_reuploading(x, target, predictions=None, err=None, title="plot", outdir
             color="blue",
         )
     if predictions is not None and err is not None:
-        plt.fill_between(
+        ax.fill_between(
             x, predictions - err, predictions + err, alpha=0.3, color="blue"
         )
-    plt.xlabel(r"$x$")
-    plt.ylabel(r"$f(x)$")
-    plt.legend()
+    ax.set_xlabel(r"$x$")
+    ax.set_ylabel(r"$f(x)$")
+    ax.legend()
+    return target_line, prediction_line
+
+
+def plot_reuploading(x, target, predictions=None, err=None, title="plot", outdir="."):
+    """Plot target function and, optionally, the predictions of our model."""
+    # flatten everything to 1D
+    x = np.asarray(x).reshape(-1)
+    target = np.asarray(target).reshape(-1)
+    if predictions is not None:
+        predictions = np.asarray(predictions).reshape(-1)
+    if err is not None:
+        err = np.asarray(err).reshape(-1)
+
+    fig, ax = new_subplots(figsize=(4, 4 * 6 / 8), dpi=120)
+    draw_reuploading(ax, x, target, predictions, err)
     os.makedirs(outdir, exist_ok=True)
-    plt.savefig(os.path.join(outdir, f"{title}.pdf"), dpi=300, bbox_inches="tight")
-    plt.close()
-    return os.path.join(outdir, f"{title}.pdf")
+    return savefig(fig, os.path.join(outdir, f"{title}.pdf"), dpi=300, bbox_inches="tight")
 
 
-def plot_grover(raw_data, expname, output_path="build/"):
+def plot_grover(raw_data, expname, output_path="build/", store=None):
     """
     Plot Grover's algorithm results as a histogram of measured bitstrings.
     """
     # Load data from JSON file
-    with open(raw_data, "r") as f:
-        data = json.load(f)
+    data = load_json(raw_data, store)
 
     # Extract frequencies for the first (and only) key in 'frequencies'
     frequencies = data["plotparameters"]["frequencies"]
     key = next(iter(frequencies))
-    freq_dict = frequencies[key]
-
-    # Use evenly spaced numeric positions and set bitstrings as tick labels to avoid gaps/warnings
-    labels = list(freq_dict.keys())
-    if all(isinstance(k, str) and set(k) <= {"0", "1"} for k in labels):
-        labels = sorted(labels, key=lambda s: int(s, 2))
-    x = np.arange(len(labels))
-    counts = [freq_dict[k] for k in labels]
-    tick_labels = [str(k) for k in labels]
-
-    plt.figure()
-    plt.bar(x, counts, color="skyblue", edgecolor="black")
-    plt.xlabel("Bitstring")
-    plt.ylabel("Counts")
-    plt.title("Grover's Algorithm Measurement Histogram")
-    plt.xticks(x, tick_labels, rotation=45, ha="right")
-    plt.tight_layout()
+    hist = histogram.from_frequencies(frequencies[key])
+
+    fig, ax = new_subplots()
+    histogram.draw(ax, hist, color="skyblue")
+    ax.set_xlabel("Bitstring")
+    ax.set_ylabel("Counts")
+    ax.set_title("Grover's Algorithm Measurement Histogram")
+    fig.tight_layout()
 
     os.makedirs(output_path, exist_ok=True)
     out_file = os.path.join(output_path, f"{expname}_results.pdf")
-    plt.savefig(out_file)
-    plt.close()
-    return out_file
+    return savefig(fig, out_file)
 
 
 # def plot_qft(raw_data, expname, output_path="../build/"):
@@ -657,166 +794,169 @@ def plot_grover(raw_data, expname, output_path="build/"):
 #     plt.close()
 #     return out_file
 
-def plot_qft(raw_data, expname, output_path="build/"):
+def plot_qft(raw_data, expname, output_path="build/", store=None):
     """
     Plot the results of a Quantum Fourier Transform (QFT) experiment as a histogram.
     Args:
         raw_data (str): Path to the JSON file containing the QFT results.
         output_path (str): Directory to save the output plot.
+        store (RunStore, optional): Store the results are loaded through.
     Returns:
         str: Path to the saved plot file.
     """
     # Data load
-    with open(raw_data, "r") as f:
-        data = json.load(f)
+    data = load_json(raw_data, store)
     qubits_list = data["edges"]
-    dataplot = data["frequencies"].values()
     # n_shots = data["nshots"]
     qubits_set = set(sum(qubits_list, []))
     n_qubits = len(qubits_set)                         # number of qubits
-    all_bitstrings = [format(i, f"0{n_qubits}b") for i in range(2**n_qubits)]
+    hist = histogram.from_frequencies(data["frequencies"], n_bits=n_qubits)
     os.makedirs(output_path, exist_ok=True)
     # Plot
-    plt.bar(all_bitstrings, dataplot, color="skyblue", edgecolor="black")
-    plt.title(f"QFT Manually Transpiled on with shots. \n Execution on edges {qubits_list}")
-    plt.xlabel("States")
-    plt.xticks(rotation=45, ha="right")
-    plt.ylabel("Counts")
-    plt.legend()
-    plt.tight_layout()
-    # plt.show()
+    fig, ax = new_subplots()
+    histogram.draw(ax, hist, color="skyblue")
+    ax.set_title(f"QFT Manually Transpiled on with shots. \n Execution on edges {qubits_list}")
+    ax.set_xlabel("States")
+    ax.set_ylabel("Counts")
+    fig.tight_layout()
     # Save plot
     os.makedirs(output_path, exist_ok=True)
     out_file = os.path.join(output_path, f"{expname}_results.pdf")
-    plt.savefig(out_file)
-    plt.close()
-    return out_file
+    return savefig(fig, out_file)
 
 
-def plot_ghz(raw_data, experiment_name, output_path="../build/"):
+def plot_ghz(raw_data, experiment_name, output_path="../build/", store=None):
     """
     Plot GHZ results as a histogram of measured bitstrings.
     Expects a JSON with keys:
       - success_rate
       - plotparameters: { frequencies: { <bitstring>: count, ... } }
     """
-    with open(raw_data, "r") as f:
-        data = json.load(f)
+    data = load_json(raw_data, store)
 
     freq_dict = data.get("plotparameters", {}).get("frequencies", {})
     success_rate = data.get("success_rate", None)
 
-    # Ensure bitstrings are strings for plotting
-    bitstrings = [str(b) for b in freq_dict.keys()]
-    counts = [freq_dict[b] for b in freq_dict]
-
-    plt.figure()
-    plt.bar(bitstrings, counts, color="mediumseagreen", edgecolor="black")
-    plt.xlabel("Bitstring")
-    plt.ylabel("Counts")
+    fig, ax = new_subplots()
+    histogram.draw(ax, histogram.from_frequencies(freq_dict), color="mediumseagreen")
+    ax.set_xlabel("Bitstring")
+    ax.set_ylabel("Counts")
     title = "GHZ State Measurement Histogram"
     if success_rate is not None:
         title += f" (Success: {success_rate:.3f})"
-    plt.title(title)
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
+    ax.set_title(title)
+    fig.tight_layout()
 
     os.makedirs(output_path, exist_ok=True)
     out_file = os.path.join(output_path, f"{experiment_name}_ghz_results.pdf")
-    plt.savefig(out_file)
-    plt.close()
-    return out_file
+    return savefig(fig, out_file)
 
 
-def plot_amplitude_encoding(raw_data, expname, output_path="build/"):
+def plot_amplitude_encoding(raw_data, expname, output_path="build/", store=None):
     """
     Plot Amplitude Encoding algorithm results as a histogram of measured
     bitstrings, together with the expected outcome.
     """
     # Load data from JSON file
-    with open(raw_data, "r") as f:
-        data = json.load(f)
+    data = load_json(raw_data, store)
 
     # Extract frequencies for the first (and only) key in 'frequencies'
     frequencies = data["plotparameters"]["frequencies"]
     input_vector = data["input_vector"]
     norm_vector = input_vector / np.linalg.norm(input_vector)
 
-    # Ensure bitstrings are strings for plotting
-    bitstrings = [str(bs) for bs in frequencies.keys()]
-    counts = [frequencies[bs] for bs in frequencies.keys()]
+    hist = histogram.from_frequencies(frequencies)
 
-    plt.figure()
-    plt.bar(bitstrings, counts, color="skyblue", edgecolor="black")
-    plt.plot(norm_vector**2 * np.sum(counts), "-x", c="red")
-    plt.xlabel("Bitstring")
-    plt.ylabel("Counts")
-    plt.title("Amplitude Encoding Algorithm Measurement Histogram")
-    plt.tight_layout()
+    fig, ax = new_subplots()
+    _, outcomes = histogram.draw(ax, hist, color="skyblue", rotation=0)
+    # Expected counts of the outcomes on display; the "other" bar has none.
+    expected = np.append(norm_vector**2, np.nan)[outcomes] * hist.total
+    ax.plot(expected, "-x", c="red")
+    ax.set_xlabel("Bitstring")
+    ax.set_ylabel("Counts")
+    ax.set_title("Amplitude Encoding Algorithm Measurement Histogram")
+    fig.tight_layout()
 
     os.makedirs(output_path, exist_ok=True)
     out_file = os.path.join(output_path, f"{expname}_results.pdf")
-    plt.savefig(out_file)
-    plt.close()
-    return out_file
+    return savefig(fig, out_file)
 
 
-def plot_reuploading_classifier(raw_data, exp_name, output_path="../build/"):
-    # Retrieve relevant data
-    with open(raw_data, "r") as f:
-        data_json = json.load(f)
+# Above this many points a scatter is rasterized in vector outputs: one image
+# instead of one path per point keeps the PDF small.
+RASTERIZE_POINTS = 5000
+# At most this many points of a dataset are drawn, a random sample of them.
+MAX_DISPLAY_POINTS = 20000
 
-    # import pdb
 
-    # pdb.set_trace()
+def scatter_classes(ax, x, labels, errors, max_points=MAX_DISPLAY_POINTS):
+    """
+    Scatter a 2D dataset with one colour per class and crosses on the errors.
 
-    train_x = np.array(data_json["x_train"])
-    train_pred_errors = np.array(data_json["train_pred_errors"])
-    train_pred_errors = np.transpose(
-        np.array([train_x[ind] for ind in train_pred_errors])
-    )
-    train_y = np.array(data_json["train_predictions"])
-    test_x = np.array(data_json["x_test"])
-    test_pred_errors = np.array(data_json["test_pred_errors"])
-    test_pred_errors = np.transpose(np.array([test_x[ind] for ind in test_pred_errors]))
-    test_y = np.array(data_json["test_predictions"])
+    Args:
+        ax: Matplotlib axes.
+        x (np.ndarray): (n, 2) points.
+        labels (np.ndarray): (n,) predicted class of every point.
+        errors (np.ndarray): Indices of the misclassified points.
+        max_points (int): Draw a fixed random sample of this many points when
+            the dataset is larger, None draws all of them.
+    """
+    n_points = len(x)
+    is_error = np.zeros(n_points, dtype=bool)
+    is_error[np.asarray(errors, dtype=int)] = True
+    shown = np.ones(n_points, dtype=bool)
+    if max_points is not None and n_points > max_points:
+        # Seeded, so that the same data always gives the same figure.
+        shown[:] = False
+        shown[np.random.default_rng(0).choice(n_points, max_points, replace=False)] = True
+    rasterized = int(shown.sum()) > RASTERIZE_POINTS
+
+    # Every class is scattered, even when no point of it is shown, so that
+    # the colours do not depend on the sample.
+    for label in np.unique(labels):
+        points = x[shown & (labels == label)]
+        ax.scatter(points[:, 0], points[:, 1], rasterized=rasterized)
+    points = x[shown & is_error]
+    ax.scatter(points[:, 0], points[:, 1], marker="x", color="black", rasterized=rasterized)
+
+
+def plot_reuploading_classifier(raw_data, exp_name, output_path="../build/", store=None):
+    # Retrieve relevant data
+    data_json = load_json(raw_data, store)
+
+    train_x = np.asarray(data_json["x_train"], dtype=float).reshape(-1, 2)
+    train_y = np.asarray(data_json["train_predictions"])
+    test_x = np.asarray(data_json["x_test"], dtype=float).reshape(-1, 2)
+    test_y = np.asarray(data_json["test_predictions"])
     loss_history = data_json["loss_history"]
     train_acc = data_json["train_accuracy"]
     test_acc = data_json["test_accuracy"]
 
     if loss_history:
-        fig = plt.figure(figsize=(8, 6), dpi=120)
+        fig = new_figure(figsize=(8, 6), dpi=120)
         gs = fig.add_gridspec(2, 2, height_ratios=[2, 1])  # 2 rows, 2 columns
     else:
-        fig = plt.figure(figsize=(8, 4), dpi=120)
+        fig = new_figure(figsize=(8, 4), dpi=120)
         gs = fig.add_gridspec(1, 2)  # 1 row, 2 columns
 
     # Train plot (top-left)
     ax_train = fig.add_subplot(gs[0, 0])
-    for label in np.unique(train_y):
-        data_label = np.transpose(train_x[np.where(train_y == label)])
-        ax_train.scatter(data_label[0], data_label[1])
-    ax_train.scatter(
-        train_pred_errors[0], train_pred_errors[1], marker="x", color="black"
-    )
+    scatter_classes(ax_train, train_x, train_y, data_json["train_pred_errors"])
     ax_train.set_title(f"Train predictions: {train_acc} accuracy")
     ax_train.set_xlabel(r"$x$")
     ax_train.set_ylabel(r"$y$")
-    circle_train = plt.Circle(
+    circle_train = Circle(
         (0, 0), np.sqrt(2 / np.pi), edgecolor="k", linestyle="--", fill=False
     )
     ax_train.add_patch(circle_train)
 
     # Test plot (top-right)
     ax_test = fig.add_subplot(gs[0, 1])
-    for label in np.unique(test_y):
-        data_label = np.transpose(test_x[np.where(test_y == label)])
-        ax_test.scatter(data_label[0], data_label[1])
-    ax_test.scatter(test_pred_errors[0], test_pred_errors[1], marker="x", color="black")
+    scatter_classes(ax_test, test_x, test_y, data_json["test_pred_errors"])
     ax_test.set_title(f"Test predictions: {test_acc} accuracy")
     ax_test.set_xlabel(r"$x$")
     ax_test.set_ylabel(r"$y$")
-    circle_test = plt.Circle(
+    circle_test = Circle(
         (0, 0), np.sqrt(2 / np.pi), edgecolor="k", linestyle="--", fill=False
     )
     ax_test.add_patch(circle_test)
@@ -829,178 +969,467 @@ def plot_reuploading_classifier(raw_data, exp_name, output_path="../build/"):
         ax_loss.set_xlabel(r"$Iteration$")
         ax_loss.set_ylabel(r"$Loss$")
 
-    plt.tight_layout()
+    fig.tight_layout()
     os.makedirs(output_path, exist_ok=True)
-    fig.savefig(
+    return savefig(
+        fig,
         os.path.join(output_path, f"reuploading_classifier_results_{exp_name}.pdf"),
         bbox_inches="tight",
-        dpi=300,
+        # Resolution of the rasterized scatters of large datasets
+        dpi=150,
     )
-    plt.close(fig)
-    return os.path.join(output_path, f"reuploading_classifier_results_{exp_name}.pdf")
 
 
-def do_plot_reuploading(raw_data, expname, output_path="build/"):
+class EpochSeries:
+    """
+    One figure redrawn for every epoch of a reuploading training.
+
+    The axes, ticks, labels and legend are drawn once and kept as a
+    background image; a frame only restores it and draws the two lines and
+    the title with the data of its epoch (blitting). The axes limits cover
+    every epoch, so the frames line up.
+    """
+
+    def __init__(self, epochs, dpi=120):
+        """
+        Args:
+            epochs (list): ``(epoch, x, target, predictions)`` per frame, 1D arrays.
+            dpi (int): Resolution of the frames.
+        """
+        self.epochs = epochs
+        self.fig, self.ax = new_subplots(figsize=(4, 4 * 6 / 8), dpi=dpi)
+        canvas = FigureCanvasAgg(self.fig)
+        _, x, target, predictions = epochs[0]
+        self.target_line, self.prediction_line = draw_reuploading(
+            self.ax, x, target, predictions
+        )
+        # Reserve the room of the title in the layout, it is drawn per frame.
+        self.title = self.ax.set_title(f"Epoch {epochs[-1][0]}")
+
+        xs = np.concatenate([x for _, x, _, _ in epochs])
+        ys = np.concatenate([np.concatenate([t, p]) for _, _, t, p in epochs])
+        self.ax.set_xlim(*_padded_limits(xs))
+        self.ax.set_ylim(*_padded_limits(ys))
+        self.fig.tight_layout()
+
+        self.animated = (self.target_line, self.prediction_line, self.title)
+        for artist in self.animated:
+            artist.set_animated(True)
+        canvas.draw()
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+
+    def frame(self, index):
+        """Return the epoch at ``index`` as an RGBA image."""
+        epoch, x, target, predictions = self.epochs[index]
+        self.target_line.set_data(x, target)
+        self.prediction_line.set_data(x, predictions)
+        self.title.set_text(f"Epoch {epoch}")
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for artist in self.animated:
+            self.ax.draw_artist(artist)
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def _padded_limits(values, margin=0.05):
+    """Return axis limits around ``values`` with matplotlib's default margin."""
+    low, high = float(np.min(values)), float(np.max(values))
+    pad = (high - low) * margin or 0.5
+    return low - pad, high + pad
+
+
+def _epoch_frames(epochs, dpi, indices):
+    """Render the epochs at ``indices`` as RGB images, on a figure of this process."""
+    series = EpochSeries(epochs, dpi=dpi)
+    return [series.frame(index)[..., :3] for index in indices]
+
+
+def _iter_epoch_frames(epochs, dpi, chunk_size, workers):
+    """
+    Yield the frame of every epoch in order, rendered ``chunk_size`` at a time.
+
+    With more than one worker the chunks are rendered in worker processes:
+    matplotlib's text layout is not thread-safe. Only the chunks in flight are
+    kept in memory.
+    """
+    chunks = [
+        range(start, min(start + chunk_size, len(epochs)))
+        for start in range(0, len(epochs), chunk_size)
+    ]
+    if workers <= 1 or len(chunks) == 1:
+        series = EpochSeries(epochs, dpi=dpi)
+        for chunk in chunks:
+            yield [series.frame(index)[..., :3] for index in chunk]
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        yield from pool.map(_epoch_frames, itertools.repeat(epochs), itertools.repeat(dpi), chunks)
+
+
+def _contact_sheet(frames, columns):
+    """Tile equally sized frames into rows of ``columns``, padding with white."""
+    frames = list(frames)
+    frames += [np.full_like(frames[0], 255)] * (-len(frames) % columns)
+    rows = [np.hstack(frames[i : i + columns]) for i in range(0, len(frames), columns)]
+    return np.vstack(rows)
+
+
+def do_plot_reuploading(
+    raw_data,
+    expname,
+    output_path="build/",
+    store=None,
+    fmt="pdf",
+    workers=1,
+    columns=5,
+    rows_per_page=6,
+    dpi=100,
+):
     """
-    Generate reuploading plots for each epoch and a final summary plot using data from the results JSON file.
+    Plot every epoch of a reuploading training and the final summary.
+
+    The epochs are frames of one figure (see ``EpochSeries``), tiled
+    ``columns`` per row:
+
+    - ``fmt="pdf"`` writes them into ``plot_reuploading_{expname}.pdf``,
+      ``rows_per_page`` rows per page, followed by a (vector) summary page.
+      Every page is written as soon as its epochs are drawn, so only one page
+      of frames is held in memory;
+    - ``fmt="png"`` tiles them all into ``plot_reuploading_{expname}.png``,
+      which holds every frame in memory.
+
+    With ``workers`` above 1 the pages are drawn in that many processes. The
+    summary is also written on its own to ``final_plot_{expname}.pdf``.
 
     Args:
-        results_file (str): Path to the JSON file containing reuploading results.
-    """
-    with open(raw_data, "r") as f:
-        results = json.load(f)
-
-    output_dir = output_path
-
-    # Generate a plot for each epoch
-    for epoch_data in results["epoch_data"]:
-        epoch = epoch_data["epoch"]
-        x_train = np.array(epoch_data["x_train"])
-        y_train = np.array(epoch_data["y_train"])
-        predictions = np.array(epoch_data["predictions"])
-
-        plot_reuploading(
-            x=x_train,
-            target=y_train,
-            predictions=predictions,
-            title=f"epoch_{epoch:03d}",
-            outdir=output_dir,
+        raw_data (str): Path to the JSON file containing reuploading results.
+        expname (str): Experiment name used in the file names.
+        output_path (str): Directory of the output files.
+        dpi (int): Resolution of the epoch frames.
+    Returns:
+        str: Path of the epoch series file.
+    """
+    results = load_json(raw_data, store)
+
+    epochs = [
+        (
+            epoch_data["epoch"],
+            np.asarray(epoch_data["x_train"], dtype=float).reshape(-1),
+            np.asarray(epoch_data["y_train"], dtype=float).reshape(-1),
+            np.asarray(epoch_data["predictions"], dtype=float).reshape(-1),
         )
+        for epoch_data in results["epoch_data"]
+    ]
+    os.makedirs(output_path, exist_ok=True)
 
     # Generate the final summary plot
-    x_train = np.array(results["epoch_data"][-1]["x_train"])
-    y_train = np.array(results["epoch_data"][-1]["y_train"])
-    median_pred = np.array(results["median_predictions"])
-    mad_pred = np.array(results["mad_predictions"])
-
-    plot_reuploading(
+    _, x_train, y_train, _ = epochs[-1]
+    median_pred = np.asarray(results["median_predictions"], dtype=float).reshape(-1)
+    mad_pred = np.asarray(results["mad_predictions"], dtype=float).reshape(-1)
+    summary = plot_reuploading(
         x=x_train,
         target=y_train,
         predictions=median_pred,
         err=mad_pred,
         title=f"final_plot_{expname}",
-        outdir=output_dir,
+        outdir=output_path,
     )
 
-    return os.path.join(output_dir, f"plot_reuploading_{expname}.pdf")
+    per_page = columns * rows_per_page
+    pages = _iter_epoch_frames(epochs, dpi, per_page, workers)
+
+    out_file = os.path.join(output_path, f"plot_reuploading_{expname}.{fmt}")
+    if render_profiles.current().thumbnail_dpi:
+        # The summary stands for the whole series in the previews.
+        shutil.copyfile(
+            render_profiles.thumbnail_path(summary), render_profiles.thumbnail_path(out_file)
+        )
+    with tracing.span("savefig", "plot", path=out_file):
+        if fmt == "png":
+            import matplotlib.image
+
+            frames = [frame for page in pages for frame in page]
+            matplotlib.image.imsave(out_file, _contact_sheet(frames, columns))
+            return out_file
+
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        with PdfPages(out_file) as pdf:
+            for frames in pages:
+                sheet = _contact_sheet(frames, columns)
+                page = new_figure(figsize=(sheet.shape[1] / dpi, sheet.shape[0] / dpi), dpi=dpi)
+                page.figimage(sheet)
+                pdf.savefig(page, dpi=dpi)
+            fig, ax = new_subplots(figsize=(4, 4 * 6 / 8), dpi=120)
+            draw_reuploading(ax, x_train, y_train, median_pred, mad_pred)
+            ax.set_title("Median prediction")
+            fig.tight_layout()
+            pdf.savefig(fig)
+    return out_file
 
 
-def plot_process_tomography(calid, runid, output_path="build/"):
+def plot_process_tomography_gate(matrix_file, calid, output_path="build/"):
     """
-    Plot process tomography matrices for a given experiment/expname.
+    Plot the process tomography matrix of one gate.
+
+    Each gate is its own figure so that the tiles are rendered in parallel and
+    cached separately; the report lays them out in a grid.
 
     Args:
-        expname (str): Experiment name to include in the output filename.
+        matrix_file (str): ``.npy`` file of the gate, e.g.
+            ``process_tomography/matrices/gate_cz_[]_qubits2_3.npy``.
+        calid (str): Calibration id, appended to the title.
         output_path (str): Directory to save the output plot.
     Returns:
         str: Path to saved PDF file.
     """
-
-    repo_root = os.path.dirname(os.path.dirname(__file__))  # ../ from src/
-    folder_path = os.path.join(
-        repo_root, "data", calid, runid, "process_tomography", "matrices"
-    )
-    npy_files = np.sort([f for f in os.listdir(folder_path) if f.endswith(".npy")])
-
-    fig, ax = plt.subplots(len(npy_files), 1, figsize=[len(npy_files) * 5, 15], dpi=300)
-
-    # If only one subplot, wrap it in a list for consistency
-    if len(npy_files) == 1:
-        ax = [ax]
-
-    for idx, file_name in enumerate(npy_files):
-        full_path = os.path.join(folder_path, file_name)
-        arr = np.load(full_path)
-
-        # Define labels depending on matrix shape
-        if arr.shape == (4, 4):
-            labels = ["I", "X", "Y", "Z"]
-            fontsize = 10
-        elif arr.shape == (16, 16):
-            single_labels = ["I", "X", "Y", "Z"]
-            labels = [a + b for a, b in itertools.product(single_labels, repeat=2)]
-            fontsize = 8
-        else:
-            labels = []
-            fontsize = 10
-
-        ax[idx].imshow(np.real(arr), cmap="coolwarm", vmin=-1, vmax=1)
-        ax[idx].set_xticks(range(len(labels)))
-        ax[idx].set_yticks(range(len(labels)))
-        ax[idx].set_xticklabels(labels, fontsize=fontsize)
-        ax[idx].set_yticklabels(labels, fontsize=fontsize)
-        title = file_name.removeprefix("gate_").replace(".npy", f"_{calid}")
-        ax[idx].set_title(title)
-
-        # Add colorbar beside subplots
-        im = ax[idx].imshow(np.real(arr), cmap="coolwarm", vmin=-1, vmax=1)
-        cbar = fig.colorbar(
-            im, ax=ax[idx], orientation="vertical", fraction=0.05, pad=0.01
-        )
-
-    plt.tight_layout()
+    arr = np.real(np.load(matrix_file))
+    file_name = os.path.basename(matrix_file)
+
+    # Define labels depending on matrix shape
+    if arr.shape == (4, 4):
+        labels = ["I", "X", "Y", "Z"]
+        fontsize = 10
+    elif arr.shape == (16, 16):
+        single_labels = ["I", "X", "Y", "Z"]
+        labels = [a + b for a, b in itertools.product(single_labels, repeat=2)]
+        fontsize = 8
+    else:
+        labels = []
+        fontsize = 10
+
+    fig, ax = new_subplots(figsize=(5, 4.5))
+    im = ax.imshow(arr, cmap="coolwarm", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(labels)))
+    ax.set_yticks(range(len(labels)))
+    ax.set_xticklabels(labels, fontsize=fontsize)
+    ax.set_yticklabels(labels, fontsize=fontsize)
+    ax.set_title(file_name.removeprefix("gate_").replace(".npy", f"_{calid}"))
+    fig.colorbar(im, ax=ax, orientation="vertical", fraction=0.05, pad=0.01)
+    fig.tight_layout()
 
     os.makedirs(output_path, exist_ok=True)
-    out_file = os.path.join(output_path, f"process_tomography_{calid}_matrices.pdf")
-    plt.savefig(out_file, format="pdf", bbox_inches="tight")
-    plt.close()
-
-    # return "placeholder.png"
-    return out_file
+    # Gate names contain brackets and dots, which graphicx does not accept.
+    stem = re.sub(r"[^A-Za-z0-9-]+", "_", Path(file_name).stem).strip("_")
+    out_file = os.path.join(output_path, f"process_tomography_{stem}.pdf")
+    return savefig(fig, out_file, format="pdf", bbox_inches="tight")
 
 
-def plot_tomography(raw_data, expname, output_path="build/"):
+def plot_tomography(raw_data, expname, output_path="build/", store=None):
     return "placeholder.png"
 
 
-def plot_qml(raw_data, expname, output_path="build/"):
+def draw_confusion_matrix(ax, cm, labels, cmap="Blues"):
+    """
+    Draw a confusion matrix with its counts, like sklearn's ``ConfusionMatrixDisplay``.
 
-    with open(raw_data, "r") as f:
-        data = json.load(f)
+    Args:
+        ax: Matplotlib axes.
+        cm (np.ndarray): Square matrix of counts, rows are true labels.
+        labels (list): Class names, in the order of the rows.
+        cmap (str): Colormap name.
+    """
+    cmap = matplotlib.colormaps[cmap]
+    ax.imshow(cm, interpolation="nearest", cmap=cmap)
+    # Dark text on light cells and light text on dark ones
+    threshold = (cm.max() + cm.min()) / 2.0
+    for (i, j), count in np.ndenumerate(cm):
+        color = cmap(1.0) if count < threshold else cmap(0.0)
+        ax.text(j, i, format(count, "d"), ha="center", va="center", color=color)
+    n_classes = len(labels)
+    ax.set(
+        xticks=np.arange(n_classes),
+        yticks=np.arange(n_classes),
+        xticklabels=labels,
+        yticklabels=labels,
+        xlabel="Predicted label",
+        ylabel="True label",
+    )
+    ax.set_ylim((n_classes - 0.5, -0.5))
 
-    qc_configurations = data.get("NQCH", {})
-    noiseless_configuration = data.get("verification_ios", {})
 
-    # Extract true and predicted labels from the dict values
-    true = []
-    pred = []
-    noiseless = []
+def plot_qml(raw_data, expname, output_path="build/", store=None):
 
-    for key, sample in qc_configurations.items():
-        pred_label = int(sample.get("predicted_label", 0))
-        is_correct = sample.get("is_correct", True)
-        # Infer true label from is_correct and predicted_label
-        true_label = pred_label if is_correct else 1 - pred_label
-        true.append(true_label)
-        pred.append(pred_label)
-        # Get noiseless label from verification_ios dict
-        noiseless_label = int(noiseless_configuration.get(key, {}).get("predicted_label", 0))
-        noiseless.append(noiseless_label)
+    data = load_json(raw_data, store)
 
-    true = np.array(true, dtype=int)
-    pred = np.array(pred, dtype=int)
-    noiseless = np.array(noiseless, dtype=int)
+    true, pred, noiseless = metrics.qml_labels(data)
 
     # Build confusion matrices (force both classes to appear: 0,1)
     labels = [0, 1]
-    cm_pred = confusion_matrix(true, pred, labels=labels)
-    cm_noiseless = confusion_matrix(true, noiseless, labels=labels)
+    cm_pred = metrics.confusion_matrix(true, pred, n_classes=len(labels))
+    cm_noiseless = metrics.confusion_matrix(true, noiseless, n_classes=len(labels))
 
     os.makedirs(output_path, exist_ok=True)
 
-    fig, axes = plt.subplots(1, 2, figsize=(8, 4))
-    disp1 = ConfusionMatrixDisplay(confusion_matrix=cm_pred, display_labels=labels)
-    disp1.plot(cmap="Blues", ax=axes[0], colorbar=False)
+    fig, axes = new_subplots(1, 2, figsize=(8, 4))
+    draw_confusion_matrix(axes[0], cm_pred, labels, cmap="Blues")
     axes[0].set_title("Prediction vs Ground Truth")
 
-    disp2 = ConfusionMatrixDisplay(confusion_matrix=cm_noiseless, display_labels=labels)
-    disp2.plot(cmap="Greens", ax=axes[1], colorbar=False)
+    draw_confusion_matrix(axes[1], cm_noiseless, labels, cmap="Greens")
     axes[1].set_title("Noiseless circuit vs Ground Truth")
 
     fig.suptitle(f"QML Confusion Matrices", fontsize=14)
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
 
     out_file = os.path.join(output_path, f"{expname}_qml_confusion_matrices.pdf")
-    fig.savefig(out_file, dpi=300, bbox_inches="tight")
-    plt.close(fig)
-    return out_file
+    return savefig(fig, out_file, dpi=300, bbox_inches="tight")
+
+
+def _frequencies(data):
+    """
+    Return the measured frequencies of a histogram experiment as a dict.
+
+    Grover results nest them below the qubits they ran on, GHZ and Amplitude
+    Encoding keep them in ``plotparameters`` and QFT at the top level.
+    """
+    if "plotparameters" in data:
+        frequencies = data["plotparameters"]["frequencies"]
+    else:
+        frequencies = data["frequencies"]
+    first = next(iter(frequencies.values()), None)
+    if isinstance(first, dict):
+        frequencies = first
+    return frequencies
+
+
+def _overlay_axes(delta, width=6):
+    """
+    Return a figure with a main axes and, if ``delta``, a difference panel below.
+
+    Returns:
+        tuple: The figure, the main axes and the delta axes or None.
+    """
+    if not delta:
+        fig, ax = new_subplots(figsize=(width, 4))
+        return fig, ax, None
+    fig, (ax, ax_delta) = new_subplots(
+        2, 1, figsize=(width, 5.5), sharex=True, gridspec_kw={"height_ratios": [3, 1]}
+    )
+    ax_delta.axhline(0, color="black", linewidth=0.8)
+    ax_delta.grid(axis="y", alpha=0.3)
+    return fig, ax, ax_delta
+
+
+def plot_frequencies_overlay(
+    raw_data, labels, title, expname, output_path="build/", store=None, delta=False
+):
+    """
+    Plot the measured bitstring distributions of several runs as grouped bars.
+
+    Counts are normalized per run, so runs with a different number of shots
+    can be compared. Outcomes are shared between runs as in
+    ``histogram.aligned_bars``: all of them for small registers, the most
+    probable ones and an "other" bar for larger ones.
+
+    Args:
+        raw_data (list): Paths to the results.json file of every run.
+        labels (list): Legend label of every run.
+        title (str): Plot title.
+        expname (str): Experiment name used in the output filename.
+        output_path (str): Directory to save the output plot.
+        store (RunStore, optional): Store the results are loaded through.
+        delta (bool): With two runs, add a panel with the first run minus
+            the second.
+    Returns:
+        str: Path to the saved plot file.
+    """
+    hists = [
+        histogram.from_frequencies(_frequencies(load_json(path, store))) for path in raw_data
+    ]
+    _, heights, bitstrings = histogram.aligned_bars(hists)
+    x = np.arange(len(bitstrings))
+    width = 0.8 / max(len(hists), 1)
+    delta = delta and len(hists) == 2
+
+    fig, ax, ax_delta = _overlay_axes(delta, width=max(6, len(bitstrings) * 0.6))
+    for i, (label, row) in enumerate(zip(labels, heights)):
+        ax.bar(x + (i - (len(hists) - 1) / 2) * width, row, width, label=label)
+    ax.set_ylabel("Probability")
+    ax.set_title(title)
+    ax.legend(fontsize=8)
+    if delta:
+        difference = heights[0] - heights[1]
+        colors = np.where(difference >= 0, "tab:blue", "tab:orange")
+        ax_delta.bar(x, difference, 0.6, color=colors)
+        ax_delta.set_ylabel(r"$\Delta$ probability")
+    bottom = ax_delta or ax
+    bottom.set_xticks(x, bitstrings, rotation=45, ha="right")
+    if len(bitstrings) > 16:
+        bottom.tick_params(axis="x", labelsize=6)
+    bottom.set_xlabel("Bitstring")
+    fig.tight_layout()
+
+    os.makedirs(output_path, exist_ok=True)
+    out_file = os.path.join(output_path, f"{expname}_overlay.pdf")
+    return savefig(fig, out_file)
+
+
+def _mermin_series(raw):
+    """Return the (qubits, angles in degrees, values) series of a Mermin results file."""
+    x_raw = raw.get("x", {})
+    y_raw = raw.get("y", {})
+    if isinstance(x_raw, dict):
+        series = [(k, x_raw[k], y_raw[k]) for k in y_raw if k in x_raw]
+    else:
+        series = [(None, x_raw, y_raw)]
+    return [
+        (qubits, np.asarray(xs, dtype=float) / np.pi * 180.0, np.asarray(ys, dtype=float))
+        for qubits, xs, ys in series
+    ]
+
+
+def plot_mermin_overlay(raw_data, labels, expname, output_path="build/", store=None, delta=False):
+    """
+    Plot the Mermin curves of several runs on the same axes.
+
+    Args:
+        raw_data (list): Paths to the mermin results.json file of every run.
+        labels (list): Legend label of every run.
+        expname (str): Experiment name used in the output filename.
+        output_path (str): Directory to save the output plot.
+        store (RunStore, optional): Store the results are loaded through.
+        delta (bool): With two runs, add a panel with the first run minus the
+            second. Series are paired in file order and the second run is
+            interpolated on the angles of the first.
+    Returns:
+        str: Path to the saved plot file.
+    """
+    runs = [_mermin_series(load_json(path, store)) for path in raw_data]
+    delta = delta and len(runs) == 2
+
+    fig, ax, ax_delta = _overlay_axes(delta)
+    number_of_qubits = None
+    for series, label in zip(runs, labels):
+        for qubits, xs, ys in series:
+            if qubits is not None and number_of_qubits is None:
+                number_of_qubits = len(ast.literal_eval(qubits))
+            name = label if len(series) == 1 else f"{label} {qubits}"
+            ax.plot(xs, ys, label=name)
+
+    if number_of_qubits is not None:
+        classical_bound = 2 ** (number_of_qubits // 2)
+        quantum_bound = 2 ** ((number_of_qubits - 1) / 2) * (2 ** (number_of_qubits // 2))
+        for sign in (1, -1):
+            ax.axhline(sign * classical_bound, color="k", linestyle="dashed")
+            ax.axhline(sign * quantum_bound, color="red", linestyle="dashed")
+        ax.set_title(f"Mermin Inequality [{number_of_qubits} qubits]")
+
+    if delta:
+        for (qubits, xs, ys), (_, xs_other, ys_other) in zip(*runs):
+            order = np.argsort(xs_other)
+            difference = ys - np.interp(xs, xs_other[order], ys_other[order])
+            ax_delta.plot(xs, difference, label=None if len(runs[0]) == 1 else str(qubits))
+        ax_delta.set_ylabel(r"$\Delta$ result")
+
+    (ax_delta or ax).set_xlabel(r"$\theta$ [degrees]")
+    ax.set_ylabel("Result")
+    ax.grid()
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+
+    os.makedirs(output_path, exist_ok=True)
+    out_file = os.path.join(output_path, f"{expname}_mermin_overlay.pdf")
+    return savefig(fig, out_file)
@@ -5,9 +5,53 @@ import json
 from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-import plots as pl
 import fillers as fl
 import config as config
+import plot_executor
+from runstore import RunStore
+
+
+def build_path(cfg, *parts):
+    """Return a path below the build directory (``cfg.build_dir``, default build/)."""
+    return os.path.join(getattr(cfg, "build_dir", "build"), *parts)
+
+
+def overlay_plot(cfg, func_name, experiment, **kwargs):
+    """
+    Schedule one figure comparing the left and right results of an experiment.
+
+    Only with ``--overlay`` and when both sides have results; the sections
+    otherwise draw one figure per side.
+
+    Args:
+        cfg: Parsed command line arguments.
+        func_name: Overlay plot function of ``plots``, called with both
+            results files, their labels and ``delta=True``.
+        experiment: Experiment directory of the runs, e.g. ``"ghz"``.
+        **kwargs: Extra arguments of the plot function.
+
+    Returns:
+        Future or None: See ``plot_executor.submit``.
+    """
+    if not getattr(cfg, "overlay", False):
+        return None
+    sides = [(cfg.calibration_left, cfg.run_left), (cfg.calibration_right, cfg.run_right)]
+    paths = [Path(cfg.base_dir) / c / r / experiment / "results.json" for c, r in sides]
+    if not all(path.exists() for path in paths):
+        return None
+    return plot_executor.submit(
+        cfg,
+        func_name,
+        inputs=paths,
+        # Both stores share the process-wide cache of parsed files.
+        store=RunStore.for_run(cfg.base_dir, *sides[0]),
+        raw_data=paths,
+        labels=[f"{c[:7]}/{r}" for c, r in sides],
+        expname=experiment,
+        output_path=build_path(cfg, "overlay", "_vs_".join(f"{c}_{r}" for c, r in sides)),
+        delta=True,
+        **kwargs,
+    )
 
 
 def add_stat_changes(current, baseline):
@@ -41,9 +85,27 @@ def add_stat_changes(current, baseline):
     return result
 
 
-# def context_fidelity_statistics(context, cfg):
+def context_fidelity_statistics(context, cfg):
+    """Prepare fidelity statistics for both experiments."""
+    stat_fidelity = fl.get_stat_fidelity(
+        os.path.join("data", "calibrations", cfg.calibration_left, "sinq20", "calibration.json"),
+        cfg.calibration_left,
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_left, cfg.run_left),
+    )
+    stat_fidelity_right = fl.get_stat_fidelity(
+        os.path.join("data", "calibrations", cfg.calibration_right, "sinq20", "calibration.json"),
+        cfg.calibration_right,
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_right, cfg.run_right),
+    )
+    stat_fidelity_with_improvement = add_stat_changes(
+        stat_fidelity, stat_fidelity_right
+    )
+
+    context["left"]["stat_fidelity"] = stat_fidelity_with_improvement
+    context["right"]["stat_fidelity"] = stat_fidelity_right
 
-#     return context
+    logging.info("Prepared stat_fidelity and stat_fidelity_with_improvement")
+    return context
 
 
 def context_pulse_fidelity_statistics(context, cfg):
@@ -69,20 +131,66 @@ def context_pulse_fidelity_statistics(context, cfg):
     return context
 
 
-# def context_t1_statistics(context, cfg):
-#     """Prepare T1 statistics for both experiments."""
+def context_t1_statistics(context, cfg):
+    """Prepare T1 statistics for both experiments."""
+    stat_t1 = fl.get_stat_t12(
+        "calibrations/" + cfg.calibration_left + "/sinq20",
+        "t1",
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_left, cfg.run_left),
+    )
+    stat_t1_right = fl.get_stat_t12(
+        "calibrations/" + cfg.calibration_right + "/sinq20",
+        "t1",
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_right, cfg.run_right),
+    )
+    stat_t1_with_improvement = add_stat_changes(stat_t1, stat_t1_right)
 
-#     return context
+    context["left"]["stat_t1"] = stat_t1_with_improvement
+    context["right"]["stat_t1"] = stat_t1_right
 
+    logging.info("Prepared stat_t1 and stat_t1_with_improvement")
+    return context
 
-# def context_t2_statistics(context, cfg):
 
-#     return context
+def context_t2_statistics(context, cfg):
+    """Prepare T2 statistics for both experiments."""
+    stat_t2 = fl.get_stat_t12(
+        "calibrations/" + cfg.calibration_left + "/sinq20",
+        "t2",
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_left, cfg.run_left),
+    )
+    stat_t2_right = fl.get_stat_t12(
+        "calibrations/" + cfg.calibration_right + "/sinq20",
+        "t2",
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_right, cfg.run_right),
+    )
+    stat_t2_with_improvement = add_stat_changes(stat_t2, stat_t2_right)
 
+    context["left"]["stat_t2"] = stat_t2_with_improvement
+    context["right"]["stat_t2"] = stat_t2_right
 
-# def context_readout_fidelity_statistics(context, cfg):
+    logging.info("Prepared stat_t2 and stat_t2_with_improvement")
+    return context
 
-#     return context
+
+def context_readout_fidelity_statistics(context, cfg):
+    """Prepare readout fidelity statistics for both experiments."""
+    stat_readout_fidelity = fl.get_readout_fidelity(
+        os.path.join("data", "calibrations", cfg.calibration_left, "sinq20", "calibration.json"),
+        cfg.calibration_left,
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_left, cfg.run_left),
+    )
+    stat_readout_fidelity_right = fl.get_readout_fidelity(
+        os.path.join("data", "calibrations", cfg.calibration_right, "sinq20", "calibration.json"),
+        cfg.calibration_right,
+        store=RunStore.for_run(cfg.base_dir, cfg.calibration_right, cfg.run_right),
+    )
+
+    context["left"]["stat_readout_fidelity"] = stat_readout_fidelity
+    context["right"]["stat_readout_fidelity"] = stat_readout_fidelity_right
+
+    logging.info("Prepared readout fidelity statistics")
+    return context
 
 
 def context_version_extractor(context, cfg):
@@ -157,9 +265,46 @@ def context_version_extractor(context, cfg):
 #     return context
 
 
+def fidelity_delta_plot(cfg):
+    """
+    Schedule the chip heatmap of the fidelity changes between left and right.
+
+    Only with ``--overlay`` and when both sides have their calibration and
+    bell tomography results; the fidelity section otherwise draws one chip
+    per side.
+
+    Returns:
+        Future or None: See ``plot_executor.submit``.
+    """
+    if not getattr(cfg, "overlay", False):
+        return None
+    base_path = Path(cfg.base_dir)
+    sides = [(cfg.calibration_left, cfg.run_left), (cfg.calibration_right, cfg.run_right)]
+    single = [base_path / "calibrations" / c / "sinq20" / "calibration.json" for c, _ in sides]
+    two = [base_path / c / r / "bell_tomography" / "results.json" for c, r in sides]
+    if not all(path.exists() for path in single + two):
+        return None
+    return plot_executor.submit(
+        cfg,
+        "plot_fidelity_delta",
+        inputs=single + two,
+        store=RunStore.for_run(cfg.base_dir, *sides[0]),
+        raw_data_single=single,
+        raw_data_two=two,
+        labels=[f"{c[:7]}/{r}" for c, r in sides],
+        expname="fidelity",
+        connectivity=config.connectivity,
+        pos=config.pos,
+        output_path=build_path(cfg, "overlay", "_vs_".join(f"{c}_{r}" for c, r in sides)),
+    )
+
+
 def context_fidelity_plots_and_table(context, cfg):
     """Prepare fidelity plots and best qubits data."""
     base_path = Path(cfg.base_dir)
+    delta = fidelity_delta_plot(cfg)
+    if delta is not None:
+        context["plot_fidelity_delta"] = delta
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -169,27 +314,33 @@ def context_fidelity_plots_and_table(context, cfg):
         # Prepare paths for calibration and results
         calibration_path = base_path / "calibrations"/ calibration / "sinq20" / "calibration.json"
         results_path = base_path / calibration / run / "bell_tomography" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Generate fidelity plot
         try:
-            context[label]["plot_fidelity"] = pl.plot_fidelity_graph(
-                calibration_path,
-                results_path,
-                f"{calibration}_{run}",
-                config.connectivity,
-                config.pos,
-                output_path=os.path.join("build", "fidelity", calibration, run) + "/",  # Unique output path
-            )
+            if delta is None:
+                context[label]["plot_fidelity"] = plot_executor.submit(
+                    cfg,
+                    "plot_fidelity_graph",
+                    inputs=[calibration_path, results_path],
+                    store=store,
+                    raw_data_single=calibration_path,
+                    raw_data_two=results_path,
+                    experiment_name=f"{calibration}_{run}",
+                    connectivity=config.connectivity,
+                    pos=config.pos,
+                    output_path=build_path(cfg, "fidelity", calibration, run) + "/",  # Unique output path
+                )
         except Exception:
             context[label]["plot_fidelity"] = "placeholder.png"
 
         # Extract best qubits data
-        context[label]["best_qubits"] = fl.extract_best_qubits(results_path)
+        context[label]["best_qubits"] = fl.extract_best_qubits(results_path, store=store)
 
         # Extract fidelities list for Benchmark Results table
         try:
             context[label]["fidelities_list"] = fl.context_fidelity(
-                f"{calibration}/sinq20"
+                f"{calibration}/sinq20", store=store
             )
         except Exception as e:
             logging.warning(f"Error preparing fidelities_list for {label}: {e}")
@@ -205,6 +356,9 @@ def context_fidelity_plots_and_table(context, cfg):
 def context_mermin_plots(context, cfg):
     """Prepare Mermin plots and table data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(cfg, "plot_mermin_overlay", "mermin")
+    if overlay is not None:
+        context["plot_mermin_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -213,20 +367,26 @@ def context_mermin_plots(context, cfg):
     ):
         # Prepare paths for results
         results_path = base_path / calibration / run / "mermin" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         try:
             # Extract description only once (from left side)
             if label == "left":
-                context["mermin_description"] = fl.extract_description(results_path)
-
-            context[label][f"plot_mermin"] = pl.mermin_plot(
-                raw_data=results_path,
-                expname=f"mermin_{calibration}_{run}",
-                output_path="build/",
-            )
+                context["mermin_description"] = fl.extract_description(results_path, store=store)
+
+            if overlay is None:
+                context[label][f"plot_mermin"] = plot_executor.submit(
+                    cfg,
+                    "mermin_plot",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    expname=f"mermin_{calibration}_{run}",
+                    output_path=build_path(cfg, ""),
+                )
             # Extract runtime and qubits used
-            context[label][f"mermin_runtime"] = fl.extract_runtime(results_path)
-            context[label][f"mermin_qubits"] = fl.extract_qubits_used(results_path)
+            context[label][f"mermin_runtime"] = fl.extract_runtime(results_path, store=store)
+            context[label][f"mermin_qubits"] = fl.extract_qubits_used(results_path, store=store)
         except Exception as e:
             logging.warning(f"Using placeholder for Mermin plot due to an error: {e}")
             context[label][f"plot_mermin"] = "placeholder.png"
@@ -257,6 +417,11 @@ def context_mermin_table(context, cfg):
 def context_grover2q_plots(context, cfg):
     """Prepare Grover 2Q plots and data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(
+        cfg, "plot_frequencies_overlay", "grover2q", title="Grover - 2 qubits"
+    )
+    if overlay is not None:
+        context["plot_grover2q_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -265,22 +430,28 @@ def context_grover2q_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "grover2q" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
-            context["grover2q_description"] = fl.extract_description(results_path)
+            context["grover2q_description"] = fl.extract_description(results_path, store=store)
 
         # Generate Grover 2Q plot
         try:
-            context[label]["plot_grover2q"] = pl.plot_grover(
-                raw_data=results_path,
-                expname=f"grover2q_{calibration}_{run}",
-                output_path="build/",
-            )
+            if overlay is None:
+                context[label]["plot_grover2q"] = plot_executor.submit(
+                    cfg,
+                    "plot_grover",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    expname=f"grover2q_{calibration}_{run}",
+                    output_path=build_path(cfg, ""),
+                )
             # pdb.set_trace()
             # Extract runtime and qubits used
-            context[label]["grover2q_runtime"] = fl.extract_runtime(results_path)
-            context[label]["grover2q_qubits"] = fl.extract_qubits_used(results_path)
+            context[label]["grover2q_runtime"] = fl.extract_runtime(results_path, store=store)
+            context[label]["grover2q_qubits"] = fl.extract_qubits_used(results_path, store=store)
         except Exception:
             context[label]["plot_grover2q"] = "placeholder.png"
 
@@ -295,6 +466,11 @@ def context_grover2q_plots(context, cfg):
 def context_grover3q_plots(context, cfg):
     """Prepare Grover 3Q plots and data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(
+        cfg, "plot_frequencies_overlay", "grover3q", title="Grover - 3 qubits"
+    )
+    if overlay is not None:
+        context["plot_grover3q_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -303,22 +479,28 @@ def context_grover3q_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "grover3q" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description (same for both sides — can store once)
         if label == "left":
-            context["grover3q_description"] = fl.extract_description(results_path)
+            context["grover3q_description"] = fl.extract_description(results_path, store=store)
 
         # Generate Grover 3Q plot
         try:
-            context[label]["plot_grover3q"] = pl.plot_grover(
-                raw_data=results_path,
-                expname=f"grover3q_{calibration}_{run}",
-                output_path="build/",
-            )
+            if overlay is None:
+                context[label]["plot_grover3q"] = plot_executor.submit(
+                    cfg,
+                    "plot_grover",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    expname=f"grover3q_{calibration}_{run}",
+                    output_path=build_path(cfg, ""),
+                )
 
             # Extract runtime and qubits used
-            context[label]["grover3q_runtime"] = fl.extract_runtime(results_path)
-            context[label]["grover3q_qubits"] = fl.extract_qubits_used(results_path)
+            context[label]["grover3q_runtime"] = fl.extract_runtime(results_path, store=store)
+            context[label]["grover3q_qubits"] = fl.extract_qubits_used(results_path, store=store)
         except Exception:
             context[label]["plot_grover3q"] = "placeholder.png"
 
@@ -332,6 +514,11 @@ def context_grover3q_plots(context, cfg):
 def context_ghz_plots(context, cfg):
     """Prepare GHZ plots and data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(
+        cfg, "plot_frequencies_overlay", "ghz", title="GHZ state preparation"
+    )
+    if overlay is not None:
+        context["plot_ghz_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -340,29 +527,35 @@ def context_ghz_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "ghz" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
-            context["ghz_description"] = fl.extract_description(results_path)
+            context["ghz_description"] = fl.extract_description(results_path, store=store)
 
         # Generate GHZ plot
         try:
-            context[label]["plot_ghz"] = pl.plot_ghz(
-                raw_data=results_path,
-                experiment_name=calibration,
-                output_path=os.path.join(
-                        "build",
-                        "ghz",
-                        calibration,
-                        run,
-                    ),
-            )
+            if overlay is None:
+                context[label]["plot_ghz"] = plot_executor.submit(
+                    cfg,
+                    "plot_ghz",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    experiment_name=calibration,
+                    output_path=build_path(
+                            cfg,
+                            "ghz",
+                            calibration,
+                            run,
+                        ),
+                )
         except Exception:
             context[label]["plot_ghz"] = "placeholder.png"
 
         # Extract runtime and qubits used
-        context[label]["ghz_runtime"] = fl.extract_runtime(results_path)
-        context[label]["ghz_qubits"] = fl.extract_qubits_used(results_path)
+        context[label]["ghz_runtime"] = fl.extract_runtime(results_path, store=store)
+        context[label]["ghz_qubits"] = fl.extract_qubits_used(results_path, store=store)
 
     context["ghz_plot_is_set"] = True
     logging.info("Added GHZ plots to context")
@@ -380,26 +573,38 @@ def context_process_tomography_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "process_tomography" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
             context["process_tomography_description"] = fl.extract_description(
-                results_path
+                results_path, store=store
             )
 
-        # Generate Process Tomography plot
-        try:
-            context[label]["plot_process_tomography"] = pl.plot_process_tomography(
-                calid=calibration,
-                runid=run,
-                output_path=os.path.join("build", "process_tomography", calibration, run),
-            )
-        except Exception as e:
-            logging.error(f"Error generating Process Tomography plot for {label}: {e}")
-            context[label]["plot_process_tomography"] = "placeholder.png"
+        # One tile per gate matrix, drawn in parallel and cached separately
+        matrices_dir = base_path / calibration / run / "process_tomography" / "matrices"
+        tiles = []
+        for matrix_file in sorted(matrices_dir.glob("*.npy")):
+            try:
+                tiles.append(
+                    plot_executor.submit(
+                        cfg,
+                        "plot_process_tomography_gate",
+                        inputs=[matrix_file],
+                        matrix_file=str(matrix_file),
+                        calid=calibration,
+                        output_path=build_path(cfg, "process_tomography", calibration, run),
+                    )
+                )
+            except Exception as e:
+                logging.error(
+                    f"Error generating Process Tomography plot {matrix_file.name} for {label}: {e}"
+                )
+                tiles.append("placeholder.png")
+        context[label]["plot_process_tomography"] = tiles or ["placeholder.png"]
 
         # Extract runtime
-        context[label]["process_tomography_runtime"] = fl.extract_runtime(results_path)
+        context[label]["process_tomography_runtime"] = fl.extract_runtime(results_path, store=store)
 
     context["process_tomography_plot_is_set"] = True
     logging.info("Added Process Tomography plots to context")
@@ -424,9 +629,12 @@ def context_tomography_plots(context, cfg):
 
         # Generate Tomography plot
         try:
-            context[label]["plot_tomography"] = pl.plot_tomography(
+            context[label]["plot_tomography"] = plot_executor.submit(
+                cfg,
+                "plot_tomography",
+                inputs=[results_path],
                 raw_data=results_path,
-                output_path=os.path.join("build", "tomography", calibration, run),
+                output_path=build_path(cfg, "tomography", calibration, run),
             )
         except Exception as e:
             logging.error(f"Error generating Tomography plot for {label}")
@@ -448,11 +656,12 @@ def context_reuploading_classifier_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "reuploading_classifier" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
             context["reuploading_classifier_description"] = fl.extract_description(
-                results_path
+                results_path, store=store
             )
 
         # import pdb
@@ -460,11 +669,15 @@ def context_reuploading_classifier_plots(context, cfg):
         # Generate Reuploading Classifier plot
         try:
             context[label]["plot_reuploading_classifier"] = (
-                pl.plot_reuploading_classifier(
+                plot_executor.submit(
+                    cfg,
+                    "plot_reuploading_classifier",
+                    inputs=[results_path],
+                    store=store,
                     raw_data=results_path,
                     exp_name=calibration,
-                    output_path=os.path.join(
-                        "build",
+                    output_path=build_path(
+                        cfg,
                         "reuploading_classifier",
                         calibration,
                     ),
@@ -475,10 +688,10 @@ def context_reuploading_classifier_plots(context, cfg):
 
         # Extract runtime and qubits used
         context[label]["reuploading_classifier_runtime"] = fl.extract_runtime(
-            results_path
+            results_path, store=store
         )
         context[label]["reuploading_classifier_qubits"] = fl.extract_qubits_used(
-            results_path
+            results_path, store=store
         )
 
     context["reuploading_classifier_plot_is_set"] = True
@@ -486,9 +699,45 @@ def context_reuploading_classifier_plots(context, cfg):
     return context
 
 
+def context_reuploading_plots(context, cfg):
+    """Prepare the epoch series of the data reuploading training."""
+    base_path = Path(cfg.base_dir)
+
+    for label, calibration, run in zip(
+        ["left", "right"],
+        [cfg.calibration_left, cfg.calibration_right],
+        [cfg.run_left, cfg.run_right],
+    ):
+        results_path = base_path / calibration / run / "reuploading" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
+
+        # Extract description only once (from left side)
+        if label == "left":
+            context["reuploading_description"] = fl.extract_description(results_path, store=store)
+
+        # One multi-page PDF per run: a page of epochs at a time, then the summary
+        context[label]["plot_reuploading"] = plot_executor.submit(
+            cfg,
+            "do_plot_reuploading",
+            inputs=[results_path],
+            store=store,
+            raw_data=results_path,
+            expname=f"{calibration}_{run}",
+            output_path=build_path(cfg, "reuploading", calibration, run),
+        )
+        context[label]["reuploading_runtime"] = fl.extract_runtime(results_path, store=store)
+
+    context["reuploading_plot_is_set"] = True
+    logging.info("Added Reuploading plots to context")
+    return context
+
+
 def context_qft_plots(context, cfg):
     """Prepare QFT plots and data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(cfg, "plot_frequencies_overlay", "qft", title="QFT")
+    if overlay is not None:
+        context["plot_qft_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -497,28 +746,34 @@ def context_qft_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "qft" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
-            context["qft_description"] = fl.extract_description(results_path)
+            context["qft_description"] = fl.extract_description(results_path, store=store)
 
         # Generate QFT plot
         try:
-            context[label]["plot_qft"] = pl.plot_qft(
-                raw_data=results_path,
-                expname=f"qft_{calibration}_{run}",
-                output_path=os.path.join(
-                        "build",
-                        "qft",
-                        calibration,
-                    ),
-            )
+            if overlay is None:
+                context[label]["plot_qft"] = plot_executor.submit(
+                    cfg,
+                    "plot_qft",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    expname=f"qft_{calibration}_{run}",
+                    output_path=build_path(
+                            cfg,
+                            "qft",
+                            calibration,
+                        ),
+                )
         except Exception:
             context[label]["plot_qft"] = "placeholder.png"
 
         # Extract runtime and qubits used
-        context[label]["qft_runtime"] = fl.extract_runtime(results_path)
-        context[label]["qft_qubits"] = fl.extract_qubits_used(results_path)
+        context[label]["qft_runtime"] = fl.extract_runtime(results_path, store=store)
+        context[label]["qft_qubits"] = fl.extract_qubits_used(results_path, store=store)
 
     context["qft_plot_is_set"] = True
     logging.info("Added QFT plots to context")
@@ -537,28 +792,32 @@ def context_yeast_4q_plots(context, cfg):
         os.path.join("data", "qml_4Q_yeast", cfg.calibration_right, "results.json")
     )
     context["yeast_classification_4q_plot_is_set"] = True
-    context["plot_yeast_4q"] = pl.plot_qml(
+    context["plot_yeast_4q"] = plot_executor.submit(
+        cfg,
+        "plot_qml",
+        inputs=[os.path.join("data", "qml_4Q_yeast", cfg.calibration_left, "results.json")],
         raw_data=os.path.join(
             "data", "qml_4Q_yeast", cfg.calibration_left, "results.json"
         ),
         expname=f"4q_yeast_{cfg.calibration_left}_{run}",
-        output_path=os.path.join("build", "yeast", cfg.calibration_left, cfg.run_left),
+        output_path=build_path(cfg, "yeast", cfg.calibration_left, cfg.run_left),
     )
-    context["plot_yeast_4q_right"] = pl.plot_qml(
+    context["plot_yeast_4q_right"] = plot_executor.submit(
+        cfg,
+        "plot_qml",
+        inputs=[os.path.join("data", "qml_4Q_yeast", cfg.calibration_right, "results.json")],
         raw_data=os.path.join(
             "data", "qml_4Q_yeast", cfg.calibration_right, "results.json"
         ),
         expname=f"4q_yeast_{cfg.calibration_right}_{run}",
-        output_path=os.path.join("build", "yeast", cfg.calibration_right, cfg.run_right),
+        output_path=build_path(cfg, "yeast", cfg.calibration_right, cfg.run_right),
     )
     logging.info("Added Yeast classification 4q plots to context")
     return context
 
 
 def context_yeast_3q_plots(context, cfg, dataset):
-    """Prepare Yeast 3Q classification plots and data."""
-    context["yeast_classification_3q_plot_is_set"] = True
-
+    """Prepare the 3Q classification plots and data of ``dataset`` (yeast or statlog)."""
     for label, calibration, run in zip(
         ["left", "right"],
         [cfg.calibration_left, cfg.calibration_right],
@@ -567,16 +826,17 @@ def context_yeast_3q_plots(context, cfg, dataset):
         results_path = os.path.join(
             "data", calibration, run, f"qml_3q_{dataset}", "results.json"
         )
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract accuracy and format to 2 decimal places
-        accuracy = fl.get_qml_accuracy(results_path)
+        accuracy = fl.get_qml_accuracy(results_path, store=store)
         context[label][f"{dataset}_3q_accuracy"] = f"{accuracy:.2f}"
 
         # Extract runtime/duration
-        context[label][f"{dataset}_3q_duration"] = fl.extract_runtime(results_path)
+        context[label][f"{dataset}_3q_duration"] = fl.extract_runtime(results_path, store=store)
 
         # Extract qubits used and format as comma-separated string if it's a list
-        qubits_used = fl.extract_qubits_used(results_path)
+        qubits_used = fl.extract_qubits_used(results_path, store=store)
         if isinstance(qubits_used, list):
             context[label][f"{dataset}_3q_qubits"] = ", ".join(map(str, qubits_used))
         else:
@@ -584,22 +844,25 @@ def context_yeast_3q_plots(context, cfg, dataset):
 
         # Extract description only once (from left side)
         if label == "left":
-            context[label][f"{dataset}_3q_description"] = fl.extract_description(results_path)
+            context[label][f"{dataset}_3q_description"] = fl.extract_description(results_path, store=store)
 
         # Generate plot
         try:
-            context[label][f"plot_{dataset}_3q"] = pl.plot_qml(
+            context[label][f"plot_{dataset}_3q"] = plot_executor.submit(
+                cfg,
+                "plot_qml",
+                inputs=[results_path],
+                store=store,
                 raw_data=results_path,
                 expname=f"3q_{dataset}_{calibration}_{run}",
-                output_path=os.path.join("build", dataset, calibration, run),
+                output_path=build_path(cfg, dataset, calibration, run),
             )
         except Exception as e:
             print(f"Error generating {dataset} 3q plot for {label}: {e}")
             context[label][f"plot_{dataset}_3q"] = "placeholder.png"
 
-    logging.info("Added Yeast classification 3q plots to context")
-    # import pdb
-    # pdb.set_trace()
+    context[f"{dataset}_classification_3q_plot_is_set"] = True
+    logging.info(f"Added {dataset} classification 3q plots to context")
     return context
 
 
@@ -621,11 +884,14 @@ def context_statlog_4q_plots(context, cfg):
 
         # Generate StatLog 4Q plot
         try:
-            context[label]["plot_statlog_4q"] = pl.plot_qml(
+            context[label]["plot_statlog_4q"] = plot_executor.submit(
+                cfg,
+                "plot_qml",
+                inputs=[results_path],
                 raw_data=results_path,
                 expname=f"4q_statlog_{calibration}_{run}",
-                output_path=os.path.join(
-                    "build",
+                output_path=build_path(
+                    cfg,
                     "statlog",
                     calibration,
                     run,
@@ -643,49 +909,14 @@ def context_statlog_4q_plots(context, cfg):
     return context
 
 
-def context_statlog_3q_plots(context, cfg):
-    """Prepare StatLog 3Q classification plots and data."""
-    base_path = Path(cfg.base_dir)
-
-    for label, calibration, run in zip(
-        ["left", "right"],
-        [cfg.calibration_left, cfg.calibration_right],
-        [cfg.run_left, cfg.run_right],
-    ):
-        # Prepare path for results
-        results_path = base_path / calibration / "qml_3q_statlog" / "results.json"
-
-        # Extract description only once (from left side)
-        if label == "left":
-            context["statlog_3q_description"] = fl.extract_description(results_path)
-
-        try:
-            context[label]["plot_statlog_3q"] = pl.plot_qml(
-                raw_data=results_path,
-                expname=f"3q_statlog_{calibration}_{run}",
-                output_path=os.path.join(
-                    "build",
-                    "statlog",
-                    calibration,
-                    run,
-                ),
-            )
-        except Exception:
-            context[label]["plot_statlog_3q"] = "placeholder.png"
-
-        # Extract runtime, accuracy and qubits used
-        context[label]["statlog_3q_runtime"] = fl.extract_runtime(results_path)
-        context[label]["statlog_3q_accuracy"] = fl.get_qml_accuracy(results_path)
-        context[label]["statlog_3q_qubits"] = fl.extract_qubits_used(results_path)
-
-    context["statlog_classification_3q_plot_is_set"] = True
-    logging.info("Added StatLog classification 3q plots to context")
-    return context
-
-
 def context_amplitude_encoding_plots(context, cfg):
     """Prepare Amplitude Encoding plots and data."""
     base_path = Path(cfg.base_dir)
+    overlay = overlay_plot(
+        cfg, "plot_frequencies_overlay", "amplitude_encoding", title="Amplitude Encoding"
+    )
+    if overlay is not None:
+        context["plot_amplitude_encoding_overlay"] = overlay
 
     for label, calibration, run in zip(
         ["left", "right"],
@@ -694,32 +925,38 @@ def context_amplitude_encoding_plots(context, cfg):
     ):
         # Prepare path for results
         results_path = base_path / calibration / run / "amplitude_encoding" / "results.json"
+        store = RunStore.for_run(cfg.base_dir, calibration, run)
 
         # Extract description only once (from left side)
         if label == "left":
             context["amplitude_encoding_description"] = fl.extract_description(
-                results_path
+                results_path, store=store
             )
 
         # Generate Amplitude Encoding plot
         try:
-            context[label]["plot_amplitude_encoding"] = pl.plot_amplitude_encoding(
-                raw_data=results_path,
-                expname=f"amplitude_encoding_{calibration}_{run}",
-                output_path=os.path.join(
-                        "build",
-                        "amplitude_encoding",
-                        calibration,
-                        run,
-                    ),
-            )
+            if overlay is None:
+                context[label]["plot_amplitude_encoding"] = plot_executor.submit(
+                    cfg,
+                    "plot_amplitude_encoding",
+                    inputs=[results_path],
+                    store=store,
+                    raw_data=results_path,
+                    expname=f"amplitude_encoding_{calibration}_{run}",
+                    output_path=build_path(
+                            cfg,
+                            "amplitude_encoding",
+                            calibration,
+                            run,
+                        ),
+                )
         except Exception:
             context[label]["plot_amplitude_encoding"] = "placeholder.png"
 
         # Extract runtime and qubits used
-        context[label]["amplitude_encoding_runtime"] = fl.extract_runtime(results_path)
+        context[label]["amplitude_encoding_runtime"] = fl.extract_runtime(results_path, store=store)
         context[label]["amplitude_encoding_qubits"] = fl.extract_qubits_used(
-            results_path
+            results_path, store=store
         )
 
     context["amplitude_encoding_plot_is_set"] = True
@@ -0,0 +1,122 @@
+"""
+Render profiles: output format, resolution and rasterization of the plots.
+
+A profile is chosen per build with ``--render-profile``:
+
+- ``print`` (default) keeps the settings of every plot function: vector PDFs
+  (``dpi=300`` where a plot asks for it) and the Mermin PNG. Used for the
+  weekly archive.
+- ``web`` keeps the formats but rasterizes dense artists (scatter points,
+  qubit markers, ``imshow`` images) inside the PDFs at 150 DPI, which makes
+  the report much lighter to download and display.
+- ``draft`` writes every plot as a 72 DPI PNG, for quick previews from the
+  web UI.
+
+With ``--thumbnails`` any profile also writes a low resolution PNG next to
+every plot, ``<name>.thumb.png`` (see ``thumbnail_path``), rasterized from
+the same figure right after it is saved. The web UI lists them as previews.
+
+``plot_cache.render`` activates the profile of the build around every plot
+call and makes it part of the cache key; ``plots.savefig`` applies it. This
+module does not import matplotlib at import time so that cache hits stay
+cheap.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+VECTOR_FORMATS = {"pdf", "svg", "eps", "ps"}
+
+# Resolution of the thumbnails: a 6.4 x 4.8 inch figure becomes 192 x 144 px.
+THUMBNAIL_DPI = 30
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """How plots are written to disk."""
+
+    name: str
+    # Output format forced on every plot, None keeps the format of each plot.
+    format: str = None
+    # Resolution forced on every plot, None keeps the DPI each plot asks for.
+    dpi: int = None
+    # Dense artists rasterized in vector outputs: "scatter" and/or "image".
+    rasterize: tuple = ()
+    # Resolution of the PNG thumbnail written next to every plot, None
+    # writes no thumbnail.
+    thumbnail_dpi: int = None
+
+    def is_vector(self, path, kwargs):
+        """Return whether a plot saved to ``path`` with ``kwargs`` is a vector file."""
+        fmt = self.format or kwargs.get("format") or Path(path).suffix.lstrip(".")
+        return fmt.lower() in VECTOR_FORMATS
+
+    def output_path(self, path):
+        """Return ``path`` with the suffix of the forced format, if any."""
+        if self.format is None:
+            return str(path)
+        return str(Path(path).with_suffix("." + self.format))
+
+    def savefig_kwargs(self, kwargs):
+        """Return the ``Figure.savefig`` arguments of a plot under this profile."""
+        kwargs = dict(kwargs)
+        if self.format is not None:
+            kwargs["format"] = self.format
+        if self.dpi is not None:
+            kwargs["dpi"] = self.dpi
+        return kwargs
+
+
+PROFILES = {
+    "draft": RenderProfile("draft", format="png", dpi=72),
+    "web": RenderProfile("web", dpi=150, rasterize=("scatter", "image")),
+    "print": RenderProfile("print"),
+}
+
+DEFAULT_PROFILE = "print"
+
+_current = contextvars.ContextVar("render_profile", default=PROFILES[DEFAULT_PROFILE])
+
+
+def get_profile(cfg):
+    """Return the profile selected by ``cfg.render_profile`` and ``cfg.thumbnails``."""
+    profile = PROFILES[getattr(cfg, "render_profile", None) or DEFAULT_PROFILE]
+    if getattr(cfg, "thumbnails", False):
+        profile = replace(profile, thumbnail_dpi=THUMBNAIL_DPI)
+    return profile
+
+
+def thumbnail_path(path):
+    """Return the path of the thumbnail of the plot saved to ``path``."""
+    return str(Path(path).with_suffix(".thumb.png"))
+
+
+def current():
+    """Return the profile active in this thread."""
+    return _current.get()
+
+
+@contextmanager
+def use(profile):
+    """Make ``profile`` the active profile of the enclosed block, in this thread."""
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def rasterize_dense(fig, kinds):
+    """Rasterize the scatter collections and/or images of every axes of ``fig``."""
+    from matplotlib.collections import PathCollection
+
+    for ax in fig.axes:
+        if "image" in kinds:
+            for image in ax.images:
+                image.set_rasterized(True)
+        if "scatter" in kinds:
+            for collection in ax.collections:
+                if isinstance(collection, PathCollection):
+                    collection.set_rasterized(True)
@@ -0,0 +1,180 @@
+"""
+Parsed results of a benchmark run.
+
+Every experiment of a run under ``data/<cal>/<run>`` is read by several
+fillers (description, runtime, qubits used, accuracy) and by its plot
+function. A ``RunStore`` parses each file once and hands out the parsed
+object to all of them. Parsed files are kept in a process-wide LRU bounded by
+the size of the files on disk, so a long-lived process comparing many runs
+does not grow without limit.
+
+Results files listed in ``SELECTIONS`` are only partially built: the store
+returns the subset of the document the report uses (see ``streamjson``).
+
+The objects returned are shared between callers and must be treated as
+read-only. Stores can be used from several threads (the plot executor loads
+results from its threads): a thread asking for a file another thread is
+parsing waits for that parse instead of starting its own.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from fnmatch import fnmatch
+from pathlib import Path
+
+import streamjson
+import tracing
+
+# Upper bound on the total size (on disk) of the parsed files kept in memory.
+# The parsed objects are a few times larger than the files they come from.
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Parts of the QML classification results read by the fillers and plot_qml.
+# The per-sample circuit data (noiseless_experiment_ios, RP000, the state
+# tomography in verification_ios) makes up most of the file and is skipped.
+QML_SELECTION = {
+    "accuracy": True,
+    "description": True,
+    "runtime": True,
+    "qubits_used": True,
+    "NQCH": {"*": {"predicted_label": True, "is_correct": True}, "_statistics": True},
+    "verification_ios": {"*": {"predicted_label": True}},
+}
+
+# Experiment directory pattern -> selection applied to its results.json.
+SELECTIONS = {
+    "qml_3q_*": QML_SELECTION,
+}
+
+_parsed = OrderedDict()
+_parsed_bytes = 0
+# Key -> future of the parse in progress, see ``RunStore.load``.
+_parsing = {}
+_stores = {}
+_lock = threading.RLock()
+
+
+def _remember(key, size, value):
+    """Insert a parsed file in the LRU and evict the oldest ones over budget."""
+    global _parsed_bytes
+    if size > MAX_CACHE_BYTES:
+        return
+    if key in _parsed:
+        _parsed_bytes -= _parsed.pop(key)[0]
+    _parsed[key] = (size, value)
+    _parsed_bytes += size
+    while _parsed_bytes > MAX_CACHE_BYTES:
+        _, (old_size, _) = _parsed.popitem(last=False)
+        _parsed_bytes -= old_size
+
+
+def clear_cache():
+    """Drop every parsed file and every store of this process."""
+    global _parsed_bytes
+    with _lock:
+        _parsed.clear()
+        _parsed_bytes = 0
+        _stores.clear()
+
+
+class RunStore:
+    """Parse-once access to the files of ``<base_dir>/<calibration>/<run>``."""
+
+    def __init__(self, base_dir, calibration, run):
+        self.base_dir = Path(base_dir)
+        self.calibration = calibration
+        self.run = run
+        self.run_dir = self.base_dir / calibration / run
+
+    @classmethod
+    def for_run(cls, base_dir, calibration, run):
+        """Return the store of a run, shared by every caller in this process."""
+        key = (str(base_dir), calibration, run)
+        with _lock:
+            if key not in _stores:
+                _stores[key] = cls(base_dir, calibration, run)
+            return _stores[key]
+
+    def path(self, experiment, filename="results.json"):
+        """Return the path of a file of one experiment of the run."""
+        return self.run_dir / experiment / filename
+
+    def results(self, experiment):
+        """Return the parsed ``results.json`` of an experiment of the run."""
+        return self.load(self.path(experiment))
+
+    def selection(self, path):
+        """Return the ``SELECTIONS`` entry that applies to ``path``, or True."""
+        path = Path(path)
+        if path.name == "results.json":
+            for pattern, selection in SELECTIONS.items():
+                if fnmatch(path.parent.name, pattern):
+                    return selection
+        return True
+
+    def load(self, path, selection=None):
+        """
+        Return the parsed content of a JSON file, parsing it at most once.
+
+        Args:
+            path: Path of the JSON file.
+            selection: Parts of the document to build, see ``streamjson``.
+                Defaults to the ``SELECTIONS`` entry of the file; ``True``
+                builds the whole document.
+
+        The file is identified by its resolved path, size and modification
+        time, so a file rewritten on disk is parsed again. Concurrent loads
+        of the same file wait for a single parse.
+        """
+        path = Path(path)
+        if selection is None:
+            selection = self.selection(path)
+        stat = path.stat()
+        key = (
+            str(path.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            json.dumps(selection, sort_keys=True),
+        )
+        with _lock:
+            if key in _parsed:
+                with tracing.span("load_json (cached)", "json", path=path):
+                    _parsed.move_to_end(key)
+                    return _parsed[key][1]
+            parsing = _parsing.get(key)
+            if parsing is None:
+                future = _parsing[key] = Future()
+        if parsing is not None:
+            with tracing.span("load_json (waiting)", "json", path=path):
+                return parsing.result()
+
+        try:
+            with tracing.span("load_json", "json", path=path, selected=selection is not True):
+                if selection is True:
+                    with open(path, "r") as f:
+                        value = json.load(f)
+                else:
+                    value = streamjson.load_selected(path, selection)
+        except Exception as e:
+            with _lock:
+                del _parsing[key]
+            future.set_exception(e)
+            raise
+        logging.debug(f"Parsed {path} ({stat.st_size} bytes)")
+        with _lock:
+            _remember(key, stat.st_size, value)
+            del _parsing[key]
+        future.set_result(value)
+        return value
+
+
+def load_json(path, store=None):
+    """Load a JSON file through ``store`` when one is given, else directly."""
+    if store is not None:
+        return store.load(path)
+    with tracing.span("load_json", "json", path=path):
+        with open(path, "r") as f:
+            return json.load(f)
@@ -0,0 +1,324 @@
+"""
+Declarative registry of report sections.
+
+Each ``Section`` names the ``context_*`` function that fills it and declares
+what it reads and writes:
+
+- ``inputs``: files the section reads, as path templates relative to
+  ``cfg.base_dir`` with ``{calibration}`` and ``{run}`` placeholders (globs
+  are allowed). The scheduler checks them before doing any work.
+  ``optional_inputs`` are read when present but never cause a skip.
+- ``outputs`` / ``side_outputs`` / ``plots``: the top-level context keys, the
+  per-side context keys and the per-side keys holding plot file paths.
+  ``overlay_plot`` is the top-level key of the single left/right figure the
+  section draws instead with ``--overlay``.
+- ``requires``: context keys the section reads from other sections
+  (``"{side}.<key>"`` for per-side keys). They become the edges of the
+  scheduling DAG.
+- ``fallback``: the values merged into the context when the section is
+  disabled, its inputs are missing or it raises.
+
+Adding an experiment to the report means adding one entry to ``SECTIONS``;
+its ``--no-<toggle>`` command line flag is generated from the entry.
+"""
+
+from dataclasses import dataclass, field
+
+from prepare_context import (
+    context_version_extractor,
+    context_t1_statistics,
+    context_t2_statistics,
+    context_fidelity_statistics,
+    context_readout_fidelity_statistics,
+    context_fidelity_plots_and_table,
+    context_mermin_plots,
+    context_grover2q_plots,
+    context_grover3q_plots,
+    context_ghz_plots,
+    context_process_tomography_plots,
+    context_reuploading_classifier_plots,
+    context_reuploading_plots,
+    context_qft_plots,
+    context_yeast_3q_plots,
+    context_amplitude_encoding_plots,
+)
+
+RUN_DIR = "{calibration}/{run}"
+CALIBRATION_JSON = "calibrations/{calibration}/sinq20/calibration.json"
+
+EMPTY_STAT = {
+    key: "N/A"
+    for key in [
+        "average",
+        "min",
+        "max",
+        "median",
+        "average_change",
+        "min_change",
+        "max_change",
+        "median_change",
+    ]
+}
+
+
+@dataclass(frozen=True)
+class Section:
+    """A report section and the data it declares."""
+
+    name: str
+    func: object
+    toggle: str = None
+    args: tuple = ()
+    inputs: tuple = ()
+    optional_inputs: tuple = ()
+    # "all": every side needs its inputs, "any": one side is enough because
+    # the section draws a placeholder for the other one.
+    require: str = "all"
+    requires: tuple = ()
+    outputs: tuple = ()
+    side_outputs: tuple = ()
+    plots: tuple = ()
+    overlay_plot: str = None
+    fallback: dict = field(default_factory=dict)
+
+    @property
+    def flag(self):
+        """Command line flag that disables the section, if it has a toggle."""
+        if self.toggle is None:
+            return None
+        return "--no-" + self.toggle.replace("_", "-")
+
+
+def both_sides(values):
+    """Return a fallback that sets the same per-side values on left and right."""
+    return {side: dict(values) for side in ("left", "right")}
+
+
+SECTIONS = [
+    Section(
+        name="metadata",
+        func=context_version_extractor,
+        inputs=(RUN_DIR + "/version_extractor/results.json",),
+        side_outputs=(
+            "device",
+            "calibration_id",
+            "calibration_date",
+            "calibration_note",
+            "versions",
+            "run_id",
+            "run_date",
+            "run_note",
+        ),
+        fallback=both_sides(
+            {
+                "experiment_name": "Unknown",
+                "platform": "Unknown",
+                "start_time": "Unknown",
+                "end_time": "Unknown",
+            }
+        ),
+    ),
+    Section(
+        name="T1 statistics",
+        func=context_t1_statistics,
+        inputs=(CALIBRATION_JSON,),
+        side_outputs=("stat_t1",),
+        fallback=both_sides({"stat_t1": EMPTY_STAT}),
+    ),
+    Section(
+        name="T2 statistics",
+        func=context_t2_statistics,
+        inputs=(CALIBRATION_JSON,),
+        side_outputs=("stat_t2",),
+        fallback=both_sides({"stat_t2": EMPTY_STAT}),
+    ),
+    Section(
+        name="fidelity statistics",
+        func=context_fidelity_statistics,
+        inputs=(CALIBRATION_JSON,),
+        side_outputs=("stat_fidelity",),
+        fallback=both_sides({"stat_fidelity": EMPTY_STAT}),
+    ),
+    Section(
+        name="readout fidelity statistics",
+        func=context_readout_fidelity_statistics,
+        inputs=(CALIBRATION_JSON,),
+        side_outputs=("stat_readout_fidelity",),
+        fallback=both_sides({"stat_readout_fidelity": EMPTY_STAT}),
+    ),
+    Section(
+        name="fidelity plots",
+        func=context_fidelity_plots_and_table,
+        inputs=(CALIBRATION_JSON, RUN_DIR + "/bell_tomography/results.json"),
+        require="any",
+        side_outputs=("best_qubits", "fidelities_list"),
+        plots=("plot_fidelity",),
+        overlay_plot="plot_fidelity_delta",
+        fallback=both_sides(
+            {
+                "plot_fidelity": "placeholder.png",
+                "best_qubits": {
+                    k: {"qubits": "N/A", "fidelity": "N/A"} for k in ["2", "3", "4", "5"]
+                },
+                "fidelities_list": [],
+            }
+        ),
+    ),
+    Section(
+        name="Mermin plots",
+        func=context_mermin_plots,
+        toggle="mermin_plot",
+        inputs=(RUN_DIR + "/mermin/results.json",),
+        require="any",
+        outputs=("mermin_description", "mermin_plot_is_set"),
+        side_outputs=("mermin_runtime", "mermin_qubits"),
+        plots=("plot_mermin",),
+        overlay_plot="plot_mermin_overlay",
+        fallback={"mermin_plot_is_set": None},
+    ),
+    Section(
+        name="Grover 2Q plots",
+        func=context_grover2q_plots,
+        toggle="grover2q_plot",
+        inputs=(RUN_DIR + "/grover2q/results.json",),
+        require="any",
+        outputs=("grover2q_description", "grover2q_plot_is_set"),
+        side_outputs=("grover2q_runtime", "grover2q_qubits"),
+        plots=("plot_grover2q",),
+        overlay_plot="plot_grover2q_overlay",
+        fallback={"grover2q_plot_is_set": None},
+    ),
+    Section(
+        name="Grover 3Q plots",
+        func=context_grover3q_plots,
+        toggle="grover3q_plot",
+        inputs=(RUN_DIR + "/grover3q/results.json",),
+        require="any",
+        outputs=("grover3q_description", "grover3q_plot_is_set"),
+        side_outputs=("grover3q_runtime", "grover3q_qubits"),
+        plots=("plot_grover3q",),
+        overlay_plot="plot_grover3q_overlay",
+        fallback={"grover3q_plot_is_set": None},
+    ),
+    Section(
+        name="GHZ plots",
+        func=context_ghz_plots,
+        toggle="ghz_plot",
+        inputs=(RUN_DIR + "/ghz/results.json",),
+        outputs=("ghz_description", "ghz_plot_is_set"),
+        side_outputs=("ghz_runtime", "ghz_qubits"),
+        plots=("plot_ghz",),
+        overlay_plot="plot_ghz_overlay",
+        fallback={"ghz_plot_is_set": None},
+    ),
+    Section(
+        name="Process Tomography plots",
+        func=context_process_tomography_plots,
+        toggle="process_tomography_plot",
+        inputs=(RUN_DIR + "/process_tomography/results.json",),
+        optional_inputs=(RUN_DIR + "/process_tomography/matrices/*.npy",),
+        outputs=("process_tomography_description", "process_tomography_plot_is_set"),
+        side_outputs=("process_tomography_runtime",),
+        plots=("plot_process_tomography",),
+        fallback={"process_tomography_plot_is_set": None},
+    ),
+    Section(
+        name="Reuploading Classifier plots",
+        func=context_reuploading_classifier_plots,
+        toggle="reuploading_classifier_plot",
+        inputs=(RUN_DIR + "/reuploading_classifier/results.json",),
+        outputs=(
+            "reuploading_classifier_description",
+            "reuploading_classifier_plot_is_set",
+        ),
+        side_outputs=("reuploading_classifier_runtime", "reuploading_classifier_qubits"),
+        plots=("plot_reuploading_classifier",),
+        fallback={"reuploading_classifier_plot_is_set": None},
+    ),
+    Section(
+        name="Reuploading plots",
+        func=context_reuploading_plots,
+        toggle="reuploading_plot",
+        inputs=(RUN_DIR + "/reuploading/results.json",),
+        outputs=("reuploading_description", "reuploading_plot_is_set"),
+        side_outputs=("reuploading_runtime",),
+        plots=("plot_reuploading",),
+        fallback={"reuploading_plot_is_set": None},
+    ),
+    Section(
+        name="QFT plots",
+        func=context_qft_plots,
+        toggle="qft_plot",
+        inputs=(RUN_DIR + "/qft/results.json",),
+        outputs=("qft_description", "qft_plot_is_set"),
+        side_outputs=("qft_runtime", "qft_qubits"),
+        plots=("plot_qft",),
+        overlay_plot="plot_qft_overlay",
+        fallback={"qft_plot_is_set": None},
+    ),
+    Section(
+        name="StatLog 3Q plots",
+        func=context_yeast_3q_plots,
+        toggle="statlog_plot_3q",
+        args=("statlog",),
+        inputs=(RUN_DIR + "/qml_3q_statlog/results.json",),
+        outputs=("statlog_classification_3q_plot_is_set",),
+        side_outputs=(
+            "statlog_3q_accuracy",
+            "statlog_3q_duration",
+            "statlog_3q_qubits",
+            "statlog_3q_description",
+        ),
+        plots=("plot_statlog_3q",),
+        fallback={"statlog_classification_3q_plot_is_set": None},
+    ),
+    Section(
+        name="Yeast 3Q plots",
+        func=context_yeast_3q_plots,
+        toggle="yeast_plot_3q",
+        args=("yeast",),
+        inputs=(RUN_DIR + "/qml_3q_yeast/results.json",),
+        outputs=("yeast_classification_3q_plot_is_set",),
+        side_outputs=(
+            "yeast_3q_accuracy",
+            "yeast_3q_duration",
+            "yeast_3q_qubits",
+            "yeast_3q_description",
+        ),
+        plots=("plot_yeast_3q",),
+        fallback={"yeast_classification_3q_plot_is_set": None},
+    ),
+    Section(
+        name="Amplitude Encoding plots",
+        func=context_amplitude_encoding_plots,
+        toggle="amplitude_encoding_plot",
+        inputs=(RUN_DIR + "/amplitude_encoding/results.json",),
+        outputs=("amplitude_encoding_description", "amplitude_encoding_plot_is_set"),
+        side_outputs=("amplitude_encoding_runtime", "amplitude_encoding_qubits"),
+        plots=("plot_amplitude_encoding",),
+        overlay_plot="plot_amplitude_encoding_overlay",
+        fallback={"amplitude_encoding_plot_is_set": None},
+    ),
+]
+
+# Toggles kept for sections that are currently not part of the report, so
+# existing command lines (e.g. the Makefile's --no-tomography-plot) still parse.
+LEGACY_TOGGLES = [
+    "tomography_plot",
+    "yeast_plot_4q",
+    "statlog_plot_4q",
+]
+
+
+def add_section_flags(parser, sections=SECTIONS):
+    """Add a ``--no-<toggle>`` flag for every section that has a toggle."""
+    toggles = [s.toggle for s in sections if s.toggle is not None]
+    for section in sections:
+        if section.toggle is not None:
+            parser.add_argument(section.flag, dest=section.toggle, action="store_false")
+    for toggle in LEGACY_TOGGLES:
+        if toggle not in toggles:
+            parser.add_argument(
+                "--no-" + toggle.replace("_", "-"), dest=toggle, action="store_false"
+            )
+    return parser
@@ -0,0 +1,260 @@
+"""
+Key-selective JSON loading.
+
+``load_selected`` walks a JSON document and only builds the parts named by a
+selection; every other value is skipped by scanning for its closing bracket,
+without creating any Python object for it. The file is read in chunks of
+``CHUNK_SIZE`` characters and only the text of the value being built is kept,
+so peak memory grows with the selected parts rather than with the file. A
+selection is a nested dict:
+
+- ``True`` builds the whole value,
+- a dict selects keys of an object, ``"*"`` matching every key that is not
+  listed explicitly,
+- missing keys (or ``False``) are skipped.
+
+For example ``{"NQCH": {"*": {"predicted_label": True}}}`` only builds the
+predicted label of every NQCH sample.
+"""
+
+import io
+import json
+import re
+from json.decoder import scanstring
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = r'"(?:[^"\\]++|\\.)*+"'
+# Characters of a string up to its closing quote or next escape.
+_STRING_CHARS = re.compile(r'[^"\\]*+')
+# Characters of a number, true, false or null.
+_SCALAR_CHARS = re.compile(r"[^,\]}\s]*+")
+# Characters that change the nesting level of a skipped value.
+_STRUCTURE = re.compile(r'["\[\]{}]')
+
+# Maximum nesting depth skipped by a single regular expression match; deeper
+# values fall back to scanning bracket by bracket.
+SKIP_DEPTH = 8
+
+# Selected objects up to this many characters are decoded whole and filtered.
+SMALL_VALUE = 4096
+
+# Characters read from the file at a time.
+CHUNK_SIZE = 64 * 1024
+
+
+def _container_pattern(depth):
+    """Return a regex matching an array or object nested at most ``depth`` levels."""
+    pattern = r'[\[{](?:[^"\[\]{}]++|' + _STRING + r')*+[\]}]'
+    for _ in range(depth - 1):
+        pattern = r'[\[{](?:[^"\[\]{}]++|' + _STRING + "|" + pattern + r')*+[\]}]'
+    return re.compile(pattern, re.DOTALL)
+
+
+_CONTAINER = _container_pattern(SKIP_DEPTH)
+
+
+class _Reader:
+    """
+    Window over a text file read chunk by chunk.
+
+    ``buf[pos]`` is the next character to parse. Text before ``pos`` is
+    dropped on the next read unless ``mark`` is set, in which case text from
+    ``mark`` on is kept so the value starting there can be decoded.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.mark = None
+
+    def read(self):
+        """Append a chunk to the window, return False at the end of the file."""
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        drop = self.pos if self.mark is None else self.mark
+        self.buf = self.buf[drop:] + chunk
+        self.pos -= drop
+        if self.mark is not None:
+            self.mark -= drop
+        return True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buf, min(self.pos, len(self.buf)))
+
+    def peek(self):
+        """Return the next character, reading more of the file if needed."""
+        while self.pos >= len(self.buf):
+            if not self.read():
+                raise self.error("Unexpected end of data")
+        return self.buf[self.pos]
+
+    def ensure(self, size):
+        """Read until ``size`` characters from ``pos`` are available or the file ends."""
+        while len(self.buf) - self.pos < size and self.read():
+            pass
+
+    def skip_ws(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.read():
+                return
+
+    def at_end(self):
+        self.skip_ws()
+        return self.pos >= len(self.buf)
+
+    def skip_string_tail(self):
+        """Move past the closing quote of the string whose opening quote was read."""
+        while True:
+            self.pos = _STRING_CHARS.match(self.buf, self.pos).end()
+            char = self.peek()
+            if char == '"':
+                self.pos += 1
+                return
+            if char == "\\":
+                # Skip the backslash and the escaped character.
+                self.pos += 1
+                self.peek()
+                self.pos += 1
+
+    def skip_value(self):
+        """Move past the value starting at ``pos``."""
+        char = self.peek()
+        if char == '"':
+            self.pos += 1
+            self.skip_string_tail()
+            return
+        if char not in "[{":
+            while True:
+                self.pos = _SCALAR_CHARS.match(self.buf, self.pos).end()
+                if self.pos < len(self.buf) or not self.read():
+                    return
+
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.read():
+                    raise self.error("Unterminated value")
+                continue
+            char = match.group()
+            if char in "[{":
+                # Containers already whole in the window are skipped by a
+                # single match.
+                whole = _CONTAINER.match(self.buf, match.start())
+                if whole is not None:
+                    self.pos = whole.end()
+                    if depth == 0:
+                        return
+                    continue
+                depth += 1
+                self.pos = match.end()
+            elif char == '"':
+                self.pos = match.end()
+                self.skip_string_tail()
+            else:
+                self.pos = match.end()
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def decode_value(self):
+        """Build the value starting at ``pos``."""
+        self.mark = self.pos
+        self.skip_value()
+        start, self.mark = self.mark, None
+        return _decoder.decode(self.buf[start:self.pos])
+
+    def expect(self, chars):
+        """Consume the next non-blank character, which must be one of ``chars``."""
+        self.skip_ws()
+        char = self.peek()
+        if char not in chars:
+            raise self.error(f"Expecting one of {chars!r}")
+        self.pos += 1
+        return char
+
+
+def _filter(value, selection):
+    """Restrict an already built value to a selection."""
+    if selection is True or not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        sub = selection.get(key, selection.get("*"))
+        if sub:
+            result[key] = _filter(item, sub)
+    return result
+
+
+def _select(reader, selection):
+    """Build the selected parts of the value at the reader position."""
+    reader.skip_ws()
+    if selection is True or reader.peek() != "{":
+        return reader.decode_value()
+
+    # Small objects are cheaper to build whole with the C decoder and filter
+    # afterwards than to walk key by key.
+    reader.ensure(SMALL_VALUE)
+    match = _CONTAINER.match(reader.buf, reader.pos, reader.pos + SMALL_VALUE)
+    if match is not None:
+        value = _decoder.decode(reader.buf[reader.pos:match.end()])
+        reader.pos = match.end()
+        return _filter(value, selection)
+
+    result = {}
+    reader.pos += 1
+    reader.skip_ws()
+    if reader.peek() == "}":
+        reader.pos += 1
+        return result
+
+    while True:
+        reader.expect('"')
+        reader.mark = reader.pos - 1
+        reader.skip_string_tail()
+        key = scanstring(reader.buf, reader.mark + 1)[0]
+        reader.mark = None
+        reader.expect(":")
+
+        sub = selection.get(key, selection.get("*"))
+        if sub:
+            result[key] = _select(reader, sub)
+        else:
+            reader.skip_ws()
+            reader.skip_value()
+
+        if reader.expect(",}") == "}":
+            return result
+
+
+def _load(f, selection):
+    reader = _Reader(f)
+    value = _select(reader, selection)
+    if not reader.at_end():
+        raise reader.error("Extra data")
+    return value
+
+
+def loads_selected(s, selection):
+    """Parse the selected parts of the JSON document ``s``."""
+    return _load(io.StringIO(s), selection)
+
+
+def load_selected(path, selection):
+    """
+    Parse the selected parts of a JSON file, reading it chunk by chunk.
+
+    Args:
+        path: Path of the JSON file.
+        selection: Nested dict describing the keys to build, see module docstring.
+
+    Returns:
+        The document restricted to the selected keys.
+    """
+    with open(path, "r") as f:
+        return _load(f, selection)
@@ -0,0 +1,363 @@
+"""
+Chip topology renderer.
+
+Draws a quantum chip as a graph: qubits as nodes coloured by a per-qubit
+value, couplers as edges with an optional label. The geometry of a chip
+(node coordinates, edge segments, edge label positions and angles) only
+depends on ``config.connectivity`` and ``config.pos``, so ``chip_layout``
+computes it once per chip and every later plot of the same chip reuses it.
+Drawing goes straight to matplotlib collections: one ``LineCollection`` for
+the couplers and one scatter ``PathCollection`` for the qubits. The labels
+stay ``Text`` artists, so they remain selectable in the PDF, but share their
+layouts through a cache, and the boxes under the edge labels are a single
+path instead of one bbox patch per label.
+
+    layout = chip_layout(config.connectivity, config.pos)
+    colors = node_colors(values, cmap, vmin, vmax, threshold=80)
+    draw_topology(ax, layout, colors, node_labels, edge_labels)
+
+Per-qubit and per-coupler results are aligned on the layout with
+``qubit_values`` and ``edge_values``: two chips measured on the same layout
+then compare with plain array arithmetic.
+"""
+
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import matplotlib
+import numpy as np
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.collections import LineCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.text import Text
+from matplotlib.textpath import text_to_path
+from matplotlib.transforms import IdentityTransform
+
+# Colour of the qubits whose value is below the threshold of ``node_colors``.
+MISSING_COLOR = matplotlib.colors.to_rgba("grey")
+
+# Spacing of the lines of a label and padding of the edge label boxes, in
+# font sizes.
+LINE_SPACING = 1.2
+LABEL_PAD = 0.3
+
+_layouts = {}
+_layouts_lock = threading.Lock()
+
+# Text layouts of the labels, shared by every label with the same text, font,
+# rotation and renderer. Cleared when it grows past ``MAX_TEXT_LAYOUTS``.
+MAX_TEXT_LAYOUTS = 16384
+_text_layouts = {}
+
+
+@dataclass(frozen=True)
+class ChipLayout:
+    """Precomputed geometry of a chip."""
+
+    # Qubit ids, in drawing order.
+    qubits: tuple
+    # Couplers as (qubit, qubit) pairs, in drawing order.
+    edges: tuple
+    # (n_qubits, 2) node coordinates.
+    xy: np.ndarray
+    # (n_edges, 2, 2) segment end points of every coupler.
+    segments: np.ndarray
+    # (n_edges, 2) edge label positions, the middle of each segment.
+    midpoints: np.ndarray
+    # (n_edges,) edge label angles in degrees, kept upright.
+    angles: np.ndarray
+    # (xmin, xmax, ymin, ymax) view limits with a 5% margin.
+    limits: tuple
+
+
+def _freeze(connectivity, pos):
+    """Return a hashable key of a chip description."""
+    edges = tuple((a, b) for a, b in connectivity)
+    nodes = tuple((q, tuple(xy)) for q, xy in pos.items())
+    return edges, nodes
+
+
+def chip_layout(connectivity, pos):
+    """
+    Return the layout of the chip described by ``connectivity`` and ``pos``.
+
+    Args:
+        connectivity: Iterable of (qubit, qubit) couplers.
+        pos: Dict qubit -> (x, y) coordinates.
+
+    Returns:
+        ChipLayout: Computed on the first call for a chip, then reused.
+    """
+    key = _freeze(connectivity, pos)
+    with _layouts_lock:
+        layout = _layouts.get(key)
+    if layout is not None:
+        return layout
+
+    edges, nodes = key
+    qubits = tuple(q for q, _ in nodes)
+    xy = np.array([xy for _, xy in nodes], dtype=float).reshape(-1, 2)
+    index = {q: i for i, q in enumerate(qubits)}
+    pairs = np.array([(index[a], index[b]) for a, b in edges], dtype=int).reshape(-1, 2)
+    segments = xy[pairs]
+    midpoints = segments.mean(axis=1)
+    delta = segments[:, 1] - segments[:, 0]
+    angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    # Keep the labels readable: no upside-down text.
+    angles = np.where(angles > 90, angles - 180, angles)
+    angles = np.where(angles <= -90, angles + 180, angles)
+
+    (xmin, ymin), (xmax, ymax) = xy.min(axis=0), xy.max(axis=0)
+    padx, pady = 0.05 * (xmax - xmin), 0.05 * (ymax - ymin)
+    limits = (xmin - padx, xmax + padx, ymin - pady, ymax + pady)
+
+    layout = ChipLayout(qubits, edges, xy, segments, midpoints, angles, limits)
+    with _layouts_lock:
+        _layouts[key] = layout
+    return layout
+
+
+def qubit_values(values, layout):
+    """
+    Align per-qubit results on a layout.
+
+    Args:
+        values: Dict qubit -> value; qubit ids may be ints or strings, as
+            they are in the JSON results.
+        layout (ChipLayout): Geometry of the chip.
+
+    Returns:
+        np.ndarray: (n_qubits,) values in the order of ``layout.qubits``,
+        NaN for the qubits without a value.
+    """
+    return np.array(
+        [values.get(q, values.get(str(q), np.nan)) for q in layout.qubits], dtype=float
+    )
+
+
+def edge_values(values, layout):
+    """
+    Align per-coupler results on a layout.
+
+    Args:
+        values: Dict (qubit, qubit) -> value, in either orientation.
+        layout (ChipLayout): Geometry of the chip.
+
+    Returns:
+        np.ndarray: (n_edges,) values in the order of ``layout.edges``, NaN
+        for the couplers without a value.
+    """
+    return np.array(
+        [values.get((a, b), values.get((b, a), np.nan)) for a, b in layout.edges],
+        dtype=float,
+    )
+
+
+def node_colors(values, cmap, vmin, vmax, threshold=None):
+    """
+    Map per-qubit (or per-coupler) values to RGBA colours in a single colormap call.
+
+    Args:
+        values: Per-qubit values, in the order of ``ChipLayout.qubits``.
+        cmap: Matplotlib colormap.
+        vmin, vmax: Values mapped to both ends of the colormap.
+        threshold: Values at or below it are drawn in ``MISSING_COLOR``.
+
+    Returns:
+        np.ndarray: (n_qubits, 4) RGBA colours, ``MISSING_COLOR`` for NaN
+        values.
+    """
+    values = np.asarray(values, dtype=float)
+    span = (vmax - vmin) or 1.0
+    colors = cmap((values - vmin) / span)
+    colors[np.isnan(values)] = MISSING_COLOR
+    if threshold is not None:
+        colors[values <= threshold] = MISSING_COLOR
+    return colors
+
+
+def draw_topology(
+    ax,
+    layout,
+    colors,
+    node_labels=None,
+    edge_labels=None,
+    node_size=800,
+    edge_width=5,
+    font_size=8,
+    edge_colors="black",
+    label_color="r",
+):
+    """
+    Draw a chip on ``ax``.
+
+    Args:
+        ax: Matplotlib axes.
+        layout (ChipLayout): Geometry of the chip.
+        colors: Node colours, one per qubit of ``layout.qubits``.
+        node_labels: Optional labels, one per qubit of ``layout.qubits``.
+        edge_labels: Optional labels, one per coupler of ``layout.edges``.
+        node_size: Marker area of the qubits, in points squared.
+        edge_width: Width of the couplers, in points.
+        font_size: Font size of the labels.
+        edge_colors: Colour of the couplers, or one colour per coupler of
+            ``layout.edges``.
+        label_color: Colour of the qubit labels.
+
+    Returns:
+        PathCollection: The qubit markers.
+    """
+    ax.add_collection(
+        LineCollection(layout.segments, colors=edge_colors, linewidths=edge_width, zorder=1)
+    )
+    nodes = ax.scatter(
+        layout.xy[:, 0],
+        layout.xy[:, 1],
+        s=node_size,
+        c=colors,
+        linewidths=edge_width,
+        edgecolors="face",
+        zorder=2,
+    )
+
+    if edge_labels is not None:
+        # White boxes under the edge labels, as networkx draws them, but as a
+        # single path instead of one bbox patch per label.
+        ax.add_artist(
+            _LabelBoxes(edge_labels, layout.midpoints, layout.angles, font_size, "white", zorder=1)
+        )
+        _add_labels(ax, edge_labels, layout.midpoints, font_size, "black", layout.angles, zorder=1)
+    if node_labels is not None:
+        _add_labels(ax, node_labels, layout.xy, font_size, label_color, alpha=0.6, zorder=3)
+
+    xmin, xmax, ymin, ymax = layout.limits
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    # No ticks at all: hidden ticks would still be laid out on every draw.
+    ax.set_xticks([])
+    ax.set_yticks([])
+    return nodes
+
+
+@lru_cache(maxsize=4096)
+def _label_extent(text, size):
+    """
+    Return the width and height of a bold label, in points.
+
+    Only depends on the text and the font size, and chips repeat the same
+    few labels, so the extents are measured once and shared by every plot.
+    """
+    prop = FontProperties(size=size, weight="bold")
+    lines = text.split("\n")
+    width = max(text_to_path.get_text_width_height_descent(line, prop, ismath=False)[0] for line in lines)
+    height = size * (1 + LINE_SPACING * (len(lines) - 1))
+    return width, height
+
+
+class _LabelText(Text):
+    """
+    A ``Text`` whose layout is shared with every label that looks the same.
+
+    The layout of a text is relative to its position, so it only depends on
+    the text, its style and the renderer. A chip repeats the same few labels
+    at hundreds of positions and every plot draws twice (once for the tight
+    bounding box, once for output), so most layouts come from the cache.
+    """
+
+    def _get_layout(self, renderer):
+        key = (
+            self.get_text(),
+            self._fontproperties,
+            self.get_rotation(),
+            self.get_rotation_mode(),
+            self._horizontalalignment,
+            self._verticalalignment,
+            self._multialignment,
+            self._linespacing,
+            self.get_usetex(),
+            self.get_wrap(),
+            type(renderer),
+            renderer.points_to_pixels(1.0),
+            self.get_figure(root=True).dpi,
+        )
+        layout = _text_layouts.get(key)
+        if layout is None:
+            layout = super()._get_layout(renderer)
+            if len(_text_layouts) >= MAX_TEXT_LAYOUTS:
+                _text_layouts.clear()
+            _text_layouts[key] = layout
+        return layout
+
+
+def _add_labels(ax, labels, offsets, size, color, angles=None, alpha=None, zorder=1):
+    """
+    Add one ``Text`` per label, centred on its data point.
+
+    The labels stay text in the vector outputs, so they can be selected and
+    searched in the PDF; their layout comes from ``_LabelText``.
+    """
+    prop = FontProperties(size=size, weight="bold")
+    for i, (label, (x, y)) in enumerate(zip(labels, offsets)):
+        text = _LabelText(
+            x,
+            y,
+            str(label),
+            fontproperties=prop,
+            color=color,
+            alpha=alpha,
+            rotation=float(angles[i]) if angles is not None else 0.0,
+            rotation_mode="anchor",
+            horizontalalignment="center",
+            verticalalignment="center",
+            linespacing=LINE_SPACING,
+            zorder=zorder,
+        )
+        ax._add_text(text)
+
+
+class _LabelBoxes(Artist):
+    """
+    Background boxes of text labels centred on data points, drawn as one path.
+
+    The box outlines, in points around each data point, are computed once
+    from the cached label extents; a draw only offsets them to the current
+    position of the points.
+    """
+
+    def __init__(self, labels, offsets, angles, size, color, zorder=1):
+        super().__init__()
+        self._offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        self._color = matplotlib.colors.to_rgba(color)
+        self.set_zorder(zorder)
+
+        boxes = []
+        pad = LABEL_PAD * size
+        for label, angle in zip(labels, angles):
+            width, height = _label_extent(str(label), size)
+            w, h = width / 2 + pad, height / 2 + pad
+            box = np.array([(-w, -h), (w, -h), (w, h), (-w, h), (-w, -h)])
+            if angle:
+                theta = np.radians(angle)
+                rotation = np.array(
+                    [[np.cos(theta), np.sin(theta)], [-np.sin(theta), np.cos(theta)]]
+                )
+                box = box @ rotation
+            boxes.append(box)
+        self._boxes = np.array(boxes).reshape(-1, 5, 2)
+        self._box_codes = np.tile(Path.unit_rectangle().codes, len(boxes))
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or not len(self._offsets):
+            return
+        scale = renderer.points_to_pixels(1.0)
+        anchors = self.axes.transData.transform(self._offsets)
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        gc.set_linewidth(0)
+        boxes = self._boxes * scale + anchors[:, None, :]
+        path = Path(boxes.reshape(-1, 2), self._box_codes)
+        renderer.draw_path(gc, path, IdentityTransform(), self._color)
+        gc.restore()
@@ -0,0 +1,120 @@
+"""
+Chrome trace-event recording for the report pipeline.
+
+With ``--profile-trace out.json`` the pipeline records a span for every
+context function, JSON load, plot function, ``savefig`` call, the Jinja
+render and the pdflatex step. The file is in the Chrome trace-event format
+and opens in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+Recording is off unless ``enable()`` or ``enable_for()`` turned it on in the
+process, and a disabled ``span`` costs a single check. Worker processes record their own
+events, which the engine hands back to the parent with ``drain()`` and
+``extend()``.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_enabled = False
+_events = []
+
+
+def enable():
+    """Start recording spans in this process."""
+    global _enabled
+    _enabled = True
+
+
+def enable_for(cfg):
+    """
+    Record spans if and only if ``cfg.profile_trace`` is set, and forget the
+    events recorded so far.
+
+    Called at the start of every build, so a long-lived process (the daemon,
+    a worker, a benchmark) only keeps the events of the current build and
+    stops recording once a build without ``--profile-trace`` runs.
+
+    Returns:
+        bool: Whether spans are recorded.
+    """
+    global _enabled
+    _enabled = bool(getattr(cfg, "profile_trace", None))
+    _events.clear()
+    return _enabled
+
+
+def is_enabled():
+    """Return whether spans are recorded in this process."""
+    return _enabled
+
+
+def _now_us():
+    # CLOCK_MONOTONIC is shared by all processes, so worker timestamps line
+    # up with the parent's.
+    return time.monotonic_ns() // 1000
+
+
+@contextmanager
+def span(name, cat="report", **args):
+    """
+    Record the enclosed block as a complete ("X") event.
+
+    Args:
+        name: Span name shown in the viewer.
+        cat: Event category, used to filter spans in the viewer.
+        **args: Extra values shown in the span details.
+    """
+    if not _enabled:
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start,
+            "dur": _now_us() - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        _events.append(event)
+
+
+def drain():
+    """Return the events recorded so far and forget them."""
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def extend(events):
+    """Add events recorded by another process."""
+    _events.extend(events)
+
+
+def write(path):
+    """
+    Write the recorded events as a Chrome trace-event JSON file.
+
+    Returns:
+        int: Number of events written.
+    """
+    events = list(_events)
+    main_pid = os.getpid()
+    for pid in sorted({event["pid"] for event in events}):
+        label = "report" if pid == main_pid else f"worker {pid}"
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}}
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
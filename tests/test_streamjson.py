@@ -0,0 +1,193 @@
+"""
+Round-trip checks of ``streamjson`` against ``json.loads``.
+
+Random documents are parsed with random selections and compared with the
+full ``json.loads`` parse restricted to the same selection. Small chunk sizes
+put chunk boundaries inside strings, escapes and numbers, and
+``SMALL_VALUE = 0`` forces the key-by-key walk instead of decoding small
+objects whole.
+
+    python -m pytest tests
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import streamjson  # noqa: E402
+
+# Documents per chunk size and SMALL_VALUE, each parsed in three layouts.
+DOCUMENTS = 150
+
+CHUNK_SIZES = [2, 7, 64 * 1024]
+SMALL_VALUES = [0, streamjson.SMALL_VALUE]
+
+# Keys and strings with quotes, backslashes, escapes and non-ASCII text, so
+# that escapes straddle chunk boundaries.
+STRINGS = [
+    "",
+    "a",
+    'quo"te',
+    "back\\slash",
+    "\\\\",
+    '\\"',
+    "line\nbreak\ttab",
+    "café",
+    "\U0001f600 emoji",
+    "}],{[",
+    "x" * 50,
+]
+KEYS = ["a", "b", "*", 'k"ey', "back\\", "café", "}"]
+
+
+def random_value(rng, depth=0):
+    """Return a random JSON value nested at most 10 levels deep."""
+    r = rng.random()
+    if depth >= 10 or r < 0.35:
+        return rng.choice(
+            [
+                rng.choice(STRINGS),
+                rng.randint(-(10**12), 10**12),
+                rng.uniform(-1e3, 1e3),
+                1.5e-300,
+                True,
+                False,
+                None,
+            ]
+        )
+    if r < 0.6:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {
+        rng.choice(KEYS) + str(i): random_value(rng, depth + 1) for i in range(rng.randint(0, 4))
+    }
+
+
+def random_selection(rng, value):
+    """Return a random selection of the keys of ``value``, with ``"*"`` at times."""
+    if not isinstance(value, dict) or rng.random() < 0.2:
+        return True
+    selection = {}
+    for key, item in value.items():
+        r = rng.random()
+        if r < 0.4:
+            selection[key] = random_selection(rng, item)
+        elif r < 0.5:
+            selection[key] = False
+    if rng.random() < 0.3:
+        selection["*"] = random_selection(rng, rng.choice(list(value.values()) or [None]))
+    return selection
+
+
+def expected(value, selection):
+    """Restrict a fully parsed value to a selection, see the ``streamjson`` docstring."""
+    if selection is True or not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        sub = selection[key] if key in selection else selection.get("*", False)
+        if sub:
+            result[key] = expected(item, sub)
+    return result
+
+
+def layouts(value):
+    """Return ``value`` serialised compact, indented and with raw non-ASCII text."""
+    return [
+        json.dumps(value, separators=(",", ":")),
+        json.dumps(value, indent=2),
+        json.dumps(value, ensure_ascii=False),
+    ]
+
+
+@pytest.fixture(params=CHUNK_SIZES, ids=lambda size: f"chunk{size}")
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(streamjson, "CHUNK_SIZE", request.param)
+    return request.param
+
+
+@pytest.fixture(params=SMALL_VALUES, ids=lambda size: f"small{size}")
+def small_value(request, monkeypatch):
+    monkeypatch.setattr(streamjson, "SMALL_VALUE", request.param)
+    return request.param
+
+
+def test_random_documents(chunk_size, small_value):
+    rng = random.Random(f"{chunk_size}-{small_value}")
+    for _ in range(DOCUMENTS):
+        value = {"first": random_value(rng), "second": random_value(rng)}
+        selection = random_selection(rng, value)
+        for text in layouts(value):
+            parsed = json.loads(text)
+            assert streamjson.loads_selected(text, True) == parsed, text
+            assert streamjson.loads_selected(text, selection) == expected(parsed, selection), (
+                text,
+                selection,
+            )
+
+
+def test_escapes_on_every_chunk_boundary(chunk_size, small_value):
+    # Shifting the document one character at a time puts every character of
+    # the escaped strings, selected or skipped, right after a chunk boundary.
+    selections = [
+        {'k"ey': True},
+        {"*": True, "skip": False},
+        {"skip": {"x": True}, "back\\": True},
+    ]
+    for pad in range(2 * min(chunk_size, 64)):
+        value = {
+            "p" * pad: 1,
+            'k"ey': 'v\\a"lé\U0001f600',
+            "skip": ['"]}', {"x": "\\", "y": "\\\"{"}],
+            "back\\": -12.5e-3,
+        }
+        for selection in selections:
+            for text in layouts(value):
+                assert streamjson.loads_selected(text, selection) == expected(
+                    json.loads(text), selection
+                ), (text, selection)
+
+
+def test_star_selects_keys_not_listed(small_value):
+    text = json.dumps(
+        {
+            "NQCH": {
+                "0": {"predicted_label": 1, "is_correct": True, "circuit": [1, 2]},
+                "1": {"predicted_label": 0, "is_correct": False, "circuit": [3]},
+                "_statistics": {"accuracy": 0.5},
+            },
+            "other": [1, 2, 3],
+        }
+    )
+    selection = {"NQCH": {"*": {"predicted_label": True}, "_statistics": True}}
+    assert streamjson.loads_selected(text, selection) == {
+        "NQCH": {
+            "0": {"predicted_label": 1},
+            "1": {"predicted_label": 0},
+            "_statistics": {"accuracy": 0.5},
+        }
+    }
+    # An explicit False excludes a key that "*" would select.
+    assert streamjson.loads_selected(text, {"*": True, "other": False}) == {
+        "NQCH": json.loads(text)["NQCH"]
+    }
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1',
+        '{"a" 1}',
+        '{"a": 1} x',
+        '{"b": {"x": [1, 2}}',
+        '{"a": "x',
+        '{"b": "\\',
+    ],
+)
+def test_invalid_documents(text, chunk_size, small_value):
+    with pytest.raises(json.JSONDecodeError):
+        streamjson.loads_selected(text, {"b": {"x": True}})